@@ -30,11 +30,37 @@ import requests
 
 from create_config import create_config
 from extractors.draft_extractor import DraftExtractor
+from extractors.extraction_manifest import ExtractionManifest
 from job_log import job_log
 from message_factory.message_factory import MessageFactory
+from utility.unparsable_modules import UnparsableModules
 from utility.utility import remove_directory_content
 
 file_basename = os.path.basename(__file__)
+YANG_SUFFIX = '.yang'
+
+
+class SkippedModulesIndex:
+    """
+    Answers whether a module file name is a substring of any of the skipped modules with a hashed lookup.
+    Every substring of a skipped module ending with '.yang' is indexed, so a file name ending with '.yang',
+    as all the extracted files do, is found in a set instead of being searched for in every skipped module.
+    """
+
+    def __init__(self, modules_to_skip: t.Iterable[str]):
+        self.modules_to_skip = tuple(modules_to_skip)
+        self.substrings: set[str] = set()
+        for module in self.modules_to_skip:
+            end = module.find(YANG_SUFFIX)
+            while end != -1:
+                end += len(YANG_SUFFIX)
+                self.substrings.update(module[start:end] for start in range(end - len(YANG_SUFFIX) + 1))
+                end = module.find(YANG_SUFFIX, end - len(YANG_SUFFIX) + 1)
+
+    def __contains__(self, yang_file: str) -> bool:
+        if yang_file.endswith(YANG_SUFFIX):
+            return yang_file in self.substrings
+        return any(yang_file in module for module in self.modules_to_skip)
 
 
 class CheckArchivedDrafts:
@@ -55,11 +81,17 @@ class CheckArchivedDrafts:
             self.missing_modules_directory,
             'yangmodels/yang/experimental/ietf-extracted-YANG-modules',
         )
-        self.all_yang_path = os.path.join(self.temp_dir, 'YANG-ALL')
         self.var_path = config.get('Directory-Section', 'var')
         ietf_directory = config.get('Directory-Section', 'ietf-directory')
         self.archived_draft_path = os.path.join(ietf_directory, 'my-id-archive-mirror')
+        # the extracted modules are kept between the runs, only the newly archived drafts are extracted
         self.yang_path = os.path.join(ietf_directory, 'archived-drafts-modules')
+        self.all_yang_path = os.path.join(ietf_directory, 'archived-drafts-all-modules')
+        self.manifest_path = os.path.join(
+            config.get('Directory-Section', 'cache'),
+            'extraction-manifests',
+            'check-archived-drafts.json',
+        )
         os.makedirs(self.all_yang_path, exist_ok=True)
 
         self.draft_extractor_paths = {
@@ -74,9 +106,10 @@ class CheckArchivedDrafts:
             extract_elements=False,
             extract_examples=False,
             copy_drafts=False,
+            manifest=ExtractionManifest(self.manifest_path, [self.yang_path, self.all_yang_path], debug_level=debug),
         )
 
-        self.all_modules_keys: list[str] = []
+        self.all_modules_keys: set[str] = set()
         self.modules_to_skip: tuple[str, ...] = ()
         self.missing_modules: list[str] = []
         self.incorrect_revision_modules: list[str] = []
@@ -91,19 +124,14 @@ class CheckArchivedDrafts:
             raise err
         self._get_all_modules()
         self._get_incorrect_and_missing_modules()
-        shutil.rmtree(self.yang_path)
-        shutil.rmtree(self.all_yang_drafts_strict)
         if self.missing_modules:
             mf = self.message_factory or MessageFactory()
             mf.send_missing_modules(self.missing_modules, self.incorrect_revision_modules)
         self._custom_print(f'end of {file_basename} job')
-        shutil.rmtree(self.all_yang_path, ignore_errors=True)  # Cleaning created directory
         return [{'label': 'Number of missing modules', 'message': len(self.missing_modules)}]
 
     def _extract_drafts(self):
-        remove_directory_content(self.yang_path, self.debug)
         remove_directory_content(self.missing_modules_directory, self.debug)
-        remove_directory_content(self.all_yang_drafts_strict, self.debug)
 
         self._custom_print(f'Extracting modules from drafts stored in {self.archived_draft_path}')
         self.draft_extractor.extract()
@@ -113,28 +141,22 @@ class CheckArchivedDrafts:
         all_modules = requests.get(f'{self.yangcatalog_api_prefix}/search/modules').json()
         if all_modules:
             all_modules = all_modules.get('module', [])
-            self.all_modules_keys = [f'{m.get("name")}@{m.get("revision")}' for m in all_modules]
+            self.all_modules_keys = {f'{m.get("name")}@{m.get("revision")}' for m in all_modules}
         try:
             resources_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'resources')
             with open(os.path.join(resources_dir, 'old-rfcs.json'), 'r') as f:
                 old_modules = json.load(f)
         except (FileNotFoundError, json.decoder.JSONDecodeError):
             old_modules = []
-        try:
-            with open(os.path.join(self.var_path, 'unparsable-modules.json'), 'r') as f:
-                unparsable_modules = json.load(f)
-        except (FileNotFoundError, json.decoder.JSONDecodeError):
-            unparsable_modules = []
+        unparsable_modules = UnparsableModules(self.var_path).get_modules()
         self.modules_to_skip = (*old_modules, *unparsable_modules)
 
     def _get_incorrect_and_missing_modules(self):
         os.makedirs(self.extracted_missing_modules_directory, exist_ok=True)
+        skipped_modules = SkippedModulesIndex(self.modules_to_skip)
+        extracted_modules: list[tuple[str, str]] = []
         for yang_file in self.draft_extractor.inverted_draft_yang_dict:
-            if (
-                yang_file.startswith('example')
-                or yang_file.startswith('@')
-                or any(yang_file in module for module in self.modules_to_skip)
-            ):
+            if yang_file.startswith('example') or yang_file.startswith('@') or yang_file in skipped_modules:
                 continue
             name_revision = yang_file.split('.yang')[0]
             if '@' in name_revision:
@@ -145,7 +167,10 @@ class CheckArchivedDrafts:
                     continue
             else:
                 name_revision += '@1970-01-01'
-            if name_revision in self.all_modules_keys:
+            extracted_modules.append((name_revision, yang_file))
+        missing_modules_keys = {name_revision for name_revision, _ in extracted_modules} - self.all_modules_keys
+        for name_revision, yang_file in extracted_modules:
+            if name_revision not in missing_modules_keys:
                 continue
             self.missing_modules.append(yang_file)
             shutil.copy2(
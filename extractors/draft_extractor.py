@@ -22,13 +22,24 @@ import os
 import re
 import shutil
 import sys
+import tempfile
 import typing as t
-from io import StringIO
 
-from xym import xym
-
-from extractors.extract_elem import extract_elem
-from extractors.helper import check_after_xym_extraction, invert_yang_modules_dict, remove_invalid_files
+from extractors.elements_archive import ElementsArchive
+from extractors.extract_elem import extract_elems
+from extractors.extraction_manifest import ExtractionManifest
+from extractors.helper import (
+    XymResult,
+    XymTask,
+    check_after_xym_extraction,
+    get_existing_modules,
+    invert_yang_modules_dict,
+    list_files_with_code,
+    merge_xym_result,
+    remove_invalid_files,
+    run_xym,
+    run_xym_in_work_directory,
+)
 from message_factory.message_factory import MessageFactory
 
 
@@ -41,6 +52,10 @@ class DraftExtractor:
         extract_examples: bool = True,
         copy_drafts: bool = True,
         message_factory: t.Optional[MessageFactory] = None,
+        processes: int = 1,
+        single_pass_extraction: bool = False,
+        manifest: t.Optional[ExtractionManifest] = None,
+        elements_archive: t.Optional[ElementsArchive] = None,
     ):
         self.draft_path = draft_extractor_paths.get('draft_path', '')
         self.yang_path = draft_extractor_paths.get('yang_path', '')
@@ -55,6 +70,12 @@ class DraftExtractor:
         self.extract_examples = extract_examples
         self.extract_elements = extract_elements
         self.copy_drafts = copy_drafts
+        self.processes = processes
+        self.single_pass_extraction = single_pass_extraction
+        self.manifest = manifest
+        self.elements_archive = elements_archive
+        self._prepared_xym_results: dict[XymTask, XymResult] = {}
+        self._extractions: dict[str, ExtractionManifest.Extraction] = {}
         self.ietf_drafts = []
         self.draft_yang_dict = {}
         self.draft_yang_example_dict = {}
@@ -77,30 +98,107 @@ class DraftExtractor:
         self._message_factory = value
 
     def _create_ietf_drafts_list(self):
-        for filename in os.listdir(self.draft_path):
-            if not filename.endswith('.txt'):
-                continue
-            full_path = os.path.join(self.draft_path, filename)
-            if os.path.isfile(full_path):
-                try:
-                    with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        for line in f:
-                            if '<CODE BEGINS>' in line:
-                                self.ietf_drafts.append(filename)
-                                break
-                except Exception:
-                    continue
-        self.ietf_drafts.sort()
+        self.ietf_drafts = list_files_with_code(self.draft_path, self.processes)
         print('Drafts list created')
 
     def extract(self):
-        self.extract_drafts()
+        documents = list(self.ietf_drafts)
+        if self.manifest:
+            self.manifest.update(
+                self.draft_path,
+                self.ietf_drafts,
+                self._extract_drafts_for_manifest,
+                lambda entry, elements_path: self.extract_all_elements(entry['result']['yang'] or [], elements_path),
+            )
+            self._load_manifest_results()
+        else:
+            self.extract_drafts()
+        if self.elements_archive:
+            # elements of the documents which disappeared
+            self.elements_archive.retain_documents(documents)
+            self.elements_archive.commit()
         self.invert_dict()
         self.remove_invalid_files()
 
-    def extract_drafts(self):
-        for draft_file in self.ietf_drafts:
+    def extract_drafts(self, drafts: t.Optional[list[str]] = None):
+        drafts = self.ietf_drafts if drafts is None else drafts
+        if self.processes <= 1 and not self.single_pass_extraction:
+            self._extract_drafts(drafts)
+            return
+        # xym runs into separate work directories first (in parallel and/or with one pass over each draft),
+        # the results are then merged draft by draft in the same order as if the drafts were extracted one by one
+        xym_task_groups = []
+        for draft_file in drafts:
+            xym_tasks = [self._create_xym_task(draft_file, self.draft_path, self.yang_path, strict=True)]
+            if self.extract_examples:
+                xym_tasks.append(
+                    self._create_xym_task(
+                        draft_file,
+                        self.draft_path,
+                        self.all_yang_example_path,
+                        strict=True,
+                        strict_examples=True,
+                    ),
+                )
+            xym_tasks.append(self._create_xym_task(draft_file, self.draft_path, self.all_yang_path))
+            xym_task_groups.append(xym_tasks)
+        with tempfile.TemporaryDirectory() as work_directory:
+            self._prepared_xym_results = run_xym_in_work_directory(
+                xym_task_groups,
+                work_directory,
+                processes=self.processes,
+                single_pass=self.single_pass_extraction,
+            )
+            try:
+                self._extract_drafts(drafts)
+            finally:
+                self._prepared_xym_results = {}
+
+    def _extract_drafts_for_manifest(self, drafts: list[str]) -> dict[str, ExtractionManifest.Extraction]:
+        self._extractions = {}
+        self.extract_drafts(drafts)
+        for draft_file in drafts:
+            result = self._extractions[draft_file]['result']
+            result.update(
+                {
+                    'valid': result.get('valid', True),
+                    'yang': self.draft_yang_dict.get(draft_file),
+                    'example': self.draft_yang_example_dict.get(draft_file),
+                    'all': self.draft_yang_all_dict.get(draft_file),
+                    'errors': self.drafts_missing_code_section.get(draft_file),
+                }
+            )
+        return self._extractions
+
+    def _load_manifest_results(self):
+        """Take the results of all the drafts, extracted now or during an earlier run, from the manifest."""
+        results = {draft_file: self.manifest.entries[draft_file]['result'] for draft_file in self.ietf_drafts}
+        self.ietf_drafts = [draft_file for draft_file, result in results.items() if result['valid']]
+        self.draft_yang_dict = {draft_file: result['yang'] for draft_file, result in results.items() if result['yang']}
+        self.draft_yang_example_dict = {
+            draft_file: result['example'] for draft_file, result in results.items() if result['example']
+        }
+        self.draft_yang_all_dict = {
+            draft_file: result['all'] for draft_file, result in results.items() if result['all']
+        }
+        self.drafts_missing_code_section = {
+            draft_file: result['errors'] for draft_file, result in results.items() if result['errors'] is not None
+        }
+
+    def _extract_drafts(self, drafts: list[str]):
+        for draft_file in drafts:
             draft_file_path = os.path.join(self.draft_path, draft_file)
+            # the draft could have been extracted before, its results are replaced
+            self._extractions[draft_file] = {'files': {}, 'skipped_modules': {}, 'result': {}}
+            for draft_dict in (
+                self.draft_yang_dict,
+                self.draft_yang_example_dict,
+                self.draft_yang_all_dict,
+                self.drafts_missing_code_section,
+            ):
+                draft_dict.pop(draft_file, None)
+            if self.elements_archive:
+                self.elements_archive.remove_documents([draft_file])
 
             # Extract the correctly formatted YANG Models into yang_path
             extracted_yang_models = self.extract_from_draft_file(
@@ -113,20 +211,26 @@ class DraftExtractor:
             if extracted_yang_models:
                 correct = check_after_xym_extraction(draft_file, extracted_yang_models)
                 if not correct:
-                    self.ietf_drafts.remove(draft_file)
+                    self._remove_incorrect_draft(draft_file)
                     continue
 
                 if self.debug_level > 0:
                     print('DEBUG: Extracted YANG models from Draft\n {}'.format(str(extracted_yang_models)))
 
                 # typedef, grouping and identity extraction from Drafts
-                if self.extract_elements:
-                    self.extract_all_elements(extracted_yang_models)
+                if self.extract_elements and self.elements_archive:
+                    elements_contents = {}
+                    self.extract_all_elements(extracted_yang_models, contents=elements_contents)
+                    self.elements_archive.replace_elements(draft_file, elements_contents)
+                elif self.extract_elements:
+                    elements = self.extract_all_elements(extracted_yang_models)
+                    self._record_files(draft_file, self.draft_elements_path, elements)
 
                 self.draft_yang_dict[draft_file] = extracted_yang_models
                 # copy the draft file in a specific directory for strict = True
                 if self.copy_drafts:
                     shutil.copy2(draft_file_path, self.draft_path_strict)
+                    self._record_files(draft_file, self.draft_path_strict, [draft_file])
 
             # Extract the correctly formatted example YANG Models into all_yang_example_path
             if self.extract_examples:
@@ -140,7 +244,7 @@ class DraftExtractor:
                 if extracted_yang_models:
                     correct = check_after_xym_extraction(draft_file, extracted_yang_models)
                     if not correct:
-                        self.ietf_drafts.remove(draft_file)
+                        self._remove_incorrect_draft(draft_file)
                         continue
 
                     if self.debug_level > 0:
@@ -150,6 +254,7 @@ class DraftExtractor:
                     # copy the draft file in a specific directory for strict = True
                     if self.copy_drafts:
                         shutil.copy2(draft_file_path, self.draft_path_only_example)
+                        self._record_files(draft_file, self.draft_path_only_example, [draft_file])
 
             # Extract all YANG Models, including the wrongly formatted ones, in all_yang_path
             extracted_yang_models = self.extract_from_draft_file(draft_file, self.draft_path, self.all_yang_path)
@@ -157,7 +262,7 @@ class DraftExtractor:
             if extracted_yang_models:
                 correct = check_after_xym_extraction(draft_file, extracted_yang_models)
                 if not correct:
-                    self.ietf_drafts.remove(draft_file)
+                    self._remove_incorrect_draft(draft_file)
                     continue
 
                 if self.debug_level > 0:
@@ -167,6 +272,16 @@ class DraftExtractor:
                 # copy the draft file in a specific directory for strict = False
                 if self.copy_drafts:
                     shutil.copy2(draft_file_path, self.draft_path_no_strict)
+                    self._record_files(draft_file, self.draft_path_no_strict, [draft_file])
+
+    def _remove_incorrect_draft(self, draft_file: str):
+        self._extractions[draft_file]['result']['valid'] = False
+        if draft_file in self.ietf_drafts:
+            self.ietf_drafts.remove(draft_file)
+
+    def _record_files(self, draft_file: str, directory: str, filenames: list[str]):
+        if draft_file in self._extractions:
+            self._extractions[draft_file]['files'].setdefault(directory, []).extend(filenames)
 
     def extract_from_draft_file(
         self,
@@ -176,33 +291,42 @@ class DraftExtractor:
         strict: bool = False,
         strict_examples: bool = False,
     ):
-        old_stderr = None
-        try:
-            old_stderr = sys.stderr
-            result = StringIO()
-            sys.stderr = result
-            extracted = xym.xym(
-                draft_file,
-                srcdir,
-                dstdir,
-                strict=strict,
-                strict_examples=strict_examples,
-                debug_level=self.debug_level,
-                add_line_refs=False,
-                force_revision_pyang=False,
-                force_revision_regexp=True,
-                extract_code_snippets=True,
-                code_snippets_dir=os.path.join(self.code_snippets_directory, os.path.splitext(draft_file)[0]),
-            )
-            result_string = result.getvalue()
-        finally:
-            sys.stderr = old_stderr
+        xym_task = self._create_xym_task(draft_file, srcdir, dstdir, strict=strict, strict_examples=strict_examples)
+        work_result = self._prepared_xym_results.get(xym_task)
+        if work_result:
+            xym_result = merge_xym_result(work_result, dstdir, xym_task.code_snippets_dir)
+        else:
+            xym_result = run_xym(xym_task)
+        result_string = xym_result.stderr
         print(result_string, file=sys.stderr)
         if 'WARNING' in result_string or 'ERROR' in result_string:
             # remove "File <file name> exists" error messages
             clean = ''.join(line for line in result_string.splitlines(True) if 'exists' not in line)
             self.drafts_missing_code_section[draft_file] = clean
-        return extracted
+        self._record_files(draft_file, dstdir, xym_result.extracted_models)
+        if draft_file in self._extractions:
+            self._extractions[draft_file]['skipped_modules'].setdefault(dstdir, []).extend(
+                get_existing_modules(result_string),
+            )
+        return xym_result.extracted_models
+
+    def _create_xym_task(
+        self,
+        draft_file: str,
+        srcdir: str,
+        dstdir: str,
+        strict: bool = False,
+        strict_examples: bool = False,
+    ) -> XymTask:
+        return XymTask(
+            draft_file,
+            srcdir,
+            dstdir,
+            os.path.join(self.code_snippets_directory, os.path.splitext(draft_file)[0]),
+            strict=strict,
+            strict_examples=strict_examples,
+            debug_level=self.debug_level,
+        )
 
     def invert_dict(self):
         self.inverted_draft_yang_dict = invert_yang_modules_dict(self.draft_yang_dict, self.debug_level)
@@ -214,17 +338,25 @@ class DraftExtractor:
         remove_invalid_files(self.all_yang_example_path, self.inverted_draft_yang_example_dict)
         remove_invalid_files(self.all_yang_path, self.inverted_draft_yang_all_dict)
 
-    def extract_all_elements(self, extracted_yang_models: list):
+    def extract_all_elements(
+        self,
+        extracted_yang_models: list,
+        elements_path: str = '',
+        contents: t.Optional[dict[str, str]] = None,
+    ) -> list[str]:
         """Extract typedefs, groupings and identities from data models into .txt files.
         These elements are not extracted from example models.
+        Names of the created files are returned, if the contents dict is given the texts of the elements
+        are put into it instead of the files.
         """
+        elements_path = elements_path or self.draft_elements_path
+        elements = []
         for extracted_model in extracted_yang_models:
             if not extracted_model.startswith('example-'):
                 print('Identifier definition extraction for {}'.format(extracted_model))
                 module_fname = os.path.join(self.yang_path, extracted_model)
-                extract_elem(module_fname, self.draft_elements_path, 'typedef')
-                extract_elem(module_fname, self.draft_elements_path, 'grouping')
-                extract_elem(module_fname, self.draft_elements_path, 'identity')
+                elements += extract_elems(module_fname, elements_path, contents=contents)
+        return elements
 
     def dump_incorrect_drafts(self, public_directory: str, send_emails_about_problematic_drafts: bool = True):
         """Dump names of the IETF drafts with xym extraction error to problematic_drafts.json file."""
@@ -0,0 +1,124 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains ElementsArchive class which packs the typedefs, groupings and identities extracted
+from the YANG modules of RFCs and drafts into a single SQLite database instead of one small .txt file per element.
+The elements are stored per document, an element written by several documents belongs to the last of them
+in the sorted order, the same as the file written last when the documents are extracted one after another.
+The per-file layout can be exported from the archive on demand:
+
+    python extractors/elements_archive.py <archive> <directory>
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import argparse
+import os
+import sqlite3
+import typing as t
+
+
+class ElementsArchive:
+    def __init__(self, path: str):
+        """
+        Arguments:
+            :param path     (str) Path to the SQLite database, it is created if it doesn't exist
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS elements ('
+            'document TEXT NOT NULL, name TEXT NOT NULL, content TEXT NOT NULL, PRIMARY KEY (document, name))',
+        )
+        self.connection.execute('CREATE INDEX IF NOT EXISTS elements_name ON elements (name, document)')
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.commit()
+        self.connection.close()
+
+    def replace_elements(self, document: str, elements: dict[str, str]):
+        """
+        Replace the elements of the document, the elements are indexed by the names of their files.
+        The changes are written to the database by commit(), not for every document.
+        """
+        self.remove_documents([document])
+        self.connection.executemany(
+            'INSERT INTO elements (document, name, content) VALUES (?, ?, ?)',
+            [(document, name, content) for name, content in elements.items()],
+        )
+
+    def remove_documents(self, documents: t.Iterable[str]):
+        self.connection.executemany('DELETE FROM elements WHERE document = ?', [(document,) for document in documents])
+
+    def retain_documents(self, documents: t.Iterable[str]):
+        """Remove the elements of all the documents except for the given ones."""
+        documents = set(documents)
+        stored_documents = [row[0] for row in self.connection.execute('SELECT DISTINCT document FROM elements')]
+        self.remove_documents(document for document in stored_documents if document not in documents)
+
+    def get_elements(self) -> t.Iterator[tuple[str, str]]:
+        """Names and contents of the elements, each taken from the last document in the sorted order writing it."""
+        return self.connection.execute(
+            'SELECT name, content FROM elements AS element WHERE document = '
+            '(SELECT MAX(document) FROM elements WHERE name = element.name) ORDER BY name',
+        )
+
+    def export(self, directory: str) -> int:
+        """
+        Write every element into its own file in the directory, the same layout as extract_elem() creates.
+
+        Arguments:
+            :param directory    (str) Directory where to write the element files
+        :return: (int) Number of the written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        files_count = 0
+        for name, content in self.get_elements():
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+            files_count += 1
+        return files_count
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export the typedefs, groupings and identities from a packed archive into one file per element',
+    )
+    parser.add_argument('archive', help='Path to the SQLite archive with the elements', type=str)
+    parser.add_argument('directory', help='Directory where to write the element files', type=str)
+    args = parser.parse_args()
+    if not os.path.isfile(args.archive):
+        parser.error(f'archive {args.archive} does not exist')
+    with ElementsArchive(args.archive) as archive:
+        files_count = archive.export(args.directory)
+    print(f'{files_count} elements exported from {args.archive} into {args.directory}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
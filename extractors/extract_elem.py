@@ -17,81 +17,99 @@ __author__ = 'Eric Vyncke'
 __copyright__ = 'Copyright(c) 2019, Cisco Systems, Inc.,  Copyright The IETF Trust 2019, All Rights Reserved'
 __email__ = 'evyncke@cisco.com'
 
+import io
 import re
 
+ELEMENT_TYPES = ('typedef', 'grouping', 'identity')
+
 
 def extract_elem(module_fname, extract_dir, elem_type):
-    # Let's parse the module, we will create files when seeing the keywords such as
+    # Names of the created files are returned
+    return extract_elems(module_fname, extract_dir, (elem_type,))
+
+
+def extract_elems(module_fname, extract_dir, elem_types=ELEMENT_TYPES, contents=None):
+    # Let's parse the module once for all the element types, we will create files when seeing the keywords such as
     # 'identity-networking-instance-type.txt'
-    open_bracket_count = 0
-    in_comment = False
-    found_keyword = False
-    file_out = None
+    # Every element type keeps its own parsing state, so the files are the same as with one pass per element type
+    # If the contents dict is given, the texts of the elements are put into it by the file names instead of the files
+    # Names of the created files are returned, grouped by the element type in the order of elem_types
+    elem_files = {elem_type: [] for elem_type in elem_types}
+    open_bracket_count = dict.fromkeys(elem_types, 0)
+    in_comment = dict.fromkeys(elem_types, False)
+    files_out = dict.fromkeys(elem_types)
+    # Search after the keyword which MUST be the first word in the line (no " for example before)
+    keyword_pattern = re.compile(r'^\s*(' + '|'.join(map(re.escape, elem_types)) + r')\s+([-_\.\w]+)\s*{')
     with open(module_fname, 'r', encoding='utf-8', errors='ignore') as ym:
-        for line in ym:
-            if not found_keyword:  # Still looking for keyword
+        for raw_line in ym:
+            started_type = None
+            searching_types = [elem_type for elem_type in elem_types if files_out[elem_type] is None]
+            if searching_types:  # Still looking for keyword
+                line = raw_line
                 comment_start = line.find('//')
                 if comment_start >= 0:
                     line = line[:comment_start]  # Get rid of the one-line comment
                 comment_start = line.find('/*')
                 comment_end = line.find('*/')
                 if comment_start >= 0 and comment_start < comment_end:  # Another one-line comment
-                    #                    print("Before cut off line:", comment_start, comment_end, line)
                     line = line[:comment_start] + line[comment_end + 2 :]
-                #                    print("After cut off line:", comment_start, comment_end, line)
-                else:
-                    if comment_start >= 0:
-                        in_comment = True
-                        #                        print("Before cut off line:", comment_start, comment_end, line)
-                        line = line[:comment_start]
-                    #                        print("After cut off line:", comment_start, comment_end, line)
-                    else:
-                        if comment_end >= 0:
-                            in_comment = False
-                            #                            print("Before cut off line:", comment_start, comment_end, line)
-                            line = line[comment_end + 2 :]
-                #                            print("After cut off line:", comment_start, comment_end, line)
+                elif comment_start >= 0:
+                    for elem_type in searching_types:
+                        in_comment[elem_type] = True
+                    line = line[:comment_start]
+                elif comment_end >= 0:
+                    for elem_type in searching_types:
+                        in_comment[elem_type] = False
+                    line = line[comment_end + 2 :]
+                match = keyword_pattern.match(line)
                 # If we are in a multiple-line comment, let's skip this line
-                if in_comment:
-                    continue
-                # Search after the keyword which MUST be the first word in the line (no " for example before)
-                # keyword_start = line.lstrip().find(elem_type)
-                match = re.match(r'^\s*' + elem_type + r'\s+([-_\.\w]+)' + r'\s*{', line)
-                if match:
-                    found_keyword = True
-                    identifier = match.group(1)
-                    # Let's open the output file if not yet done
-                    if file_out is None:
-                        file_out = open(
-                            extract_dir + '/' + elem_type + '-' + identifier + '.txt',
+                if match and match.group(1) in searching_types and not in_comment[match.group(1)]:
+                    elem_type, identifier = match.groups()
+                    started_type = elem_type
+                    elem_files[elem_type].append(elem_type + '-' + identifier + '.txt')
+                    if contents is None:
+                        files_out[elem_type] = open(
+                            extract_dir + '/' + elem_files[elem_type][-1],
                             'w',
                             encoding='utf-8',
                         )
-            # print("Creating file: " + extract_dir + '/' + elem_type + '-' + identifier + '.txt')
-            if found_keyword and file_out:  # Processing the keyword
-                file_out.write(line)
-                if line.find('{') >= 0:
-                    open_bracket_count = open_bracket_count + 1
-                if line.find('}') >= 0:
-                    open_bracket_count = open_bracket_count - 1
-                # Are we out of the outermost brackets?
-                if open_bracket_count == 0:
-                    file_out.close()
-                    in_comment = False
-                    found_keyword = False
-                    file_out = None
+                    else:
+                        files_out[elem_type] = io.StringIO()
+                    # the keyword line is written without its comments
+                    if _write_elem_line(elem_type, line, files_out, open_bracket_count):
+                        _close_elem(elem_type, elem_files, files_out, contents)
+                        in_comment[elem_type] = False
+            for elem_type in elem_types:
+                if files_out[elem_type] is not None and elem_type != started_type:
+                    if _write_elem_line(elem_type, raw_line, files_out, open_bracket_count):
+                        _close_elem(elem_type, elem_files, files_out, contents)
+                        in_comment[elem_type] = False
+    # elements which are not closed until the end of the module are kept as they are
+    for elem_type in elem_types:
+        if files_out[elem_type] is not None:
+            _close_elem(elem_type, elem_files, files_out, contents)
+    return [elem_file for elem_type in elem_types for elem_file in elem_files[elem_type]]
+
+
+def _write_elem_line(elem_type, line, files_out, open_bracket_count):
+    # Processing the keyword
+    files_out[elem_type].write(line)
+    if line.find('{') >= 0:
+        open_bracket_count[elem_type] = open_bracket_count[elem_type] + 1
+    if line.find('}') >= 0:
+        open_bracket_count[elem_type] = open_bracket_count[elem_type] - 1
+    # Are we out of the outermost brackets?
+    return open_bracket_count[elem_type] == 0
+
+
+def _close_elem(elem_type, elem_files, files_out, contents):
+    if contents is not None:
+        contents[elem_files[elem_type][-1]] = files_out[elem_type].getvalue()
+    files_out[elem_type].close()
+    files_out[elem_type] = None
 
 
 if __name__ == '__main__':
-    file = '/var/www/html/YANG-modules/ietf-gen-rpc.yang'
-    extract_elem(file, '/tmp/extract', 'grouping')
-    extract_elem(file, '/tmp/extract', 'typedef')
-    extract_elem(file, '/tmp/extract', 'identity')
-    file = '/var/yang/all_modules/ietf-yang-types@2010-09-24.yang'
-    extract_elem(file, '/tmp/extract', 'grouping')
-    extract_elem(file, '/tmp/extract', 'typedef')
-    extract_elem(file, '/tmp/extract', 'identity')
-    file = '/var/yang/all_modules/ietf-netconf-notifications@2012-02-06.yang'
-    extract_elem(file, '/tmp/extract', 'grouping')
-    extract_elem(file, '/tmp/extract', 'typedef')
-    extract_elem(file, '/tmp/extract', 'identity')
+    extract_elems('/var/www/html/YANG-modules/ietf-gen-rpc.yang', '/tmp/extract')
+    extract_elems('/var/yang/all_modules/ietf-yang-types@2010-09-24.yang', '/tmp/extract')
+    extract_elems('/var/yang/all_modules/ietf-netconf-notifications@2012-02-06.yang', '/tmp/extract')
@@ -0,0 +1,357 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains ExtractionManifest class which makes the extraction of the YANG modules from RFCs and drafts
+incremental. For every extracted document the manifest records the hash of its content, the version of xym
+and the files written into the output directories. Only new documents and documents whose content, xym version
+or outputs changed are extracted again, the outputs of the documents which disappeared are removed
+and the results of the other documents are taken from the manifest.
+
+The outputs have to be the same as if all the documents were extracted from scratch in the sorted order.
+xym doesn't overwrite a module file extracted earlier by another document, so the manifest also records
+the modules which were skipped for this reason. A document is extracted again once the document owning
+such a module is removed or changed, or if the module belongs to a document later in the sorted order.
+Other files (modules renamed by xym to include their revision, typedefs, groupings and identities)
+are overwritten by every document writing them. Those have to contain the output of the last such document
+in the sorted order, which is extracted again if needed, element files are just extracted again from its modules.
+
+When a document is extracted again, e.g. after a xym update, the files written with the same content as before
+are replaced by the previous files, so that only the files whose content changed get a new modification time.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import filecmp
+import json
+import os
+import shutil
+import tempfile
+import typing as t
+from collections import Counter
+
+from xym import __version__ as xym_version
+
+from extractors.helper import is_invalid_module_filename
+from utility.file_helpers import get_file_signature, hash_file, write_json_atomically
+
+PREVIOUS_OUTPUTS_DIRECTORY = '.previous-outputs'
+
+
+class ExtractionManifest:
+    class Extraction(t.TypedDict):
+        files: dict[str, list[str]]
+        skipped_modules: dict[str, list[str]]
+        result: dict
+
+    class Entry(Extraction):
+        hash: str
+        signature: str
+        xym_version: str
+
+    def __init__(
+        self,
+        path: str,
+        directories: list[str],
+        elements_directory: str = '',
+        code_snippets_directory: str = '',
+        moved_files: t.Iterable[str] = (),
+        debug_level: int = 0,
+    ):
+        """
+        Arguments:
+            :param path                     (str) Path to the .json file with the manifest
+            :param directories              (list) Output directories of the extraction, files in these directories
+            which don't belong to any document of the manifest are removed
+            :param elements_directory       (str) Output directory with the typedefs, groupings and identities
+            :param code_snippets_directory  (str) Directory with the code snippets directories of the documents
+            :param moved_files              (Iterable) Names of the files moved out of the output directories
+            after every extraction (e.g. modules of old RFCs), their absence doesn't make a document outdated
+            :param debug_level              (int) debug level; If > 0 print some debug statements to the console
+        """
+        self.path = path
+        self.directories = sorted({directory for directory in (*directories, elements_directory) if directory})
+        self.elements_directory = elements_directory
+        self.code_snippets_directory = code_snippets_directory
+        self.moved_files = set(moved_files)
+        self.debug_level = debug_level
+        self.entries: dict[str, ExtractionManifest.Entry] = {}
+        self.load()
+
+    def load(self):
+        """Load entries of the manifest, the manifest of different output directories is not used."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as reader:
+                manifest = json.load(reader)
+        except (FileNotFoundError, json.JSONDecodeError):
+            manifest = {}
+        if manifest.get('directories') == self.directories:
+            self.entries = manifest.get('entries', {})
+        else:
+            self.entries = {}
+
+    def save(self):
+        """Write the manifest to a temporary file first, so that an interrupted run can't leave it corrupted."""
+        write_json_atomically(self.path, {'directories': self.directories, 'entries': self.entries})
+
+    def update(
+        self,
+        srcdir: str,
+        documents: list[str],
+        extract: t.Callable[[list[str]], dict[str, Extraction]],
+        extract_elements: t.Optional[t.Callable[[Entry, str], None]] = None,
+    ):
+        """
+        Bring the output directories and the manifest up to date with the documents.
+
+        Arguments:
+            :param srcdir           (str) Directory with the documents
+            :param documents        (list) Names of all the documents which should have their outputs extracted
+            :param extract          (Callable) Function extracting the given documents in the sorted order,
+            returns the written files, the skipped modules and the result of the extraction for each document
+            :param extract_elements (Callable) Function writing the typedefs, groupings and identities
+            of the modules of the document entry into the given directory
+        """
+        documents = sorted(documents)
+        listings = self._list_directories()
+        self._remove_untracked_files(listings)
+        signatures = {}
+        outdated = set()
+        for document in documents:
+            signatures[document] = self._get_signature(srcdir, document)
+            if self._is_outdated(document, signatures[document], listings):
+                outdated.add(document)
+            else:
+                # the content didn't change, e.g. the document was copied again, the new signature saves its reading
+                self.entries[document]['signature'] = signatures[document][0]
+        removed_documents = self.entries.keys() - set(documents)
+        to_remove = outdated | removed_documents
+        print(f'{len(outdated)} out of {len(documents)} documents will be extracted, {len(removed_documents)} removed')
+
+        stale_elements: dict[str, str] = {}
+        try:
+            while True:
+                touched_files = self._remove_documents_outputs(to_remove, outdated)
+                extracted = sorted(outdated)
+                if not extracted:
+                    break
+                for document, extraction in extract(extracted).items():
+                    self.entries[document] = {
+                        **extraction,
+                        'hash': signatures[document][1],
+                        'signature': signatures[document][0],
+                        'xym_version': xym_version,
+                    }
+                    touched_files.update(
+                        (directory, filename)
+                        for directory, filenames in extraction['files'].items()
+                        for filename in filenames
+                    )
+                # the documents were extracted in the sorted order after all the other documents, so a file
+                # written by several documents is correct if the last of them was extracted now
+                extracted_documents = set(extracted)
+                outdated = set()
+                for (directory, filename), writer in self._get_last_writers(touched_files).items():
+                    if writer in extracted_documents:
+                        stale_elements.pop(filename, None)
+                    elif directory == self.elements_directory:
+                        stale_elements[filename] = writer
+                    else:
+                        outdated.add(writer)
+                # a module could have been skipped as extracted by a document later in the sorted order,
+                # both of the documents are extracted again for the module to belong to the first one
+                for owner, document in self._get_later_module_owners(extracted).items():
+                    outdated.update((owner, document))
+                if not outdated:
+                    break
+                to_remove = set(outdated)
+            self._refresh_elements(stale_elements, extract_elements)
+        finally:
+            self._restore_unchanged_outputs()
+        self.save()
+
+    def _list_directories(self) -> dict[str, set[str]]:
+        listings = {}
+        for directory in self.directories:
+            os.makedirs(directory, exist_ok=True)
+            listings[directory] = set(os.listdir(directory))
+        return listings
+
+    def _remove_untracked_files(self, listings: dict[str, set[str]]):
+        """Remove files in the output directories which don't belong to any document, e.g. left by a full extraction."""
+        tracked_files = {directory: set() for directory in self.directories}
+        for entry in self.entries.values():
+            for directory, filenames in entry['files'].items():
+                tracked_files.setdefault(directory, set()).update(filenames)
+        for directory, filenames in listings.items():
+            for filename in filenames - tracked_files[directory]:
+                file_path = os.path.join(directory, filename)
+                if os.path.isdir(file_path) and not os.path.islink(file_path):
+                    shutil.rmtree(file_path)
+                else:
+                    os.unlink(file_path)
+                if self.debug_level > 0:
+                    print(f'DEBUG: removing the untracked file {file_path}')
+            listings[directory] = filenames & tracked_files[directory]
+
+    def _get_signature(self, srcdir: str, document: str) -> tuple[str, str]:
+        """Signature and hash of the document, the document is read only if its signature changed."""
+        path = os.path.join(srcdir, document)
+        signature = get_file_signature(path)
+        entry = self.entries.get(document)
+        if entry and entry['signature'] == signature:
+            return signature, entry['hash']
+        return signature, hash_file(path)
+
+    def _is_outdated(self, document: str, signature: tuple[str, str], listings: dict[str, set[str]]) -> bool:
+        entry = self.entries.get(document)
+        if not entry or entry['hash'] != signature[1] or entry['xym_version'] != xym_version:
+            return True
+        for directory, filenames in entry['files'].items():
+            missing_files = set(filenames) - listings.get(directory, set()) - self.moved_files
+            # invalid modules are removed from the output directories after every extraction
+            if any(not is_invalid_module_filename(filename) for filename in missing_files):
+                return True
+        return False
+
+    def _remove_documents_outputs(self, to_remove: set[str], outdated: set[str]) -> set[tuple[str, str]]:
+        """
+        Remove the outputs of the documents and of the documents which skipped a module that is removed now,
+        the latter are added to the outdated documents. Files written by other documents as well are not removed.
+
+        :return: (set) Directories and names of the files which were written by the documents
+        """
+        writers_count = Counter(
+            (directory, filename)
+            for entry in self.entries.values()
+            for directory, filenames in entry['files'].items()
+            for filename in set(filenames)
+        )
+        touched_files = set()
+        while to_remove:
+            freed_modules = set()
+            for document in to_remove:
+                entry = self.entries.pop(document, None)
+                if not entry:
+                    continue
+                for directory, filenames in entry['files'].items():
+                    for filename in set(filenames):
+                        writers_count[(directory, filename)] -= 1
+                        touched_files.add((directory, filename))
+                        self._keep_previous_output(directory, filename)
+                        if writers_count[(directory, filename)] > 0:
+                            continue
+                        freed_modules.add((directory, filename))
+                        try:
+                            os.unlink(os.path.join(directory, filename))
+                        except FileNotFoundError:
+                            pass
+                if self.code_snippets_directory:
+                    shutil.rmtree(
+                        os.path.join(self.code_snippets_directory, os.path.splitext(document)[0]),
+                        ignore_errors=True,
+                    )
+                if self.debug_level > 0:
+                    print(f'DEBUG: outputs of {document} removed')
+            to_remove = {
+                document
+                for document, entry in self.entries.items()
+                if any(
+                    (directory, module) in freed_modules
+                    for directory, modules in entry['skipped_modules'].items()
+                    for module in modules
+                )
+            }
+            outdated |= to_remove
+        return touched_files
+
+    def _keep_previous_output(self, directory: str, filename: str):
+        """
+        Hard link the file written by a document before it is removed or written again, the first time only.
+        xym never rewrites an existing module in place (it skips or renames it), so the link keeps its previous content.
+        """
+        previous_outputs_directory = os.path.join(directory, PREVIOUS_OUTPUTS_DIRECTORY)
+        os.makedirs(previous_outputs_directory, exist_ok=True)
+        try:
+            os.link(os.path.join(directory, filename), os.path.join(previous_outputs_directory, filename))
+        except (FileNotFoundError, FileExistsError):
+            pass
+
+    def _restore_unchanged_outputs(self):
+        """
+        Put the previous files back in place of the files written again with the same content. The files keep
+        their inode and modification time, so e.g. FileHasher doesn't need to read them again after a xym update.
+        """
+        restored_files = 0
+        for directory in self.directories:
+            previous_outputs_directory = os.path.join(directory, PREVIOUS_OUTPUTS_DIRECTORY)
+            if not os.path.isdir(previous_outputs_directory):
+                continue
+            for filename in os.listdir(previous_outputs_directory):
+                previous_path = os.path.join(previous_outputs_directory, filename)
+                path = os.path.join(directory, filename)
+                if os.path.isfile(path) and filecmp.cmp(previous_path, path, shallow=False):
+                    os.replace(previous_path, path)
+                    restored_files += 1
+            shutil.rmtree(previous_outputs_directory)
+        if restored_files:
+            print(f'{restored_files} files written again with the same content kept unchanged')
+
+    def _get_last_writers(self, files: set[tuple[str, str]]) -> dict[tuple[str, str], str]:
+        last_writers = {}
+        for document in sorted(self.entries):
+            for directory, filenames in self.entries[document]['files'].items():
+                for filename in filenames:
+                    if (directory, filename) in files:
+                        last_writers[(directory, filename)] = document
+        return last_writers
+
+    def _get_later_module_owners(self, extracted: list[str]) -> dict[str, str]:
+        owners = {
+            (directory, filename): document
+            for document, entry in self.entries.items()
+            for directory, filenames in entry['files'].items()
+            if directory != self.elements_directory
+            for filename in filenames
+        }
+        later_owners = {}
+        for document in extracted:
+            for directory, modules in self.entries[document]['skipped_modules'].items():
+                for module in modules:
+                    owner = owners.get((directory, module))
+                    if owner and owner > document:
+                        later_owners[owner] = document
+        return later_owners
+
+    def _refresh_elements(
+        self,
+        stale_elements: dict[str, str],
+        extract_elements: t.Optional[t.Callable[[Entry, str], None]],
+    ):
+        """Write the element files again from the modules of their last document in the sorted order."""
+        if not stale_elements or not extract_elements:
+            return
+        elements_by_document: dict[str, list[str]] = {}
+        for filename, document in stale_elements.items():
+            elements_by_document.setdefault(document, []).append(filename)
+        for document, filenames in elements_by_document.items():
+            with tempfile.TemporaryDirectory() as elements_directory:
+                extract_elements(self.entries[document], elements_directory)
+                for filename in filenames:
+                    element_path = os.path.join(elements_directory, filename)
+                    if os.path.isfile(element_path):
+                        shutil.move(element_path, os.path.join(self.elements_directory, filename))
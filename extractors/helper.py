@@ -19,7 +19,36 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 
 
 import glob
+import mmap
+import multiprocessing
 import os
+import re
+import shutil
+from dataclasses import dataclass
+
+from xym import xym
+
+
+@dataclass(frozen=True)
+class XymTask:
+    """Extraction of the YANG modules from one RFC/Draft file into one directory."""
+
+    source_file: str
+    srcdir: str
+    dstdir: str
+    code_snippets_dir: str
+    strict: bool = False
+    strict_examples: bool = False
+    debug_level: int = 0
+
+
+@dataclass
+class XymResult:
+    source_file: str
+    extracted_models: list[str]
+    stderr: str
+    dstdir: str
+    code_snippets_dir: str
 
 
 def invert_yang_modules_dict(in_dict: dict, debug_level: int = 0):
@@ -50,6 +79,11 @@ def invert_yang_modules_dict(in_dict: dict, debug_level: int = 0):
     return inv_dict
 
 
+def is_invalid_module_filename(filename: str) -> bool:
+    """Whether the filename of the YANG module extracted by xym is not valid."""
+    return ' ' in filename or '@YYYY-MM-DD' in filename or filename.startswith('.yang') or filename.startswith('@')
+
+
 def remove_invalid_files(directory: str, yang_dict: dict):
     """
     Remove YANG modules in directory having invalid filenames.
@@ -62,26 +96,12 @@ def remove_invalid_files(directory: str, yang_dict: dict):
     path = f'{directory}*.yang'
     for full_path in glob.glob(path):
         filename = os.path.basename(full_path)
-        if ' ' in filename:
-            os.remove(full_path)
-            if yang_dict.get(filename):
-                yang_dict.pop(filename)
-            print(f'Invalid YANG module removed: {full_path}')
-        if '@YYYY-MM-DD' in filename:
+        if is_invalid_module_filename(filename):
             os.remove(full_path)
-            if yang_dict.get(filename):
-                yang_dict.pop(filename)
-            print(f'Invalid YANG module removed: {full_path}')
-        if filename.startswith('.yang'):
-            os.remove(full_path)
-            if yang_dict.get(filename):
-                yang_dict.pop(filename)
-            print(f'Invalid YANG module removed: {full_path}')
-        if filename.startswith('@'):
-            os.remove(full_path)
-            if yang_dict.get(filename):
-                yang_dict.pop(filename)
             print(f'Invalid YANG module removed: {full_path}')
+    # modules of the documents taken over from the extraction manifest were removed by an earlier extraction
+    for filename in [filename for filename in yang_dict if is_invalid_module_filename(filename)]:
+        yang_dict.pop(filename)
 
 
 def check_after_xym_extraction(filename: str, extracted_yang_models: list):
@@ -104,3 +124,296 @@ def check_after_xym_extraction(filename: str, extracted_yang_models: list):
         correct = False
 
     return correct
+
+
+def get_existing_modules(xym_stderr: str) -> list[str]:
+    """
+    Get the YANG modules which xym didn't extract, because a module with the same file name was extracted before.
+
+    Arguments:
+        :param xym_stderr   (str) Captured stderr output of xym
+    :return: (list) File names of the modules which were not extracted
+    """
+    return [os.path.basename(model_path) for model_path in re.findall(r"File '(.+)' exists", xym_stderr)]
+
+
+CODE_BEGINS = b'<CODE BEGINS>'
+
+
+def contains_code_begins(path: str) -> bool:
+    """
+    Check whether the RFC/Draft file contains a <CODE BEGINS> marker. The file is memory mapped and searched
+    as bytes, so it is neither decoded nor split into lines.
+
+    Arguments:
+        :param path     (str) Path to the RFC/Draft file
+    :return: (bool) Whether the file contains the marker, False if the file is empty or can't be read
+    """
+    try:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                return mapped_file.find(CODE_BEGINS) != -1
+    except (OSError, ValueError):
+        # mmap raises ValueError for empty files
+        return False
+
+
+def list_files_with_code(directory: str, processes: int = 1) -> list[str]:
+    """
+    List the '.txt' files of the directory which contain a <CODE BEGINS> marker,
+    the files are searched in a pool of processes if requested.
+
+    Arguments:
+        :param directory    (str) Directory with the RFC/Draft files
+        :param processes    (int) Number of processes searching the files
+    :return: (list) Sorted file names of the files which contain the marker
+    """
+    with os.scandir(directory) as entries:
+        filenames = [entry.name for entry in entries if entry.name.endswith('.txt') and entry.is_file()]
+    paths = [os.path.join(directory, filename) for filename in filenames]
+    if processes > 1 and len(paths) > 1:
+        with multiprocessing.Pool(processes) as pool:
+            chunksize = max(1, min(256, len(paths) // (processes * 4)))
+            with_code = pool.map(contains_code_begins, paths, chunksize=chunksize)
+    else:
+        with_code = [contains_code_begins(path) for path in paths]
+    return sorted(filename for filename, has_code in zip(filenames, with_code) if has_code)
+
+
+class CapturingYangModuleExtractor(xym.YangModuleExtractor):
+    """
+    Extractor of the YANG modules keeping its warnings and errors instead of printing them to sys.stderr,
+    so that the messages are attributed to the right document even when extractions run concurrently.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.messages: list[str] = []
+
+    def warning(self, s):
+        self.messages.append(f"   WARNING: '{self.src_id}', {s}\n")
+
+    def error(self, s):
+        self.messages.append(f"   ERROR: '{self.src_id}', {s}\n")
+
+    @property
+    def stderr(self) -> str:
+        """The messages in the same format as xym prints them to sys.stderr."""
+        return ''.join(self.messages)
+
+    def extract_from_file(self, srcdir: str):
+        """Extract the modules from the source file in the same way as xym.xym() does."""
+        try:
+            with open(os.path.join(srcdir, self.src_id), encoding='latin-1', errors='ignore') as f:
+                self.extract_yang_model_text(f.read())
+        except IOError as ioe:
+            print(ioe)
+        if self.extract_code_snippets:
+            self.write_code_snippets_to_files()
+
+
+def run_xym(task: XymTask) -> XymResult:
+    """
+    Extract the YANG modules from the RFC/Draft file with xym, the warnings and errors of xym are captured
+    by the extractor of this call only, sys.stderr is left untouched.
+
+    Arguments:
+        :param task     (XymTask) Description of the extraction
+    :return: (XymResult) Names of the extracted modules and the captured stderr output
+    """
+    extractor = CapturingYangModuleExtractor(
+        task.source_file,
+        task.dstdir,
+        strict=task.strict,
+        strict_examples=task.strict_examples,
+        debug_level=task.debug_level,
+        add_line_refs=False,
+        extract_code_snippets=True,
+        code_snippets_dir=task.code_snippets_dir,
+    )
+    extractor.extract_from_file(task.srcdir)
+    extracted = extractor.get_extracted_models(False, True)
+    return XymResult(task.source_file, extracted, extractor.stderr, task.dstdir, task.code_snippets_dir)
+
+
+class ClassifyingYangModuleExtractor(CapturingYangModuleExtractor):
+    """
+    Extractor of all the YANG modules of the document (as with strict=False) remembering for every
+    extracted module whether it is an example module and whether it is enclosed in a <CODE BEGINS> section,
+    which is all that decides whether the module would be extracted with the strict or strict_examples flags.
+    """
+
+    # errors after which xym stops extracting, the other modes could have extracted more modules
+    ABORTING_ERRORS = (
+        "'module' statement within another module",
+        '<CODE BEGINS> within a model',
+        'EOF encountered while parsing',
+    )
+
+    def __init__(self, src_id: str, dst_dir: str, debug_level: int, code_snippets_dir: str):
+        super().__init__(
+            src_id,
+            dst_dir,
+            strict=False,
+            strict_examples=False,
+            debug_level=debug_level,
+            extract_code_snippets=True,
+            code_snippets_dir=code_snippets_dir,
+        )
+        self.modules_placement: dict[str, tuple[bool, bool]] = {}
+        self.incomplete = False
+        self._current_module_placement = (False, False)
+
+    def check_edge_cases(self, example_match, in_code):
+        self._current_module_placement = (bool(example_match), in_code)
+        return super().check_edge_cases(example_match, in_code)
+
+    def write_model_to_file(self, mdl, fn):
+        extracted_models_count = len(self.extracted_models)
+        super().write_model_to_file(mdl, fn)
+        if len(self.extracted_models) > extracted_models_count:
+            self.modules_placement[fn] = self._current_module_placement
+        elif fn:
+            # module with the same file name was already extracted, other modes could skip the first one
+            self.incomplete = True
+
+    def change_model_name(self, old_model_name, new_model_name):
+        super().change_model_name(old_model_name, new_model_name)
+        self.modules_placement[new_model_name] = self.modules_placement.pop(old_model_name)
+
+    def error(self, s):
+        if any(aborting_error in s for aborting_error in self.ABORTING_ERRORS):
+            self.incomplete = True
+        super().error(s)
+
+    def is_extracted_by(self, task: XymTask, model: str) -> bool:
+        """Whether the model would be extracted by xym with the flags of the task, same as check_edge_cases()."""
+        example_match, in_code = self.modules_placement[model]
+        if task.strict_examples:
+            return example_match and not in_code
+        if task.strict:
+            return in_code
+        return True
+
+
+def run_xym_single_pass(tasks: list[XymTask], work_directory: str) -> list[XymResult]:
+    """
+    Run the extractions of one RFC/Draft file differing only in the xym flags with a single pass of xym
+    over the document. All the modules are extracted once and classified by the flags of each task.
+    If xym stopped the extraction early or found modules with the same file name, which could result
+    in a different set of modules for different flags, the extractions are run one by one instead.
+
+    Arguments:
+        :param tasks            (list) Extractions of the same file, each one into a different directory
+        :param work_directory   (str) Directory where to extract all the modules before they are classified
+    :return: (list) Results of the extractions, in the same order as the tasks
+    """
+    first_task = tasks[0]
+    os.makedirs(work_directory)
+    extractor = ClassifyingYangModuleExtractor(
+        first_task.source_file,
+        work_directory,
+        first_task.debug_level,
+        first_task.code_snippets_dir,
+    )
+    extractor.extract_from_file(first_task.srcdir)
+    extracted_models = extractor.get_extracted_models(False, True)
+    if extractor.incomplete:
+        shutil.rmtree(work_directory)
+        shutil.rmtree(first_task.code_snippets_dir, ignore_errors=True)
+        return [run_xym(task) for task in tasks]
+    results = []
+    for index, task in enumerate(tasks):
+        task_models = [model for model in extracted_models if extractor.is_extracted_by(task, model)]
+        for model in task_models:
+            os.link(os.path.join(work_directory, model), os.path.join(task.dstdir, model))
+        # the messages of the document are reported once, with the first task and with the one extracting all models
+        stderr = extractor.stderr if index == 0 or not (task.strict or task.strict_examples) else ''
+        stderr = stderr.replace(work_directory, task.dstdir)
+        results.append(XymResult(task.source_file, task_models, stderr, task.dstdir, task.code_snippets_dir))
+    return results
+
+
+def run_xym_in_work_directory(
+    task_groups: list[list[XymTask]],
+    work_directory: str,
+    processes: int = 1,
+    single_pass: bool = False,
+) -> dict[XymTask, XymResult]:
+    """
+    Run the xym extractions, in a pool of processes if requested. Every extraction writes into its own subdirectory
+    of the 'work_directory', so that the extractions can't interfere, the results are moved to the requested
+    directories later by merge_xym_result() in a deterministic order.
+
+    Arguments:
+        :param task_groups      (list) Extractions to run, grouped by the RFC/Draft file
+        :param work_directory   (str) Directory where to create the directories of the extractions
+        :param processes        (int) Number of processes extracting the modules
+        :param single_pass      (bool) Whether to run the extractions of a group with a single pass of xym
+    :return: (dict) Results of the extractions in the work directory indexed by their tasks
+    """
+    work_task_groups = []
+    for group_index, tasks in enumerate(task_groups):
+        work_tasks = []
+        group_directory = os.path.join(work_directory, str(group_index))
+        for index, task in enumerate(tasks):
+            task_directory = os.path.join(group_directory, str(index))
+            os.makedirs(os.path.join(task_directory, 'yang'))
+            work_tasks.append(
+                XymTask(
+                    task.source_file,
+                    task.srcdir,
+                    os.path.join(task_directory, 'yang'),
+                    os.path.join(task_directory, 'code-snippets'),
+                    strict=task.strict,
+                    strict_examples=task.strict_examples,
+                    debug_level=task.debug_level,
+                ),
+            )
+        work_task_groups.append((work_tasks, os.path.join(group_directory, 'single-pass') if single_pass else ''))
+    if processes > 1:
+        with multiprocessing.Pool(processes) as pool:
+            work_results = pool.map(_run_xym_group, work_task_groups, chunksize=1)
+    else:
+        work_results = [_run_xym_group(work_task_group) for work_task_group in work_task_groups]
+    return {task: result for tasks, results in zip(task_groups, work_results) for task, result in zip(tasks, results)}
+
+
+def _run_xym_group(work_task_group: tuple[list[XymTask], str]) -> list[XymResult]:
+    work_tasks, single_pass_directory = work_task_group
+    if single_pass_directory and len(work_tasks) > 1:
+        return run_xym_single_pass(work_tasks, single_pass_directory)
+    return [run_xym(task) for task in work_tasks]
+
+
+def merge_xym_result(work_result: XymResult, dstdir: str, code_snippets_dir: str) -> XymResult:
+    """
+    Move the modules and code snippets extracted into the work directory by run_xym_in_work_directory()
+    to their destination directories, as if xym extracted them there. Modules already present in 'dstdir'
+    are not overwritten and the same error as xym would print is added to the stderr output.
+
+    Arguments:
+        :param work_result          (XymResult) Result of the extraction into the work directory
+        :param dstdir               (str) Directory where the modules should have been extracted
+        :param code_snippets_dir    (str) Directory where the code snippets should have been extracted
+    :return: (XymResult) Result of the extraction as if xym extracted the modules into 'dstdir'
+    """
+    extracted_models = []
+    exists_errors = []
+    for model in work_result.extracted_models:
+        model_path = f'{dstdir}/{model}'
+        if os.path.isfile(model_path):
+            exists_errors.append(f"   ERROR: '{work_result.source_file}', File '{model_path}' exists\n")
+            continue
+        shutil.move(os.path.join(work_result.dstdir, model), model_path)
+        extracted_models.append(model)
+    if os.path.isdir(work_result.code_snippets_dir):
+        os.makedirs(code_snippets_dir, exist_ok=True)
+        for filename in os.listdir(work_result.code_snippets_dir):
+            shutil.move(
+                os.path.join(work_result.code_snippets_dir, filename),
+                os.path.join(code_snippets_dir, filename),
+            )
+    # xym prints the paths to the modules in some of its messages
+    stderr = ''.join(exists_errors) + work_result.stderr.replace(work_result.dstdir, dstdir)
+    return XymResult(work_result.source_file, extracted_models, stderr, dstdir, code_snippets_dir)
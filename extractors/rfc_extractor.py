@@ -20,11 +20,32 @@ __email__ = 'slavomir.mazur@pantheon.tech'
 import json
 import os
 import shutil
-
-from xym import xym
-
-from extractors.extract_elem import extract_elem
-from extractors.helper import check_after_xym_extraction, invert_yang_modules_dict, remove_invalid_files
+import sys
+import tempfile
+import typing as t
+
+from extractors.elements_archive import ElementsArchive
+from extractors.extract_elem import extract_elems
+from extractors.extraction_manifest import ExtractionManifest
+from extractors.helper import (
+    XymResult,
+    XymTask,
+    check_after_xym_extraction,
+    get_existing_modules,
+    invert_yang_modules_dict,
+    merge_xym_result,
+    remove_invalid_files,
+    run_xym,
+    run_xym_in_work_directory,
+)
+
+OLD_RFC_MODULES_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../resources/old-rfcs.json')
+
+
+def load_old_rfc_modules() -> list[str]:
+    """Names of the modules from old RFCs not following the example- conventions, see clean_old_rfc_yang_modules()."""
+    with open(OLD_RFC_MODULES_PATH, 'r') as f:
+        return json.load(f)
 
 
 class RFCExtractor:
@@ -35,12 +56,20 @@ class RFCExtractor:
         rfc_extraction_yang_path: str,
         code_snippets_directory: str,
         debug_level: int,
+        processes: int = 1,
+        manifest: t.Optional[ExtractionManifest] = None,
+        elements_archive: t.Optional[ElementsArchive] = None,
     ):
         self.rfc_path = rfc_path
         self.rfc_yang_path = rfc_yang_path
         self.rfc_extraction_yang_path = rfc_extraction_yang_path
         self.debug_level = debug_level
         self.code_snippets_directory = code_snippets_directory
+        self.processes = processes
+        self.manifest = manifest
+        self.elements_archive = elements_archive
+        self._prepared_xym_results: dict[XymTask, XymResult] = {}
+        self._extractions: dict[str, ExtractionManifest.Extraction] = {}
         self.ietf_rfcs = []
         self.rfc_yang_dict = {}
         self.inverted_rfc_yang_dict = {}
@@ -52,46 +81,135 @@ class RFCExtractor:
         print('IETF RFCs list created')
 
     def extract(self):
-        self.extract_rfcs()
+        documents = list(self.ietf_rfcs)
+        if self.manifest:
+            self.manifest.update(
+                self.rfc_path,
+                self.ietf_rfcs,
+                self._extract_rfcs_for_manifest,
+                lambda entry, elements_path: self.extract_all_elements(entry['result']['yang'] or [], elements_path),
+            )
+            self._load_manifest_results()
+        else:
+            self.extract_rfcs()
+        if self.elements_archive:
+            # elements of the documents which disappeared
+            self.elements_archive.retain_documents(documents)
+            self.elements_archive.commit()
         self.invert_dict()
         self.remove_invalid_files()
 
-    def extract_rfcs(self):
-        for rfc_file in self.ietf_rfcs:
+    def extract_rfcs(self, rfcs: t.Optional[list[str]] = None):
+        rfcs = self.ietf_rfcs if rfcs is None else rfcs
+        if self.processes <= 1:
+            self._extract_rfcs(rfcs)
+            return
+        # xym runs in parallel into separate work directories, the results are then merged RFC by RFC
+        # in the same order as if the RFCs were extracted one after another
+        xym_task_groups = [[self._create_xym_task(rfc_file)] for rfc_file in rfcs]
+        with tempfile.TemporaryDirectory() as work_directory:
+            self._prepared_xym_results = run_xym_in_work_directory(
+                xym_task_groups,
+                work_directory,
+                processes=self.processes,
+            )
+            try:
+                self._extract_rfcs(rfcs)
+            finally:
+                self._prepared_xym_results = {}
+
+    def _extract_rfcs_for_manifest(self, rfcs: list[str]) -> dict[str, ExtractionManifest.Extraction]:
+        self._extractions = {}
+        self.extract_rfcs(rfcs)
+        for rfc_file in rfcs:
+            result = self._extractions[rfc_file]['result']
+            result.update({'valid': result.get('valid', True), 'yang': self.rfc_yang_dict.get(rfc_file)})
+        return self._extractions
+
+    def _load_manifest_results(self):
+        """Take the results of all the RFCs, extracted now or during an earlier run, from the manifest."""
+        results = {rfc_file: self.manifest.entries[rfc_file]['result'] for rfc_file in self.ietf_rfcs}
+        self.ietf_rfcs = [rfc_file for rfc_file, result in results.items() if result['valid']]
+        self.rfc_yang_dict = {rfc_file: result['yang'] for rfc_file, result in results.items() if result['yang']}
+
+    def _extract_rfcs(self, rfcs: list[str]):
+        for rfc_file in rfcs:
+            # the RFC could have been extracted before, its results are replaced
+            self._extractions[rfc_file] = {'files': {}, 'skipped_modules': {}, 'result': {}}
+            self.rfc_yang_dict.pop(rfc_file, None)
+            if self.elements_archive:
+                self.elements_archive.remove_documents([rfc_file])
             extracted_yang_models = self.extract_from_rfc_file(rfc_file)
 
             if extracted_yang_models:
                 correct = check_after_xym_extraction(rfc_file, extracted_yang_models)
                 if not correct:
-                    self.ietf_rfcs.remove(rfc_file)
+                    self._extractions[rfc_file]['result']['valid'] = False
+                    if rfc_file in self.ietf_rfcs:
+                        self.ietf_rfcs.remove(rfc_file)
                     continue
 
                 if self.debug_level > 0:
                     print(f'DEBUG: Extracted YANG models from RFC\n {extracted_yang_models}')
 
                 # typedef, grouping and identity extraction from RFCs
-                for extracted_model in extracted_yang_models:
-                    if not extracted_model.startswith('example-'):
-                        print(f'Identifier definition extraction for {extracted_model}')
-                        module_fname = os.path.join(self.rfc_yang_path, extracted_model)
-                        extract_elem(module_fname, self.rfc_extraction_yang_path, 'typedef')
-                        extract_elem(module_fname, self.rfc_extraction_yang_path, 'grouping')
-                        extract_elem(module_fname, self.rfc_extraction_yang_path, 'identity')
+                if self.elements_archive:
+                    elements_contents = {}
+                    self.extract_all_elements(extracted_yang_models, contents=elements_contents)
+                    self.elements_archive.replace_elements(rfc_file, elements_contents)
+                else:
+                    elements = self.extract_all_elements(extracted_yang_models)
+                    self._extractions[rfc_file]['files'].setdefault(self.rfc_extraction_yang_path, []).extend(elements)
                 self.rfc_yang_dict[rfc_file] = extracted_yang_models
 
+    def extract_all_elements(
+        self,
+        extracted_yang_models: list,
+        elements_path: str = '',
+        contents: t.Optional[dict[str, str]] = None,
+    ) -> list[str]:
+        """Extract typedefs, groupings and identities from data models into .txt files, except for example models.
+        Names of the created files are returned, if the contents dict is given the texts of the elements
+        are put into it instead of the files.
+        """
+        elements_path = elements_path or self.rfc_extraction_yang_path
+        elements = []
+        for extracted_model in extracted_yang_models:
+            if not extracted_model.startswith('example-'):
+                print(f'Identifier definition extraction for {extracted_model}')
+                module_fname = os.path.join(self.rfc_yang_path, extracted_model)
+                if not os.path.isfile(module_fname):
+                    # modules from old RFCs are moved away by clean_old_rfc_yang_modules()
+                    continue
+                elements += extract_elems(module_fname, elements_path, contents=contents)
+        return elements
+
     def extract_from_rfc_file(self, rfc_file: str):
-        return xym.xym(
+        xym_task = self._create_xym_task(rfc_file)
+        work_result = self._prepared_xym_results.get(xym_task)
+        if work_result:
+            xym_result = merge_xym_result(work_result, self.rfc_yang_path, xym_task.code_snippets_dir)
+        else:
+            xym_result = run_xym(xym_task)
+        if xym_result.stderr:
+            print(xym_result.stderr, end='', file=sys.stderr)
+        if rfc_file in self._extractions:
+            extraction = self._extractions[rfc_file]
+            extraction['files'].setdefault(self.rfc_yang_path, []).extend(xym_result.extracted_models)
+            extraction['skipped_modules'].setdefault(self.rfc_yang_path, []).extend(
+                get_existing_modules(xym_result.stderr),
+            )
+        return xym_result.extracted_models
+
+    def _create_xym_task(self, rfc_file: str) -> XymTask:
+        return XymTask(
             rfc_file,
             self.rfc_path,
             self.rfc_yang_path,
+            os.path.join(self.code_snippets_directory, os.path.splitext(rfc_file)[0]),
             strict=True,
             strict_examples=False,
             debug_level=self.debug_level,
-            add_line_refs=False,
-            force_revision_pyang=False,
-            force_revision_regexp=True,
-            extract_code_snippets=True,
-            code_snippets_dir=os.path.join(self.code_snippets_directory, os.path.splitext(rfc_file)[0]),
         )
 
     def invert_dict(self):
@@ -111,8 +229,7 @@ class RFCExtractor:
             :param srcdir       (str) Source dir path from where we move the YANG modules
             :param dstdir       (str) Destinationd dir path to where we move the YANG modules
         """
-        with open(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../resources/old-rfcs.json'), 'r') as f:
-            old_modules = json.load(f)
+        old_modules = load_old_rfc_modules()
 
         for old_module in old_modules:
             src_path = os.path.join(srcdir, old_module)
@@ -0,0 +1,210 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Create the downloadable tarballs of the extracted YANG modules (YANG-RFC.tgz, YANG.tgz, ...).
+A tarball is rebuilt only if the set of its members or the content of any of them changed since it was created.
+The content hashes are kept in a state file next to the extraction manifests and a file is hashed again only
+if its signature changed. The extraction manifests keep the files whose content didn't change,
+so after an incremental extraction most of the files are not read at all.
+
+The tarballs are deterministic: the members are sorted, their owner and modification time are fixed
+and the tarball is compressed in fixed-size chunks, each of them as a separate gzip member. The chunks
+can be compressed by several threads and the result is the same for any number of threads.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tarfile
+import tempfile
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from create_config import create_config
+from utility.file_helpers import get_file_signature, hash_file, write_json_atomically
+
+CHUNK_SIZE = 4 * 1024 * 1024  # The size of the uncompressed data compressed into one gzip member
+MEMBER_MODE = 0o644
+
+
+class TarballState(t.TypedDict):
+    fingerprint: str
+    files: dict[str, dict[str, str]]
+
+
+def list_members(directory: str, suffix: str = 'yang') -> list[str]:
+    """Sorted names of the files in the directory ending with the suffix, the same files as the '*yang' glob."""
+    with os.scandir(directory) as entries:
+        return sorted(
+            entry.name
+            for entry in entries
+            if entry.name.endswith(suffix) and not entry.name.startswith('.') and entry.is_file()
+        )
+
+
+def get_fingerprint(directory: str, members: list[str], files: dict[str, dict[str, str]]) -> str:
+    """
+    Hash of the names and contents of the members. The content hashes are taken from 'files' for the members
+    whose signature didn't change, 'files' is updated with the current signatures and hashes of the members.
+
+    Arguments:
+        :param directory    (str) Directory with the members
+        :param members      (list) Sorted names of the members
+        :param files        (dict) Signatures and hashes of the files from the previous run indexed by their names
+    :return: (str) SHA256 hash of the names and content hashes of all the members
+    """
+    fingerprint = hashlib.sha256()
+    previous_files = dict(files)
+    files.clear()
+    for member in members:
+        path = os.path.join(directory, member)
+        signature = get_file_signature(path)
+        previous_file = previous_files.get(member)
+        if previous_file and previous_file['signature'] == signature:
+            file_hash = previous_file['hash']
+        else:
+            file_hash = hash_file(path)
+        files[member] = {'signature': signature, 'hash': file_hash}
+        fingerprint.update(f'{member}\0{file_hash}\n'.encode())
+    return fingerprint.hexdigest()
+
+
+def write_tarball(directory: str, members: list[str], tarball_path: str, threads: int = 1):
+    """
+    Write the deterministic gzipped tarball of the members, the tarball is replaced atomically.
+
+    Arguments:
+        :param directory        (str) Directory with the members
+        :param members          (list) Sorted names of the members
+        :param tarball_path     (str) Path to the created tarball
+        :param threads          (int) Number of threads compressing the tarball
+    """
+    tarball_directory = os.path.dirname(os.path.abspath(tarball_path))
+    os.makedirs(tarball_directory, exist_ok=True)
+    with tempfile.TemporaryFile(dir=tarball_directory) as tar_file:
+        with tarfile.open(fileobj=tar_file, mode='w', format=tarfile.GNU_FORMAT) as tar:
+            for member in members:
+                with open(os.path.join(directory, member), 'rb') as f:
+                    # regular file members without owner and modification time, symbolic links are followed
+                    tar_info = tarfile.TarInfo(member)
+                    tar_info.size = os.fstat(f.fileno()).st_size
+                    tar_info.mode = MEMBER_MODE
+                    tar.addfile(tar_info, f)
+        tar_file.seek(0)
+        temporary_path = f'{tarball_path}.tmp'
+        with open(temporary_path, 'wb') as writer:
+            with ThreadPoolExecutor(max(threads, 1)) as executor:
+                while True:
+                    chunks = [tar_file.read(CHUNK_SIZE) for _ in range(max(threads, 1) * 4)]
+                    chunks = [chunk for chunk in chunks if chunk]
+                    if not chunks:
+                        break
+                    for compressed_chunk in executor.map(_compress_chunk, chunks):
+                        writer.write(compressed_chunk)
+    os.replace(temporary_path, tarball_path)
+
+
+def _compress_chunk(chunk: bytes) -> bytes:
+    # zlib releases the GIL, so the chunks are compressed in parallel
+    return gzip.compress(chunk, compresslevel=9, mtime=0)
+
+
+def update_tarball(
+    directory: str,
+    tarball_path: str,
+    state: dict[str, TarballState],
+    threads: int = 1,
+) -> bool:
+    """
+    Create the tarball of the YANG modules in the directory unless it exists with the same members.
+
+    Arguments:
+        :param directory        (str) Directory with the YANG modules
+        :param tarball_path     (str) Path to the tarball
+        :param state            (dict) Fingerprints of the tarballs and hashes of their members, updated in place
+        :param threads          (int) Number of threads compressing the tarball
+    :return: (bool) Whether the tarball was created
+    """
+    members = list_members(directory)
+    tarball_state = state.setdefault(tarball_path, {'fingerprint': '', 'files': {}})
+    fingerprint = get_fingerprint(directory, members, tarball_state['files'])
+    if fingerprint == tarball_state['fingerprint'] and os.path.isfile(tarball_path):
+        print(f'{tarball_path} is up to date with {len(members)} files')
+        return False
+    write_tarball(directory, members, tarball_path, threads)
+    tarball_state['fingerprint'] = fingerprint
+    print(f'{tarball_path} created with {len(members)} files')
+    return True
+
+
+def load_state(path: str) -> dict[str, TarballState]:
+    try:
+        with open(path) as reader:
+            return json.load(reader)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def main():
+    config = create_config()
+    cache_directory = config.get('Directory-Section', 'cache')
+    downloadables_directory = config.get('Web-Section', 'downloadables-directory')
+    state_path = os.path.join(cache_directory, 'extraction-manifests', 'tarballs.json')
+
+    parser = argparse.ArgumentParser(description='Create the tarballs of the extracted YANG modules')
+    parser.add_argument(
+        'tarballs',
+        help='Directory with the YANG modules and the name of its tarball separated by a colon, '
+        'e.g. "/var/yang/ietf/YANG:YANG.tgz"',
+        nargs='+',
+    )
+    parser.add_argument(
+        '--dstpath',
+        help=f'Directory where to create the tarballs. Default is "{downloadables_directory}"',
+        type=str,
+        default=downloadables_directory,
+    )
+    parser.add_argument(
+        '--state',
+        help=f'Path to the file with the fingerprints of the tarballs. Default is "{state_path}"',
+        type=str,
+        default=state_path,
+    )
+    parser.add_argument(
+        '--threads',
+        help='Number of threads compressing each tarball. Default is 1',
+        type=int,
+        default=1,
+    )
+    args = parser.parse_args()
+
+    state = load_state(args.state)
+    for tarball in args.tarballs:
+        directory, _, tarball_name = tarball.rpartition(':')
+        if not directory or not tarball_name:
+            parser.error(f'invalid tarball specification {tarball}')
+        update_tarball(directory, os.path.join(args.dstpath, tarball_name), state, args.threads)
+        write_json_atomically(args.state, state)
+
+
+if __name__ == '__main__':
+    main()
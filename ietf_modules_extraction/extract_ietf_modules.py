@@ -21,10 +21,13 @@ import argparse
 import datetime
 import json
 import os
+import shutil
 
 from create_config import create_config
 from extractors.draft_extractor import DraftExtractor
-from extractors.rfc_extractor import RFCExtractor
+from extractors.elements_archive import ElementsArchive
+from extractors.extraction_manifest import ExtractionManifest
+from extractors.rfc_extractor import RFCExtractor, load_old_rfc_modules
 from utility.utility import remove_directory_content
 
 file_basename = os.path.basename(__file__)
@@ -137,11 +140,61 @@ def main():
         type=str,
         default=code_snippets_directory,
     )
+    parser.add_argument(
+        '--processes',
+        help='Number of processes extracting the YANG modules from the RFCs and drafts. Default is 1',
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        '--single-pass-extraction',
+        help='Optional flag that determines whether to extract the strict, example and all YANG modules '
+        'of each draft with a single pass of xym over the draft instead of three passes. Default is False',
+        action='store_true',
+        default=False,
+    )
+    parser.add_argument(
+        '--incremental',
+        help='Optional flag that determines whether to extract only the new and changed RFCs and drafts, '
+        'the outputs of the other documents are kept as recorded in the extraction manifests. Default is False',
+        action='store_true',
+        default=False,
+    )
+    parser.add_argument(
+        '--archived-drafts-directory',
+        help='Path to the directory where to extract the archived drafts with the --archived and --incremental flags. '
+        'The subdirectories named as the draft output directories are used instead of them, so that the outputs '
+        'and the extraction manifest of the current drafts are kept. '
+        f'Default is "{ietf_directory}/archived-drafts-extraction/"',
+        type=str,
+        default=f'{ietf_directory}/archived-drafts-extraction/',
+    )
+    parser.add_argument(
+        '--packed-elements',
+        help='Optional flag that determines whether to store the typedefs, groupings and identities '
+        'in a SQLite archive next to the --rfcextractionyangpath and --draftelementspath directories '
+        '(e.g. "draft-elements.sqlite") instead of one file per element. The files can be exported '
+        'from the archive with extractors/elements_archive.py. Default is False',
+        action='store_true',
+        default=False,
+    )
     parser.add_argument('--debug', help='Debug level - default is 0', type=int, default=0)
 
     args = parser.parse_args()
     if args.archived:
         draft_path = os.path.join(ietf_directory, 'my-id-archive-mirror')
+    if args.archived and args.incremental:
+        for draft_output_path in (
+            'yangpath',
+            'allyangpath',
+            'allyangexamplepath',
+            'draftpathstrict',
+            'draftpathnostrict',
+            'draftpathonlyexample',
+            'draftelementspath',
+        ):
+            output_directory_name = os.path.basename(os.path.normpath(getattr(args, draft_output_path)))
+            setattr(args, draft_output_path, os.path.join(args.archived_drafts_directory, output_directory_name, ''))
     custom_print(f'Start of {os.path.basename(__file__)} job in {draft_path}')
     debug_level = args.debug
 
@@ -157,21 +210,57 @@ def main():
         'code_snippets_dir': args.code_snippets_directory,
     }
 
-    # Remove directories content
-    for dir in [
-        args.yangpath,
-        args.allyangpath,
-        args.rfcyangpath,
-        args.allyangexamplepath,
-        args.yangexampleoldrfcpath,
-        args.draftpathstrict,
-        args.draftpathstrict,
-        args.draftpathnostrict,
-        args.draftpathonlyexample,
-        args.rfcextractionyangpath,
-        args.draftelementspath,
-    ]:
-        remove_directory_content(dir, debug_level)
+    rfc_elements_archive = None
+    draft_elements_archive = None
+    if args.packed_elements:
+        rfc_elements_archive = ElementsArchive(f'{os.path.normpath(args.rfcextractionyangpath)}.sqlite')
+        draft_elements_archive = ElementsArchive(f'{os.path.normpath(args.draftelementspath)}.sqlite')
+
+    manifests_directory = os.path.join(cache_directory, 'extraction-manifests')
+    rfc_manifest = None
+    draft_manifest = None
+    if args.incremental:
+        rfc_manifest = ExtractionManifest(
+            os.path.join(manifests_directory, 'rfcs.json'),
+            [args.rfcyangpath],
+            elements_directory='' if args.packed_elements else args.rfcextractionyangpath,
+            code_snippets_directory=args.code_snippets_directory,
+            # moved into --yangexampleoldrfcpath by clean_old_rfc_yang_modules()
+            moved_files=load_old_rfc_modules(),
+            debug_level=debug_level,
+        )
+        draft_manifest = ExtractionManifest(
+            os.path.join(manifests_directory, 'archived-drafts.json' if args.archived else 'drafts.json'),
+            [
+                args.yangpath,
+                args.allyangpath,
+                args.allyangexamplepath,
+                args.draftpathstrict,
+                args.draftpathnostrict,
+                args.draftpathonlyexample,
+            ],
+            elements_directory='' if args.packed_elements else args.draftelementspath,
+            code_snippets_directory=args.code_snippets_directory,
+            debug_level=debug_level,
+        )
+    else:
+        # Remove directories content
+        for dir in [
+            args.yangpath,
+            args.allyangpath,
+            args.rfcyangpath,
+            args.allyangexamplepath,
+            args.yangexampleoldrfcpath,
+            args.draftpathstrict,
+            args.draftpathstrict,
+            args.draftpathnostrict,
+            args.draftpathonlyexample,
+            args.rfcextractionyangpath,
+            args.draftelementspath,
+        ]:
+            remove_directory_content(dir, debug_level)
+        # manifests don't match the content of the directories anymore
+        shutil.rmtree(manifests_directory, ignore_errors=True)
 
     # Extract YANG models from IETF RFCs files
     rfc_extractor = RFCExtractor(
@@ -180,6 +269,9 @@ def main():
         args.rfcextractionyangpath,
         args.code_snippets_directory,
         debug_level,
+        processes=args.processes,
+        manifest=rfc_manifest,
+        elements_archive=rfc_elements_archive,
     )
     rfc_extractor.extract()
     rfc_extractor.clean_old_rfc_yang_modules(args.rfcyangpath, args.yangexampleoldrfcpath)
@@ -187,13 +279,23 @@ def main():
     custom_print('All IETF RFCs pre-processed')
 
     # Extract YANG models from IETF draft files
-    draft_extractor = DraftExtractor(draft_extractor_paths, debug_level)
+    draft_extractor = DraftExtractor(
+        draft_extractor_paths,
+        debug_level,
+        processes=args.processes,
+        single_pass_extraction=args.single_pass_extraction,
+        manifest=draft_manifest,
+        elements_archive=draft_elements_archive,
+    )
     draft_extractor.extract()
     draft_extractor.dump_incorrect_drafts(
         public_directory,
         send_emails_about_problematic_drafts=send_emails_about_problematic_drafts,
     )
     custom_print('All IETF Drafts pre-processed')
+    for elements_archive in (rfc_elements_archive, draft_elements_archive):
+        if elements_archive:
+            elements_archive.close()
 
     # Dump dicts for later use by compile_modules.py
     with open(os.path.join(cache_directory, 'rfc_dict.json'), 'w') as f:
@@ -17,6 +17,7 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
 
+import argparse
 import os
 import shutil
 from typing import Set
@@ -24,6 +25,8 @@ from typing import Set
 import requests
 
 from create_config import create_config
+from modules_compilation.snapshot_directory import link_file
+from utility.module_headers import ModuleHeaderIndex
 
 ORGANIZATIONS = ['ieee', 'ietf']
 
@@ -60,11 +63,77 @@ def copy_modules(api_prefix: str, src_dir: str, dst_dir: str) -> Set[str]:
     return copied_files
 
 
+def sync_local_modules(src_dir: str, dst_dir: str, header_index: ModuleHeaderIndex) -> Set[str]:
+    """Find the ietf and ieee modules in 'src_dir' by their headers, without the YANG Catalog API,
+    and sync them to 'dst_dir' directory. The modules are hard linked where possible,
+    modules already linked are kept and the modules which are not found anymore are removed from 'dst_dir'.
+
+    Arguments:
+        :param src_dir          (str) Source path with the YANG modules named <name>@<revision>.yang
+        :param dst_dir          (str) Destination path to where we link the YANG modules
+        :param header_index     (ModuleHeaderIndex) Index of the module headers, only changed modules are scanned
+    """
+    os.makedirs(dst_dir, exist_ok=True)
+    if not os.path.isdir(src_dir):
+        yang_files = []
+    else:
+        yang_files = [filename for filename in os.listdir(src_dir) if filename.endswith('.yang')]
+    headers = {yang_file: header_index.get(os.path.join(src_dir, yang_file)) for yang_file in yang_files}
+    organizations_by_module = {
+        header.name: header.namespace_organization
+        for header in headers.values()
+        if header and header.keyword == 'module' and header.namespace_organization
+    }
+    linked_files = set()
+    for yang_file, header in headers.items():
+        if not header:
+            continue
+        # submodules belong to the organization of their module
+        module_name = header.belongs_to if header.keyword == 'submodule' else header.name
+        if organizations_by_module.get(module_name) not in ORGANIZATIONS:
+            continue
+        link_file(os.path.join(src_dir, yang_file), os.path.join(dst_dir, yang_file))
+        linked_files.add(yang_file)
+    removed_files = 0
+    for filename in os.listdir(dst_dir):
+        if filename not in linked_files and os.path.isfile(os.path.join(dst_dir, filename)):
+            os.remove(os.path.join(dst_dir, filename))
+            removed_files += 1
+    print(f'{len(linked_files)} modules synced to {dst_dir}, {removed_files} removed')
+    return linked_files
+
+
 if __name__ == '__main__':
     config = create_config()
     yangcatalog_api_prefix = config.get('Web-Section', 'yangcatalog-api-prefix')
     all_modules_dir = config.get('Directory-Section', 'save-file-dir')
     temp_dir = config.get('Directory-Section', 'temp')
+    cache_dir = config.get('Directory-Section', 'cache')
     ietf_dir = config.get('Directory-Section', 'ietf-directory')
     ietf_dependencies_dir = os.path.join(ietf_dir, 'dependencies')
-    copy_modules(yangcatalog_api_prefix, all_modules_dir, ietf_dependencies_dir)
+    header_index_path = os.path.join(cache_dir, 'all-modules-headers.json')
+
+    parser = argparse.ArgumentParser(
+        description='Gather the ietf and ieee modules into the ietf dependencies directory'
+    )
+    parser.add_argument(
+        '--local',
+        help='Optional flag that determines whether to find the modules by their headers instead of asking '
+        'the YANG Catalog API, link them instead of copying and remove the modules which are not found anymore. '
+        'Default is False',
+        action='store_true',
+        default=False,
+    )
+    parser.add_argument(
+        '--header-index',
+        help=f'Path to the index of the module headers used with the --local flag. Default is "{header_index_path}"',
+        type=str,
+        default=header_index_path,
+    )
+    args = parser.parse_args()
+    if args.local:
+        module_header_index = ModuleHeaderIndex(args.header_index)
+        sync_local_modules(all_modules_dir, ietf_dependencies_dir, module_header_index)
+        module_header_index.save()
+    else:
+        copy_modules(yangcatalog_api_prefix, all_modules_dir, ietf_dependencies_dir)
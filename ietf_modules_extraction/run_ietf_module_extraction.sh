@@ -12,6 +12,8 @@
 # License is distributed on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND,
 # either express or implied.
 
+MAX_PROCESSES=3
+
 source "$CONF"/configure.sh
 LOG=$LOGS/extract_ietf_modules.log
 date +"%c: Starting" >"$LOG"
@@ -118,9 +120,10 @@ else
 fi
 if [ "$XYM_VERSION_IS_UPDATED" = true ] && [ "$IS_PROD" = "True" ]; then
   # Using --archived  means much longer process as all expired drafts will also be analyzed...
-	python "$VIRTUAL_ENV"/ietf_modules_extraction/extract_ietf_modules.py --archived >>"$LOG" 2>&1
+  # only the outputs whose content changed with the new xym version are rewritten
+	python "$VIRTUAL_ENV"/ietf_modules_extraction/extract_ietf_modules.py --archived --incremental --processes "$MAX_PROCESSES" >>"$LOG" 2>&1
 fi
-python "$VIRTUAL_ENV"/ietf_modules_extraction/extract_ietf_modules.py >>"$LOG" 2>&1
+python "$VIRTUAL_ENV"/ietf_modules_extraction/extract_ietf_modules.py --incremental --processes "$MAX_PROCESSES" >>"$LOG" 2>&1
 date +"%c: Finished extracting all YANG modules from IETF documents" >>"$LOG"
 
 # Clean up of the .fxs files created by confdc
@@ -141,23 +144,19 @@ diff "$WEB_PRIVATE"/IETFDraftYANGPageCompilation.html "$WEB_PRIVATE"/IETFDraftYA
 diff "$WEB_PRIVATE"/IETFCiscoAuthorsYANGPageCompilation.html "$WEB_PRIVATE"/IETFCiscoAuthorsYANGPageCompilation-old.html >"$WEB_PRIVATE"/IETFCiscoAuthorsYANGPageCompilation-diff.txt || true
 date +"%c: Diff files generated" >>"$LOG"
 
-# create the tar files
-cd "$IETFDIR"/YANG-rfc
-tar cfz "$WEB_DOWNLOADABLES"/YANG-RFC.tgz *yang >>"$LOG" 2>&1
-cd "$IETFDIR"/YANG
-tar cfz "$WEB_DOWNLOADABLES"/YANG.tgz *yang >>"$LOG" 2>&1
-cd "$IETFDIR"/YANG-all
-tar cfz "$WEB_DOWNLOADABLES"/All-YANG-drafts.tgz *yang >>"$LOG" 2>&1
+# create the tar files, the tarballs whose modules didn't change are kept
+python "$VIRTUAL_ENV"/ietf_modules_extraction/create_tarballs.py --dstpath "$WEB_DOWNLOADABLES" --threads "$MAX_PROCESSES" \
+	"$IETFDIR"/YANG-rfc:YANG-RFC.tgz "$IETFDIR"/YANG:YANG.tgz "$IETFDIR"/YANG-all:All-YANG-drafts.tgz >>"$LOG" 2>&1
 date +"%c: YANG v1.0 tarball files generated" >>"$LOG"
 
 # copy the YANG 1.1 data models in $IETF_DIR/YANG-v11
 python "$VIRTUAL_ENV"/ietf_modules_extraction/yang_version_1_1.py >>"$LOG" 2>&1
 
-cd "$IETFDIR"/YANG-v11
-tar cvfz "$WEB_DOWNLOADABLES"/YANG-v11.tgz *yang >>"$LOG" 2>&1
+python "$VIRTUAL_ENV"/ietf_modules_extraction/create_tarballs.py --dstpath "$WEB_DOWNLOADABLES" --threads "$MAX_PROCESSES" \
+	"$IETFDIR"/YANG-v11:YANG-v11.tgz >>"$LOG" 2>&1
 date +"%c: YANG v1.1 tarball files generated" >>"$LOG"
 
-python "$VIRTUAL_ENV"/ietf_modules_extraction/gather_ietf_dependent_modules.py >>"$LOG" 2>&1
+python "$VIRTUAL_ENV"/ietf_modules_extraction/gather_ietf_dependent_modules.py --local >>"$LOG" 2>&1
 date +"%c: dependencies copied" >>"$LOG"
 
 date +"%c: reloading cache" >>"$LOG"
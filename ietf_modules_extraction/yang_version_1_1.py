@@ -23,18 +23,30 @@ __email__ = 'bclaise@cisco.com'
 
 import argparse
 import os
-import shutil
-import subprocess
 
 from create_config import create_config
+from modules_compilation.snapshot_directory import link_file
 from utility.utility import remove_directory_content
 
 file_basename = os.path.basename(__file__)
 
 
+def is_yang_version_1_1(yang_file_path: str) -> bool:
+    """
+    Check whether the YANG file declares 'yang-version 1.1', i.e. whether it has a line containing
+    both 'yang-version' and '1.1'. The file is scanned in-process, as bytes, without decoding it.
+
+    Arguments:
+        :param yang_file_path   (str) Path to the YANG file
+    """
+    with open(yang_file_path, 'rb') as f:
+        return any(b'1.1' in line for line in f if b'yang-version' in line)
+
+
 def find_v11_models(src_dir: str, dst_dir: str, debug: int = 0) -> list:
     """
     This method will copy all yang models of version 1.1 from directory 'src_dir' to directory 'dst_dir'.
+    The models are hard linked where possible instead of copying them, see link_file().
 
     Arguments:
         :param src_dir      (str) directory where to find the source YANG models files
@@ -49,17 +61,13 @@ def find_v11_models(src_dir: str, dst_dir: str, debug: int = 0) -> list:
 
     for yang_model in yang_model_list:
         src_file_path = os.path.join(src_dir, yang_model)
-        bash_command = 'grep yang-version {} | grep 1.1'.format(src_file_path)
-        if debug > 0:
-            print('DEBUG: grep command: {}'.format(bash_command))
-        grep_result = subprocess.run(bash_command, shell=True, capture_output=True, check=False).stdout.decode()
-        if '1.1' not in grep_result:
+        if not is_yang_version_1_1(src_file_path):
             continue
         if debug > 0:
             print('DEBUG: {} is version 1.1 '.format(yang_model))
         yang_model_list_v11.append(yang_model)
         dst_file_path = os.path.join(dst_dir, yang_model)
-        shutil.copy2(src_file_path, dst_file_path)
+        link_file(src_file_path, dst_file_path)
     if debug > 0:
         print('DEBUG: list of YANG models with version 1.1:\n{}'.format(yang_model_list_v11))
     return yang_model_list_v11
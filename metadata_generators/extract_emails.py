@@ -19,9 +19,12 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'bclaise@cisco.com'
 
 import argparse
+import hashlib
 import os
+import typing as t
 
 from create_config import create_config
+from utility.file_helpers import get_file_signature
 
 
 # ----------------------------------------------------------------------
@@ -42,9 +45,101 @@ def list_of_ietf_drafts(directory: str):
     return only_drafts
 
 
+class DraftEmailIndex:
+    """
+    Email addresses of the IETF drafts. Every draft is read once, the lines with email addresses are kept
+    and the addresses are grouped by the requested email domain, so that all the modules of a draft
+    and all the email domains are served by a single scan of the draft.
+    Drafts are memoized by their path and the hash of their content, a draft is read again only if its size
+    or modification time changes and drafts with the same content share their entry.
+    """
+
+    class _DraftEmails:
+        def __init__(self, email_lines: list[tuple[str, list[str]]]):
+            self.email_lines = email_lines
+            self.email_strings: dict[str, str] = {}
+
+    def __init__(self):
+        self._signatures: dict[str, tuple[str, str]] = {}
+        self._drafts: dict[str, DraftEmailIndex._DraftEmails] = {}
+
+    def get_email_string(self, draft_path: str, email_domain: str, debug_level: int = 0) -> str:
+        """
+        Returns a string, comma separated, of all the email addresses for the company email domain within an IETF draft.
+
+        Arguments:
+            :param draft_path       (str) Full path to the draft
+            :param email_domain     (str) Domain of search email (e.g. @cisco.com, @tail-f.com)
+            :param debug_level      (int) Debug level
+        :return: a string, comma separated, of all the unique email addresses for the company email domain
+        """
+        draft_emails = self._get_draft_emails(draft_path, debug_level)
+        if draft_emails is None:
+            return ''
+        if email_domain not in draft_emails.email_strings:
+            list_of_email_address = [
+                email for line, emails in draft_emails.email_lines if email_domain in line for email in emails
+            ]
+            draft_emails.email_strings[email_domain] = ','.join(dict.fromkeys(list_of_email_address))
+        email_string = draft_emails.email_strings[email_domain]
+        if email_string and debug_level > 0:
+            print('DEBUG: {}: {}'.format(draft_path, email_string))
+        return email_string
+
+    def _get_draft_emails(self, draft_path: str, debug_level: int) -> t.Optional[_DraftEmails]:
+        try:
+            signature = get_file_signature(draft_path)
+        except OSError:
+            return None
+        known_signature, content_hash = self._signatures.get(draft_path, (None, ''))
+        if known_signature == signature and content_hash in self._drafts:
+            return self._drafts[content_hash]
+        with open(draft_path, 'rb') as f:
+            content = f.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        self._signatures[draft_path] = (signature, content_hash)
+        if content_hash not in self._drafts:
+            if debug_level > 1:
+                print('DEBUG: indexing email addresses of {}'.format(draft_path))
+            self._drafts[content_hash] = self._DraftEmails(
+                parse_email_lines(content.decode('utf-8', errors='ignore').splitlines()),
+            )
+        return self._drafts[content_hash]
+
+
+def parse_email_lines(lines: t.Iterable[str]) -> list[tuple[str, list[str]]]:
+    """
+    Find the email addresses in the lines of an IETF draft.
+
+    Arguments:
+        :param lines    (Iterable) Lines of the draft
+    :return: list of the lines with email addresses together with the addresses found in them
+    """
+    email_lines = []
+    for line in lines:
+        if '@' not in line:
+            continue
+        line = line.strip(' \r\n')
+        list_of_email_address = []
+        if 'mailto:' in line:
+            mailto = line.split('>')[0].split('mailto:')[-1]
+            list_of_email_address.extend(e for e in mailto.split(' ') if '@' in e)
+        if any(term in line.lower() for term in ['email', 'e-mail']):
+            email_part = line.split(':')[-1]
+            email_part = email_part.split('mail')[-1]
+            list_of_email_address.extend(e for e in email_part.split(' ') if '@' in e)
+        if list_of_email_address:
+            email_lines.append((line, list_of_email_address))
+    return email_lines
+
+
+draft_email_index = DraftEmailIndex()
+
+
 def extract_email_string(draft_path: str, email_domain: str, debug_level: int = 0):
     """
     Returns a string, comma separated, of all the email addresses for the company email domain within an IETF draft.
+    The draft is scanned only once per run, see DraftEmailIndex.
 
     Arguments:
         :param draft_path       (str) Full path to the draft
@@ -52,31 +147,7 @@ def extract_email_string(draft_path: str, email_domain: str, debug_level: int =
         :param debug_level      (int) Debug level
     :return: a string, comma separated, of all the unique email addresses for the company email domain,
     """
-    list_of_email_address = []
-
-    bash_command = 'grep "{}" {}'.format(email_domain, draft_path)
-    if debug_level > 1:
-        print('DEBUG: running command {}'.format(bash_command))
-    temp_result = os.popen(bash_command).readlines()
-    for line in temp_result:
-        line = line.strip(' \r\n')
-        if debug_level > 1:
-            print('DEBUG: proccesing line: {}'.format(line))
-        if 'mailto:' in line:
-            mailto = line.split('>')[0].split('mailto:')[-1]
-            emails = [e for e in mailto.split(' ') if '@' in e]
-            list_of_email_address.extend(emails)
-        if any(term in line.lower() for term in ['email', 'e-mail']):
-            line = line.split(':')[-1]
-            line = line.split('mail')[-1]
-            emails = [e for e in line.split(' ') if '@' in e]
-            list_of_email_address.extend(emails)
-            if emails and debug_level > 0:
-                print('DEBUG: {}: {}'.format(draft_path, emails))
-    unique_list_of_email_address = list(set(list_of_email_address))
-    email_string = ','.join(unique_list_of_email_address)
-
-    return email_string
+    return draft_email_index.get_email_string(draft_path, email_domain, debug_level)
 
 
 # ----------------------------------------------------------------------
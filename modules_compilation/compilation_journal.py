@@ -0,0 +1,97 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains CompilationJournal class which checkpoints validation results of the modules
+while the compilation is running. Every validated module is appended as one JSON line to the journal file,
+the lines are written every few modules or seconds. If the compilation dies before it finishes,
+the next run loads the journal and reuses the results of the modules whose content and validator versions
+did not change instead of validating them again. The journal is removed once the compilation finishes.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import json
+import os
+import time
+import typing as t
+
+
+class CompilationJournal:
+    class Entry(t.TypedDict):
+        yang_file_path: str
+        hash: str
+        validator_versions: dict[str, str]
+        compilation_status: str
+        compilation_results: dict[str, str]
+        validation_times: dict[str, float]
+
+    def __init__(self, path: str, flush_every_modules: int = 50, flush_every_seconds: float = 60):
+        self.path = path
+        self.flush_every_modules = flush_every_modules
+        self.flush_every_seconds = flush_every_seconds
+        self._pending_entries: list[CompilationJournal.Entry] = []
+        self._last_flush = time.monotonic()
+
+    def load(self) -> dict[str, Entry]:
+        """
+        Load entries of the journal left by an unfinished compilation.
+
+        :return: (dict) The latest entry of each module indexed by the path to the module
+        """
+        entries = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as reader:
+                for line in reader:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # the last line could have been cut off when the compilation died
+                        continue
+                    entries[entry['yang_file_path']] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def append(self, entry: Entry):
+        """Add entry to the journal, pending entries are written once there are enough of them or after a while."""
+        self._pending_entries.append(entry)
+        if (
+            len(self._pending_entries) >= self.flush_every_modules
+            or time.monotonic() - self._last_flush >= self.flush_every_seconds
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write all the pending entries to the journal file."""
+        self._last_flush = time.monotonic()
+        if not self._pending_entries:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as writer:
+            writer.writelines(f'{json.dumps(entry)}\n' for entry in self._pending_entries)
+            writer.flush()
+            os.fsync(writer.fileno())
+        self._pending_entries = []
+
+    def remove(self):
+        """Remove the journal once the compilation finished successfully."""
+        self._pending_entries = []
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,235 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Run the compilation jobs of several prefixes in one process. Every job is described by one line
+of the manifest file - a JSON list of the compile_modules.py arguments, e.g.:
+["--lint", "--prefix", "BBF", "--rootdir", "/var/yang/tmp/bbf/", "--metadata", "BBF Complete Report"]
+
+All the jobs share the catalog modules data, the hashes of the modules and the validator runners,
+and the modules of all the jobs are validated by one pool of worker processes, most expensive modules first.
+Identical modules with identical dependencies (often found in several vendor platform directories)
+are validated only once and the results are copied to all the jobs they belong to.
+The compilation results are recorded and the result files are generated by the main process.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import argparse
+import copy
+import dataclasses
+import datetime
+import json
+import multiprocessing
+import os
+import re
+from configparser import ConfigParser
+
+from compile_modules import CompileModulesABC, create_argument_parser, create_compile_modules_script
+
+from create_config import create_config
+from modules_compilation.file_hasher import FileHasher
+from utility.unparsable_modules import get_unparsable_modules
+
+# Set before the worker processes are forked, the workers look the modules to validate up here
+_compile_modules_scripts: list[CompileModulesABC] = []
+_scheduled_compilation_plans: list[list[CompileModulesABC.ModuleCompilationPlan]] = []
+
+
+def _run_validators(task: tuple[int, int]) -> tuple[int, int, tuple[str, dict, dict]]:
+    script_index, plan_index = task
+    compilation_plan = _scheduled_compilation_plans[script_index][plan_index]
+    return script_index, plan_index, _compile_modules_scripts[script_index].run_validators(compilation_plan)
+
+
+class CompilationOrchestrator:
+    def __init__(
+        self,
+        jobs: list[list[str]],
+        processes: int,
+        debug_level: int = 0,
+        force_compilation: bool = False,
+        config: ConfigParser = create_config(),
+    ):
+        self.processes = processes
+        self.duplicate_tasks: dict[tuple[int, int], list[tuple[int, int]]] = {}
+        file_hasher = FileHasher(force_compilation=force_compilation, config=config)
+        self.shared_resources = CompileModulesABC.SharedResources(
+            file_hasher=file_hasher,
+            parsers=CompileModulesABC.create_parsers(debug_level, config),
+            modules={},
+        )
+        # the jobs with the --forcecompilation flag get a copy of the hasher sharing the same hashes
+        forced_file_hasher = copy.copy(file_hasher)
+        forced_file_hasher.force_compilation = True
+        forced_shared_resources = dataclasses.replace(self.shared_resources, file_hasher=forced_file_hasher)
+        argument_parser = create_argument_parser(config)
+        self.compile_modules_scripts = []
+        for job in jobs:
+            args = argument_parser.parse_args(job)
+            self.compile_modules_scripts.append(
+                create_compile_modules_script(
+                    args,
+                    config,
+                    forced_shared_resources if args.forcecompilation else self.shared_resources,
+                ),
+            )
+
+    def __call__(self):
+        if not self.compile_modules_scripts:
+            self._custom_print('No compilation jobs to run')
+            return
+        self.shared_resources.modules.update(self.compile_modules_scripts[0].get_modules())
+        self.scheduled_compilation_plans = [script.prepare_compilation() for script in self.compile_modules_scripts]
+        tasks = sorted(
+            (
+                (script_index, plan_index)
+                for script_index, compilation_plans in enumerate(self.scheduled_compilation_plans)
+                for plan_index in range(len(compilation_plans))
+            ),
+            key=lambda task: self.scheduled_compilation_plans[task[0]][task[1]].expected_validation_time,
+            reverse=True,
+        )
+        tasks = self._deduplicate_tasks(tasks)
+        duplicates_count = sum(len(duplicate_tasks) for duplicate_tasks in self.duplicate_tasks.values())
+        self._custom_print(
+            f'{len(tasks)} modules from {len(self.compile_modules_scripts)} jobs to validate '
+            f'in {self.processes} processes, {duplicates_count} duplicate modules will reuse their results',
+        )
+        _compile_modules_scripts[:] = self.compile_modules_scripts
+        _scheduled_compilation_plans[:] = self.scheduled_compilation_plans
+        try:
+            if self.processes > 1:
+                # fork, so that the workers inherit the prepared compilations instead of pickling them
+                with multiprocessing.get_context('fork').Pool(self.processes) as pool:
+                    # chunksize=1 - each idle worker takes the next most expensive module
+                    for script_index, plan_index, validation_result in pool.imap_unordered(
+                        _run_validators,
+                        tasks,
+                        chunksize=1,
+                    ):
+                        self._record_validation_result(script_index, plan_index, validation_result)
+            else:
+                for task in tasks:
+                    self._record_validation_result(*_run_validators(task))
+        finally:
+            _compile_modules_scripts.clear()
+            _scheduled_compilation_plans.clear()
+        for script in self.compile_modules_scripts:
+            script.finish_compilation()
+        self.shared_resources.file_hasher.dump_hashed_files_list()
+        for script in self.compile_modules_scripts:
+            script.journal.remove()
+        for var_path in {script.var_path for script in self.compile_modules_scripts}:
+            get_unparsable_modules(var_path).compact()
+        self._custom_print(f'end of {os.path.basename(__file__)} job')
+
+    def _deduplicate_tasks(self, tasks: list[tuple[int, int]]) -> list[tuple[int, int]]:
+        """
+        Group the tasks by the validation fingerprints of their modules, only the first task of each group
+        is kept, the others are remembered in self.duplicate_tasks to get a copy of its validation result.
+        """
+        tasks_by_fingerprint: dict[str, list[tuple[int, int]]] = {}
+        for script_index, plan_index in tasks:
+            script = self.compile_modules_scripts[script_index]
+            compilation_plan = self.scheduled_compilation_plans[script_index][plan_index]
+            fingerprint = script.get_validation_fingerprint(compilation_plan)
+            tasks_by_fingerprint.setdefault(fingerprint, []).append((script_index, plan_index))
+        self.duplicate_tasks = {
+            fingerprint_tasks[0]: fingerprint_tasks[1:] for fingerprint_tasks in tasks_by_fingerprint.values()
+        }
+        return list(self.duplicate_tasks)
+
+    def _record_validation_result(self, script_index: int, plan_index: int, validation_result: tuple[str, dict, dict]):
+        compilation_plan = self.scheduled_compilation_plans[script_index][plan_index]
+        self.compile_modules_scripts[script_index].record_validation_result(compilation_plan, *validation_result)
+        compilation_status, module_compilation_results, validation_times = validation_result
+        # some validators keep absolute paths in the output, they are rewritten to the directories of the duplicates,
+        # only whole paths are matched, so that e.g. /vendor/17.1 isn't rewritten inside /vendor/17.11 or /x/vendor/17.1
+        module_directory_pattern = re.compile(
+            rf'(?<![\w.\-/]){re.escape(os.path.dirname(compilation_plan.module_info.yang_file_path))}(?![\w.\-])',
+        )
+        for duplicate_script_index, duplicate_plan_index in self.duplicate_tasks.get((script_index, plan_index), ()):
+            duplicate_compilation_plan = self.scheduled_compilation_plans[duplicate_script_index][duplicate_plan_index]
+            duplicate_module_directory = os.path.dirname(duplicate_compilation_plan.module_info.yang_file_path)
+            duplicate_module_compilation_results = {
+                result_key: module_directory_pattern.sub(lambda _: duplicate_module_directory, result)
+                for result_key, result in module_compilation_results.items()
+            }
+            self.compile_modules_scripts[duplicate_script_index].record_validation_result(
+                duplicate_compilation_plan,
+                compilation_status,
+                duplicate_module_compilation_results,
+                dict(validation_times),
+            )
+
+    def _custom_print(self, message: str):
+        timestamp = f'{datetime.datetime.now().time()} ({os.getpid()}):'
+        print(f'{timestamp} {message}', flush=True)
+
+
+def load_manifest(path: str) -> list[list[str]]:
+    """
+    Load the compilation jobs from the manifest file.
+
+    Arguments:
+        :param path     (str) Path to the JSON Lines manifest file, each line is a list of compile_modules.py arguments
+    :return: (list) List of the arguments of each job
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    config = create_config()
+    parser = argparse.ArgumentParser(
+        description='Run the compilation jobs of several prefixes with one shared pool of validator processes',
+    )
+    parser.add_argument(
+        '--manifest',
+        help='Path to the JSON Lines file with the compilation jobs, each line is a JSON list '
+        'of the compile_modules.py arguments of one job.',
+        type=str,
+        required=True,
+    )
+    parser.add_argument(
+        '--processes',
+        help='Number of processes running the validators. Default is 3',
+        type=int,
+        default=3,
+    )
+    parser.add_argument('--debug', help='Debug level - default is 0', type=int, default=0)
+    parser.add_argument(
+        '--forcecompilation',
+        help='Optional flag that determines wheter compilation should be run for all files of all the jobs '
+        'even if they have not been changed or even if the validators versions have not been changed.',
+        action='store_true',
+        default=False,
+    )
+    args = parser.parse_args()
+    orchestrator = CompilationOrchestrator(
+        load_manifest(args.manifest),
+        args.processes,
+        debug_level=args.debug,
+        force_compilation=args.forcecompilation,
+        config=config,
+    )
+    orchestrator()
+
+
+if __name__ == '__main__':
+    main()
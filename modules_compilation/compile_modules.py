@@ -14,12 +14,18 @@
 import abc
 import argparse
 import datetime
+import graphlib
+import hashlib
 import json
+import math
 import os
 import re
+import time
 import typing as t
+from collections import defaultdict
 from configparser import ConfigParser
-from dataclasses import dataclass
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 
 import requests
 from compilation_status import combined_compilation, pyang_compilation_status
@@ -30,12 +36,16 @@ from metadata_generators.base_metadata_generator import BaseMetadataGenerator
 from metadata_generators.draft_metadata_generator import ArchivedMetadataGenerator, DraftMetadataGenerator
 from metadata_generators.example_metadata_generator import ExampleMetadataGenerator
 from metadata_generators.rfc_metadata_generator import RfcMetadataGenerator
+from modules_compilation.compilation_journal import CompilationJournal
 from modules_compilation.file_hasher import FileHasher
 from modules_compilation.files_generator import FilesGenerator
+from parsers import yang_parser
 from parsers.confdc_parser import ConfdcParser
 from parsers.pyang_parser import PyangParser
 from parsers.yangdump_pro_parser import YangdumpProParser
 from parsers.yanglint_parser import YanglintParser
+from utility.module_headers import ModuleHeader, parse_module_header
+from utility.unparsable_modules import get_unparsable_modules
 from utility.utility import (
     IETF,
     check_yangcatalog_data,
@@ -53,6 +63,16 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'bclaise@cisco.com'
 
 
+@contextmanager
+def measure_validation_time(validation_times: dict, validator: str):
+    """Store the wall time (in seconds) spent in the 'with' block under the 'validator' key."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        validation_times[validator] = round(time.perf_counter() - start, 3)
+
+
 class CompileModulesABC(abc.ABC):
     ietf: t.Optional[IETF]
     metadata_generator_cls: t.Type[BaseMetadataGenerator]
@@ -60,6 +80,13 @@ class CompileModulesABC(abc.ABC):
     root_dir: str
     documents_dict: dict
     aggregated_results: dict
+    # compilation results keys filled in by each of the validators
+    validator_results_keys = {
+        'pyang': ('pyang_lint', 'pyang'),
+        'confdc': ('confdrc',),
+        'yangdumppro': ('yumadump',),
+        'yanglint': ('yanglint',),
+    }
 
     @dataclass
     class Options:
@@ -70,6 +97,17 @@ class CompileModulesABC(abc.ABC):
         metadata: str
         save_compilation_results_to_db: bool
         config: ConfigParser = create_config()
+        dependency_order: bool = False
+        skip_failed_dependencies: bool = False
+        shared_resources: t.Optional['CompileModulesABC.SharedResources'] = None
+
+    @dataclass
+    class SharedResources:
+        """Warm state shared by the compilations of several prefixes running in one process."""
+
+        file_hasher: FileHasher
+        parsers: dict
+        modules: dict
 
     @dataclass
     class ModuleInfoForCompilation:
@@ -79,6 +117,31 @@ class CompileModulesABC(abc.ABC):
         changed_validator_versions: t.Optional[list[str]]
         yang_file_compilation_data: t.Optional[dict]
         previous_compilation_results: t.Optional[dict]
+        validation_times: dict = field(default_factory=dict)
+
+    @dataclass
+    class ModuleCompilationPlan:
+        file_name_and_revision: str
+        module_info: 'CompileModulesABC.ModuleInfoForCompilation'
+        parsers_to_use: dict = field(default_factory=dict)
+        previous_compilation_results: dict = field(default_factory=dict)
+        yang_file_compilation_data: t.Optional[dict] = None
+        failed_dependencies: list[str] = field(default_factory=list)
+        header: t.Optional[ModuleHeader] = None
+
+        @property
+        def dependencies(self) -> list[str]:
+            return self.header.dependencies if self.header else []
+
+        @property
+        def needs_validation(self) -> bool:
+            return bool(self.parsers_to_use)
+
+        @property
+        def expected_validation_time(self) -> float:
+            """Sum of the last known wall times of the validators to run, infinite if some of them are unknown."""
+            validation_times = self.module_info.validation_times
+            return sum(validation_times.get(parser_name, math.inf) for parser_name in self.parsers_to_use)
 
     class ModuleCachedCompilationResult(t.TypedDict):
         yang_file_path: t.Optional[str]  # could be missing
@@ -94,20 +157,30 @@ class CompileModulesABC(abc.ABC):
         self.temp_dir = self.config.get('Directory-Section', 'temp')
         self.ietf_directory = self.config.get('Directory-Section', 'ietf-directory')
         self.all_modules_dir = self.config.get('Directory-Section', 'save-file-dir')
+        self.var_path = self.config.get('Directory-Section', 'var')
         self.cached_compilation_results_path = os.path.join(self.web_private, f'{self.prefix}.json')
 
         self.debug_level = options.debug_level
         self.lint = options.lint
         self.allinclusive = options.allinclusive
         self.metadata = options.metadata
-        self.file_hasher = FileHasher(force_compilation=options.force_compilation, config=self.config)
+        self.dependency_order = options.dependency_order
+        self.skip_failed_dependencies = options.skip_failed_dependencies
+        self._modules_parsability: dict[str, bool] = {}
+        self._failed_dependencies: dict[int, list[str]] = {}
+        self._search_path_module_names: t.Optional[set[str]] = None
+        self._compilation_plans_by_name: t.Optional[dict[str, list[CompileModulesABC.ModuleCompilationPlan]]] = None
+        self.shared_resources = options.shared_resources
+        if self.shared_resources:
+            self.file_hasher = self.shared_resources.file_hasher
+            self.parsers = self.shared_resources.parsers
+        else:
+            self.file_hasher = FileHasher(force_compilation=options.force_compilation, config=self.config)
+            self.parsers = self.create_parsers(self.debug_level, self.config)
         self.files_generator = FilesGenerator(self.web_private)
-        self.parsers = {
-            'pyang': PyangParser(self.debug_level, config=self.config),
-            'confdc': ConfdcParser(self.debug_level),
-            'yangdumppro': YangdumpProParser(self.debug_level),
-            'yanglint': YanglintParser(self.debug_level),
-        }
+        self.journal = CompilationJournal(
+            os.path.join(self.cache_directory, 'compilation_journals', f'{self.prefix}.jsonl')
+        )
         self.validator_versions = {
             'pyang': validator_versions['pyang_version'],
             'confdc': validator_versions['confd_version'],
@@ -115,7 +188,30 @@ class CompileModulesABC(abc.ABC):
             'yanglint': validator_versions['yanglint_version'],
         }
 
+    @staticmethod
+    def create_parsers(debug_level: int, config: ConfigParser) -> dict:
+        return {
+            'pyang': PyangParser(debug_level, config=config),
+            'confdc': ConfdcParser(debug_level, config=config),
+            'yangdumppro': YangdumpProParser(debug_level),
+            'yanglint': YanglintParser(debug_level, config=config),
+        }
+
     def __call__(self):
+        for compilation_plan in self.prepare_compilation():
+            self._validate_module(compilation_plan)
+        self.finish_compilation()
+        self.file_hasher.dump_hashed_files_list()
+        self.journal.remove()
+        get_unparsable_modules(self.var_path).compact()
+        self._custom_print(f'end of {os.path.basename(__file__)} job for {self.prefix}')
+
+    def prepare_compilation(self) -> list[ModuleCompilationPlan]:
+        """
+        Find the modules in the root directory and plan their validation.
+
+        :return: (list) Plans of the modules which need to be validated, in the order they should be validated
+        """
         self._custom_print(f'Start of job in {self.root_dir}')
         self.parser_args = {'root_directory': self.root_dir, 'lint': self.lint, 'allinclusive': self.allinclusive}
         self.yang_list = list_files_by_extensions(
@@ -128,7 +224,7 @@ class CompileModulesABC(abc.ABC):
         if self.debug_level > 0:
             print(f'yang_list content:\n{self.yang_list}')
         self._custom_print(f'relevant files list built, {len(self.yang_list)} modules found in {self.root_dir}')
-        self.modules = self._get_modules()
+        self.modules = self.shared_resources.modules if self.shared_resources else self.get_modules()
         try:
             with open(self.cached_compilation_results_path, 'r') as f:
                 self.cached_compilation_results: dict[
@@ -137,19 +233,33 @@ class CompileModulesABC(abc.ABC):
                 ] = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             self.cached_compilation_results: dict[str, CompileModulesABC.ModuleCachedCompilationResult] = {}
-        self.aggregated_results = self._compile_modules()
+        self.compilation_plans = []
+        self._compilation_plans_by_name = None
+        for yang_file_path in self.yang_list:
+            file_name_and_revision = self._get_name_with_revision(yang_file_path)
+            if not file_name_and_revision:
+                continue
+            self.compilation_plans.append(self._plan_module_compilation(yang_file_path, file_name_and_revision))
+        if self.dependency_order:
+            scheduled_compilation_plans = self._schedule_by_dependencies(self.compilation_plans)
+        else:
+            scheduled_compilation_plans = self._schedule_by_validation_cost(self.compilation_plans)
+        return self._resume_from_journal(scheduled_compilation_plans)
+
+    def finish_compilation(self):
+        """Aggregate the compilation results of all the planned modules and generate the result files."""
+        self.journal.flush()
+        self.aggregated_results = self._aggregate_compilation_results()
         self._custom_print('all modules compiled/validated')
         self._generate_compilation_files()
         compilation_stats = self._generate_statistics_page()
         self._print_compilation_results_summary(compilation_stats)
-        self.file_hasher.dump_hashed_files_list()
-        self._custom_print(f'end of {os.path.basename(__file__)} job for {self.prefix}')
 
     def _custom_print(self, message: str):
         timestamp = f'{datetime.datetime.now().time()} ({os.getpid()}):'
         print(f'{timestamp} {message}', flush=True)
 
-    def _get_modules(self) -> dict:
+    def get_modules(self) -> dict:
         try:
             with open(os.path.join(self.temp_dir, 'all_modules_data.json'), 'r') as f:
                 modules_data = json.load(f)
@@ -167,58 +277,336 @@ class CompileModulesABC(abc.ABC):
                 continue
         return modules
 
-    def _compile_modules(self) -> dict:
+    def _aggregate_compilation_results(self) -> dict:
         aggregated_results = {'all': {}, 'no_submodules': {}}
-        for yang_file_path in self.yang_list:
-            file_name_and_revision = self._get_name_with_revision(yang_file_path)
-            if not file_name_and_revision:
-                continue
-            module_info_for_compilation = self._get_module_info_for_compilation(yang_file_path, file_name_and_revision)
-            yang_file_path = module_info_for_compilation.yang_file_path
-            yang_file_compilation_data = module_info_for_compilation.yang_file_compilation_data
-            if (
-                not module_info_for_compilation.previous_compilation_results
-                or module_info_for_compilation.module_hash_changed
-                or module_info_for_compilation.changed_validator_versions
-            ):
-                parsers_to_use, module_compilation_results = self._get_parsers_to_use_and_previous_compilation_results(
-                    module_info_for_compilation.previous_compilation_results,
-                    module_info_for_compilation.module_hash_changed,
-                    module_info_for_compilation.changed_validator_versions,
-                )
-                compilation_status, module_compilation_results = self._parse_module(
-                    parsers_to_use,
-                    yang_file_path,
-                    **self.parser_args,
-                    previous_compilation_results=module_compilation_results,
-                )
-                metadata_generator = self.metadata_generator_cls(
-                    module_compilation_results,
-                    compilation_status,
-                    yang_file_path,
-                    self.documents_dict,
-                )
-                confd_metadata = metadata_generator.get_confd_metadata()
-                yang_file_compilation_data = metadata_generator.get_file_compilation()
-                check_yangcatalog_data(
-                    self.config,
-                    yang_file_path,
-                    confd_metadata,
-                    module_compilation_results,
-                    self.modules,
-                    self.ietf,
-                )
-                # Revert to previous hash if compilation status is 'UNKNOWN' -> try to parse model again next time
-                if compilation_status != 'UNKNOWN':
-                    self.file_hasher.updated_hashes[yang_file_path] = {
-                        'hash': module_info_for_compilation.module_hash,
-                        'validator_versions': self.validator_versions,
-                    }
+        for compilation_plan in self.compilation_plans:
+            file_name_and_revision = compilation_plan.file_name_and_revision
+            yang_file_compilation_data = compilation_plan.yang_file_compilation_data
             aggregated_results['all'][file_name_and_revision] = yang_file_compilation_data
-            if module_or_submodule(yang_file_path) == 'module':
+            if module_or_submodule(compilation_plan.module_info.yang_file_path) == 'module':
                 aggregated_results['no_submodules'][file_name_and_revision] = yang_file_compilation_data
         return aggregated_results
 
+    def _plan_module_compilation(self, yang_file_path: str, file_name_and_revision: str) -> ModuleCompilationPlan:
+        module_info_for_compilation = self._get_module_info_for_compilation(yang_file_path, file_name_and_revision)
+        compilation_plan = self.ModuleCompilationPlan(
+            file_name_and_revision=file_name_and_revision,
+            module_info=module_info_for_compilation,
+            yang_file_compilation_data=module_info_for_compilation.yang_file_compilation_data,
+        )
+        if (
+            not module_info_for_compilation.previous_compilation_results
+            or module_info_for_compilation.module_hash_changed
+            or module_info_for_compilation.changed_validator_versions
+        ):
+            parsers_to_use, previous_compilation_results = self._get_parsers_to_use_and_previous_compilation_results(
+                module_info_for_compilation.previous_compilation_results,
+                module_info_for_compilation.module_hash_changed,
+                module_info_for_compilation.changed_validator_versions,
+            )
+            compilation_plan.parsers_to_use = parsers_to_use
+            compilation_plan.previous_compilation_results = previous_compilation_results
+        return compilation_plan
+
+    def _schedule_by_validation_cost(
+        self,
+        compilation_plans: list[ModuleCompilationPlan],
+    ) -> list[ModuleCompilationPlan]:
+        """
+        Order the modules which need to be validated longest-first, according to the validation times
+        measured during the previous runs. Modules that were never validated go first.
+        Running the most expensive modules first keeps them from forming a long tail when validating in parallel.
+        """
+        return sorted(
+            (compilation_plan for compilation_plan in compilation_plans if compilation_plan.needs_validation),
+            key=lambda compilation_plan: compilation_plan.expected_validation_time,
+            reverse=True,
+        )
+
+    def _resume_from_journal(self, compilation_plans: list[ModuleCompilationPlan]) -> list[ModuleCompilationPlan]:
+        """
+        Record the results journaled by an unfinished compilation for the modules which were validated
+        with the same content and validator versions, only the remaining modules need to be validated.
+        """
+        journal_entries = self.journal.load()
+        if not journal_entries:
+            return compilation_plans
+        remaining_compilation_plans = []
+        for compilation_plan in compilation_plans:
+            journal_entry = journal_entries.get(compilation_plan.module_info.yang_file_path)
+            if (
+                not journal_entry
+                or journal_entry['hash'] != compilation_plan.module_info.module_hash
+                or journal_entry['validator_versions'] != self.validator_versions
+            ):
+                remaining_compilation_plans.append(compilation_plan)
+                continue
+            self.record_validation_result(
+                compilation_plan,
+                journal_entry['compilation_status'],
+                journal_entry['compilation_results'],
+                journal_entry['validation_times'],
+                journal=False,
+            )
+        self._custom_print(
+            f'{len(compilation_plans) - len(remaining_compilation_plans)} modules resumed from the compilation journal',
+        )
+        return remaining_compilation_plans
+
+    def _schedule_by_dependencies(
+        self,
+        compilation_plans: list[ModuleCompilationPlan],
+    ) -> list[ModuleCompilationPlan]:
+        """
+        Order the modules which need to be validated so that each module goes after the modules it imports
+        or includes, modules without mutual dependencies are ordered longest-first.
+        Modules with missing or unparsable dependencies (also transitively) are flagged along the way.
+        Falls back to the longest-first order if there is an import cycle between the modules.
+        """
+        compilation_plans_by_name = self._index_compilation_plans_by_name()
+        plans_indexes = {id(compilation_plan): index for index, compilation_plan in enumerate(compilation_plans)}
+        dependency_graph = {
+            index: {
+                plans_indexes[id(dependency_compilation_plan)]
+                for dependency_name in compilation_plan.dependencies
+                for dependency_compilation_plan in compilation_plans_by_name.get(dependency_name, ())
+                if dependency_compilation_plan is not compilation_plan
+            }
+            for index, compilation_plan in enumerate(compilation_plans)
+        }
+        sorter = graphlib.TopologicalSorter(dependency_graph)
+        try:
+            sorter.prepare()
+        except graphlib.CycleError as e:
+            cycle = ' -> '.join(compilation_plans[index].file_name_and_revision for index in e.args[1])
+            self._custom_print(f'Import cycle found: {cycle}, modules will not be validated in dependency order')
+            return self._schedule_by_validation_cost(compilation_plans)
+        scheduled_compilation_plans = []
+        while sorter.is_active():
+            ready_indexes = sorter.get_ready()
+            for index in ready_indexes:
+                compilation_plan = compilation_plans[index]
+                if not compilation_plan.needs_validation:
+                    continue
+                compilation_plan.failed_dependencies = self._get_failed_dependencies(
+                    compilation_plan,
+                    compilation_plans_by_name,
+                )
+                if compilation_plan.failed_dependencies:
+                    self._custom_print(
+                        f'{compilation_plan.file_name_and_revision} has missing or unparsable dependencies: '
+                        f'{", ".join(compilation_plan.failed_dependencies)}',
+                    )
+            scheduled_compilation_plans.extend(
+                self._schedule_by_validation_cost([compilation_plans[index] for index in ready_indexes]),
+            )
+            sorter.done(*ready_indexes)
+        return scheduled_compilation_plans
+
+    def _index_compilation_plans_by_name(self) -> dict[str, list[ModuleCompilationPlan]]:
+        """Scan the headers of all the planned modules and index the compilation plans by the module names."""
+        if self._compilation_plans_by_name is None:
+            self._compilation_plans_by_name = defaultdict(list)
+            for compilation_plan in self.compilation_plans:
+                compilation_plan.header = parse_module_header(compilation_plan.module_info.yang_file_path)
+                if compilation_plan.header:
+                    self._compilation_plans_by_name[compilation_plan.header.name].append(compilation_plan)
+        return self._compilation_plans_by_name
+
+    def _get_failed_dependencies(
+        self,
+        compilation_plan: ModuleCompilationPlan,
+        compilation_plans_by_name: dict[str, list[ModuleCompilationPlan]],
+    ) -> list[str]:
+        """
+        Get names of the dependencies of the module which are missing or can't be parsed.
+        A dependency found among the modules being compiled is usable if at least one of its revisions
+        can be parsed and has no failed dependencies itself, other dependencies are looked up in the search path
+        of the validators. The results are memoized, so each module of the dependency chains is checked
+        at most once, only when a module which needs to be validated depends on it.
+        """
+        plan_id = id(compilation_plan)
+        if plan_id in self._failed_dependencies:
+            return self._failed_dependencies[plan_id]
+        # placeholder in case of an import cycle, the modules of the cycle don't fail each other
+        self._failed_dependencies[plan_id] = []
+        failed_dependencies = []
+        for dependency_name in compilation_plan.dependencies:
+            if dependency_compilation_plans := compilation_plans_by_name.get(dependency_name):
+                if not any(
+                    not self._get_failed_dependencies(dependency_compilation_plan, compilation_plans_by_name)
+                    and self._is_parsable(dependency_compilation_plan.module_info.yang_file_path)
+                    for dependency_compilation_plan in dependency_compilation_plans
+                ):
+                    failed_dependencies.append(dependency_name)
+            elif dependency_name not in self._get_search_path_module_names():
+                failed_dependencies.append(dependency_name)
+        self._failed_dependencies[plan_id] = failed_dependencies
+        return failed_dependencies
+
+    def get_validation_fingerprint(self, compilation_plan: ModuleCompilationPlan) -> str:
+        """
+        Create a fingerprint of everything the validation of the module depends on: the content of the module
+        and of all the modules it (transitively) imports or includes from the root directory, the names
+        of the dependencies looked up elsewhere, the validators to run and their options.
+        Validation of modules with the same fingerprint gives the same results.
+
+        Arguments:
+            :param compilation_plan     (ModuleCompilationPlan) Compilation plan of the module to be validated
+        :return: (str) SHA256 hash of the fingerprint
+        """
+        compilation_plans_by_name = self._index_compilation_plans_by_name()
+        root_directory_modules = set()
+        search_path_modules = set()
+        visited_compilation_plans = set()
+        compilation_plans_to_visit = [compilation_plan]
+        while compilation_plans_to_visit:
+            visited_compilation_plan = compilation_plans_to_visit.pop()
+            if id(visited_compilation_plan) in visited_compilation_plans:
+                continue
+            visited_compilation_plans.add(id(visited_compilation_plan))
+            module_info = visited_compilation_plan.module_info
+            root_directory_modules.add(
+                (os.path.relpath(module_info.yang_file_path, self.root_dir), module_info.module_hash),
+            )
+            for dependency_name in visited_compilation_plan.dependencies:
+                if dependency_compilation_plans := compilation_plans_by_name.get(dependency_name):
+                    compilation_plans_to_visit.extend(dependency_compilation_plans)
+                else:
+                    search_path_modules.add(dependency_name)
+        skips_validation = self._skips_validation(compilation_plan)
+        fingerprint = {
+            'validator': type(self)._parse_module.__qualname__,
+            'lint': self.lint,
+            'allinclusive': self.allinclusive,
+            'parsers': sorted(compilation_plan.parsers_to_use),
+            'previous_compilation_results': compilation_plan.previous_compilation_results,
+            'skipped_dependencies': compilation_plan.failed_dependencies if skips_validation else [],
+            'root_directory_modules': sorted(root_directory_modules),
+            'search_path_modules': sorted(search_path_modules),
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _is_parsable(self, yang_file_path: str) -> bool:
+        if yang_file_path not in self._modules_parsability:
+            try:
+                yang_parser.parse(yang_file_path)
+                self._modules_parsability[yang_file_path] = True
+            except (yang_parser.ParseException, UnicodeDecodeError):
+                self._modules_parsability[yang_file_path] = False
+        return self._modules_parsability[yang_file_path]
+
+    def _get_search_path_module_names(self) -> set[str]:
+        """
+        Names of the modules which the validators can find outside of the root directory.
+        With the allinclusive option the validators only look in the root directory.
+        """
+        if self._search_path_module_names is None:
+            self._search_path_module_names = set()
+            if not self.allinclusive:
+                for path in list_files_by_extensions(
+                    self.modules_directory,
+                    ('yang',),
+                    recursive=True,
+                    follow_links=True,
+                ):
+                    self._search_path_module_names.add(path.split('@')[0].removesuffix('.yang'))
+        return self._search_path_module_names
+
+    def _validate_module(self, compilation_plan: ModuleCompilationPlan):
+        self.record_validation_result(compilation_plan, *self.run_validators(compilation_plan))
+
+    def _skips_validation(self, compilation_plan: ModuleCompilationPlan) -> bool:
+        return bool(compilation_plan.failed_dependencies) and self.skip_failed_dependencies
+
+    def run_validators(self, compilation_plan: ModuleCompilationPlan) -> tuple[str, dict, dict]:
+        """
+        Run the validators planned for the module. Only runs the external validators, so that it can be called
+        from a worker process while the results are recorded by the main process.
+
+        :return: (tuple) Compilation status, compilation results and wall times of the validators
+        """
+        parsers_to_use = compilation_plan.parsers_to_use
+        previous_compilation_results = compilation_plan.previous_compilation_results
+        if self._skips_validation(compilation_plan):
+            # only pyang is run to report the problem with the dependencies, results of the others are marked as skipped
+            failed_dependencies = ', '.join(compilation_plan.failed_dependencies)
+            skipped_validation_message = (
+                f'Validation skipped, missing or unparsable dependencies: {failed_dependencies}'
+            )
+            previous_compilation_results = previous_compilation_results | {
+                result_key: skipped_validation_message
+                for parser_name, results_keys in self.validator_results_keys.items()
+                if parser_name != 'pyang'
+                for result_key in results_keys
+            }
+            parsers_to_use = {'pyang': self.parsers['pyang']}
+        validation_times = {}
+        compilation_status, module_compilation_results = self._parse_module(
+            parsers_to_use,
+            compilation_plan.module_info.yang_file_path,
+            **self.parser_args,
+            previous_compilation_results=previous_compilation_results,
+            validation_times=validation_times,
+        )
+        return compilation_status, module_compilation_results, validation_times
+
+    def record_validation_result(
+        self,
+        compilation_plan: ModuleCompilationPlan,
+        compilation_status: str,
+        module_compilation_results: dict,
+        validation_times: dict,
+        journal: bool = True,
+    ):
+        """
+        Generate the compilation metadata of the validated module, store them and update the module hash.
+        The result is also checkpointed in the compilation journal, unless it was itself loaded from the journal.
+        """
+        module_info_for_compilation = compilation_plan.module_info
+        yang_file_path = module_info_for_compilation.yang_file_path
+        if journal:
+            self.journal.append(
+                {
+                    'yang_file_path': yang_file_path,
+                    'hash': module_info_for_compilation.module_hash,
+                    'validator_versions': self.validator_versions,
+                    'compilation_status': compilation_status,
+                    'compilation_results': module_compilation_results,
+                    'validation_times': validation_times,
+                },
+            )
+        metadata_generator = self.metadata_generator_cls(
+            module_compilation_results,
+            compilation_status,
+            yang_file_path,
+            self.documents_dict,
+        )
+        confd_metadata = metadata_generator.get_confd_metadata()
+        compilation_plan.yang_file_compilation_data = metadata_generator.get_file_compilation()
+        check_yangcatalog_data(
+            self.config,
+            yang_file_path,
+            confd_metadata,
+            module_compilation_results,
+            self.modules,
+            self.ietf,
+        )
+        if self._skips_validation(compilation_plan):
+            # Invalidate the hash -> run all the validators next time, the dependencies may be fixed by then
+            self.file_hasher.updated_hashes[yang_file_path] = {
+                'hash': None,
+                'validator_versions': {},
+                'validation_times': module_info_for_compilation.validation_times | validation_times,
+            }
+        # Revert to previous hash if compilation status is 'UNKNOWN' -> try to parse model again next time
+        elif compilation_status != 'UNKNOWN':
+            self.file_hasher.updated_hashes[yang_file_path] = {
+                'hash': module_info_for_compilation.module_hash,
+                'validator_versions': self.validator_versions,
+                'validation_times': module_info_for_compilation.validation_times | validation_times,
+            }
+
     def _get_module_info_for_compilation(
         self,
         yang_file_path: str,
@@ -248,6 +636,7 @@ class CompileModulesABC(abc.ABC):
                     changed_validator_versions=None,
                     yang_file_compilation_data=None,
                     previous_compilation_results=None,
+                    validation_times=all_modules_dir_yang_file_hash_info.validation_times,
                 )
         return self.ModuleInfoForCompilation(
             yang_file_path=yang_file_path,
@@ -260,6 +649,7 @@ class CompileModulesABC(abc.ABC):
                 if yang_file_compilation_data and isinstance(yang_file_compilation_data, dict)
                 else None
             ),
+            validation_times=module_hash_info.validation_times,
         )
 
     def _get_name_with_revision(self, yang_file: str) -> str:
@@ -341,37 +731,43 @@ class CompileModulesABC(abc.ABC):
         lint: bool,
         allinclusive: bool,
         previous_compilation_results: t.Optional[dict] = None,
+        validation_times: t.Optional[dict] = None,
     ) -> tuple[str, dict]:
         module_compilation_results = previous_compilation_results or {}
+        validation_times = {} if validation_times is None else validation_times
         if pyang_parser := parsers.get('pyang'):
-            module_compilation_results['pyang_lint'] = pyang_parser.run_pyang(
-                root_directory,
-                yang_file,
-                lint,
-                allinclusive,
-                True,
-            )
-            module_compilation_results['pyang'] = pyang_parser.run_pyang(
-                root_directory,
-                yang_file,
-                lint,
-                allinclusive,
-                False,
-            )
+            with measure_validation_time(validation_times, 'pyang'):
+                module_compilation_results['pyang_lint'] = pyang_parser.run_pyang(
+                    root_directory,
+                    yang_file,
+                    lint,
+                    allinclusive,
+                    True,
+                )
+                module_compilation_results['pyang'] = pyang_parser.run_pyang(
+                    root_directory,
+                    yang_file,
+                    lint,
+                    allinclusive,
+                    False,
+                )
         if confd_parser := parsers.get('confdc'):
-            module_compilation_results['confdrc'] = confd_parser.run_confdc(yang_file, root_directory, allinclusive)
+            with measure_validation_time(validation_times, 'confdc'):
+                module_compilation_results['confdrc'] = confd_parser.run_confdc(yang_file, root_directory, allinclusive)
         if yuma_parser := parsers.get('yangdumppro'):
-            module_compilation_results['yumadump'] = yuma_parser.run_yumadumppro(
-                yang_file,
-                root_directory,
-                allinclusive,
-            )
+            with measure_validation_time(validation_times, 'yangdumppro'):
+                module_compilation_results['yumadump'] = yuma_parser.run_yumadumppro(
+                    yang_file,
+                    root_directory,
+                    allinclusive,
+                )
         if yanglint_parser := parsers.get('yanglint'):
-            module_compilation_results['yanglint'] = yanglint_parser.run_yanglint(
-                yang_file,
-                root_directory,
-                allinclusive,
-            )
+            with measure_validation_time(validation_times, 'yanglint'):
+                module_compilation_results['yanglint'] = yanglint_parser.run_yanglint(
+                    yang_file,
+                    root_directory,
+                    allinclusive,
+                )
         compilation_status = combined_compilation(os.path.basename(yang_file), module_compilation_results)
         return compilation_status, module_compilation_results
 
@@ -570,6 +966,7 @@ class CompileExampleModules(CompileModulesABC):
     ietf = IETF.EXAMPLE
     metadata_generator_cls = ExampleMetadataGenerator
     prefix = 'IETFDraftExample'
+    validator_results_keys = {'pyang': ('pyang_lint', 'pyang')}
 
     def __init__(self, options: CompileModulesABC.Options):
         super().__init__(options)
@@ -585,23 +982,26 @@ class CompileExampleModules(CompileModulesABC):
         lint: bool,
         allinclusive: bool,
         previous_compilation_results: t.Optional[dict] = None,
+        validation_times: t.Optional[dict] = None,
     ) -> tuple[str, dict]:
         module_compilation_results = previous_compilation_results or {}
+        validation_times = {} if validation_times is None else validation_times
         if pyang_parser := parsers.get('pyang'):
-            module_compilation_results['pyang_lint'] = pyang_parser.run_pyang(
-                root_directory,
-                yang_file,
-                lint,
-                allinclusive,
-                True,
-            )
-            module_compilation_results['pyang'] = pyang_parser.run_pyang(
-                root_directory,
-                yang_file,
-                lint,
-                allinclusive,
-                False,
-            )
+            with measure_validation_time(validation_times, 'pyang'):
+                module_compilation_results['pyang_lint'] = pyang_parser.run_pyang(
+                    root_directory,
+                    yang_file,
+                    lint,
+                    allinclusive,
+                    True,
+                )
+                module_compilation_results['pyang'] = pyang_parser.run_pyang(
+                    root_directory,
+                    yang_file,
+                    lint,
+                    allinclusive,
+                    False,
+                )
         compilation_status = pyang_compilation_status(module_compilation_results['pyang_lint'])
         return compilation_status, module_compilation_results
 
@@ -628,8 +1028,7 @@ class CompileExampleModules(CompileModulesABC):
         )
 
 
-def main():
-    config = create_config()
+def create_argument_parser(config: ConfigParser) -> argparse.ArgumentParser:
     modules_directory = config.get('Directory-Section', 'modules-directory')
     parser = argparse.ArgumentParser(
         description='YANG Document Processor: generate tables with compilation errors/warnings',
@@ -699,7 +1098,31 @@ def main():
         ' only compile examples with pyang.',
         action='store_true',
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        '--dependency-order',
+        help='Optional flag that determines whether modules should be validated after the modules they depend on; '
+        'modules with missing or unparsable dependencies are reported. '
+        'Otherwise, the most expensive modules are validated first. '
+        'Default is False',
+        action='store_true',
+        default=False,
+    )
+    parser.add_argument(
+        '--skip-failed-dependencies',
+        help='Optional flag that determines whether to run only pyang on modules with missing or unparsable '
+        'dependencies, the results of the other validators are marked as skipped. '
+        'Used only together with --dependency-order. Default is False',
+        action='store_true',
+        default=False,
+    )
+    return parser
+
+
+def create_compile_modules_script(
+    args: argparse.Namespace,
+    config: ConfigParser,
+    shared_resources: t.Optional[CompileModulesABC.SharedResources] = None,
+) -> CompileModulesABC:
     options = CompileModulesABC.Options(
         debug_level=args.debug,
         force_compilation=args.forcecompilation,
@@ -708,17 +1131,25 @@ def main():
         metadata=args.metadata,
         save_compilation_results_to_db=False,
         config=config,
+        dependency_order=args.dependency_order,
+        skip_failed_dependencies=args.skip_failed_dependencies,
+        shared_resources=shared_resources,
     )
     if args.rfc:
-        compile_modules_script = CompileRfcModules(options)
+        return CompileRfcModules(options)
     elif args.draft:
-        compile_modules_script = CompileDraftModules(options)
+        return CompileDraftModules(options)
     elif args.draft_archive:
-        compile_modules_script = CompileDraftArchiveModules(options)
+        return CompileDraftArchiveModules(options)
     elif args.example:
-        compile_modules_script = CompileExampleModules(options)
-    else:
-        compile_modules_script = CompileBaseModules(args.prefix, args.rootdir, options)
+        return CompileExampleModules(options)
+    return CompileBaseModules(args.prefix, args.rootdir, options)
+
+
+def main():
+    config = create_config()
+    args = create_argument_parser(config).parse_args()
+    compile_modules_script = create_compile_modules_script(args, config)
     compile_modules_script()
 
 
@@ -19,6 +19,10 @@ of the file, and also versions of the validators which were used
 for validation. Every time either content of the file or a version
 of one of the validators used is changed - hash will be completely different.
 Different hash means that the file needs to be re-validated.
+Wall times of the individual validators are stored together with the hash,
+so that the next run can validate the most expensive modules first.
+The signature of the file (inode, size and modification time) is stored as well, a file with an unchanged
+signature (e.g. hard linked into a new snapshot of the modules) is not read and hashed again.
 """
 
 __author__ = 'Slavomir Mazur'
@@ -26,17 +30,15 @@ __copyright__ = 'Copyright The IETF Trust 2021, All Rights Reserved'
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'slavomir.mazur@pantheon.tech'
 
-import hashlib
 import json
 import os.path
 from configparser import ConfigParser
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import filelock
 
 from create_config import create_config
-
-BLOCK_SIZE = 65536  # The size of each read from the file
+from utility.file_helpers import get_file_signature, hash_file
 
 
 class FileHasher:
@@ -45,23 +47,7 @@ class FileHasher:
         self.force_compilation = force_compilation
         self.files_hashes = self._load_hashed_files_list(dst_dir)
         self.updated_hashes = {}
-
-    def hash_file(self, path: str) -> str:
-        """
-        Create hash from content of the given file. Each time the content of the file change,
-        the resulting hash will be different.
-
-        Arguments:
-            :param path (str) Path fo file to be hashed
-        :return (str) SHA256 hash of the content of the given file
-        """
-        file_hash = hashlib.sha256()
-        with open(path, 'rb') as reader:
-            file_block = reader.read(BLOCK_SIZE)
-            while len(file_block) > 0:
-                file_hash.update(file_block)
-                file_block = reader.read(BLOCK_SIZE)
-        return file_hash.hexdigest()
+        self.files_signatures: dict[str, tuple[str, str]] = {}
 
     def _load_hashed_files_list(self, dst_dir: str = '') -> dict:
         """
@@ -88,7 +74,7 @@ class FileHasher:
         Several threads can access this file at once, so locking the file
         while accessing is necessary.
         """
-        if not self.updated_hashes:
+        if not self.updated_hashes and not self._has_new_signatures():
             return
 
         dst_dir = self.cache_dir if dst_dir == '' else dst_dir
@@ -103,16 +89,32 @@ class FileHasher:
                 hash_cache = {}
 
             hash_cache.update(self.updated_hashes)
+            for path, (signature, file_hash) in self.files_signatures.items():
+                file_hash_info = hash_cache.get(path)
+                if isinstance(file_hash_info, dict) and file_hash_info.get('hash') == file_hash:
+                    file_hash_info['signature'] = signature
 
             with open(os.path.join(dst_dir, 'sdo_files_modification_hashes.json'), 'w') as writer:
                 json.dump(hash_cache, writer, indent=2, sort_keys=True)
             print(f'Dictionary of {len(hash_cache)} hashes successfully dumped into .json file')
 
+    def _has_new_signatures(self) -> bool:
+        for path, (signature, file_hash) in self.files_signatures.items():
+            file_hash_info = self.files_hashes.get(path)
+            if (
+                isinstance(file_hash_info, dict)
+                and file_hash_info.get('hash') == file_hash
+                and file_hash_info.get('signature') != signature
+            ):
+                return True
+        return False
+
     @dataclass
     class ModuleHashCheckForParsing:
         hash_changed: bool
         hash: str
         validator_versions: dict
+        validation_times: dict = field(default_factory=dict)
 
         def get_changed_validator_versions(self, validators_to_check: dict) -> list[str]:
             changed_validators = []
@@ -130,12 +132,22 @@ class FileHasher:
         Argument:
             :param path     (str) Full path to the file to be hashed
         """
-        file_hash = self.hash_file(path)
         old_file_hash_info = self.files_hashes.get(path)
+        signature = get_file_signature(path)
+        if (
+            isinstance(old_file_hash_info, dict)
+            and old_file_hash_info.get('hash')
+            and old_file_hash_info.get('signature') == signature
+        ):
+            file_hash = old_file_hash_info['hash']
+        else:
+            file_hash = hash_file(path)
+        self.files_signatures[path] = (signature, file_hash)
         if not old_file_hash_info or not isinstance(old_file_hash_info, dict):
             return self.ModuleHashCheckForParsing(hash_changed=True, hash=file_hash, validator_versions={})
         return self.ModuleHashCheckForParsing(
             hash_changed=self.force_compilation or old_file_hash_info['hash'] != file_hash,
             hash=file_hash,
             validator_versions=old_file_hash_info['validator_versions'],
+            validation_times=old_file_hash_info.get('validation_times', {}),
         )
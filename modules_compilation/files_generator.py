@@ -21,10 +21,11 @@ import datetime
 import json
 import os
 import time
+import typing as t
 
 import HTML
 
-from utility.utility import dict_to_list, list_br_html_addition
+from utility.utility import dict_to_list
 from versions import validator_versions
 
 
@@ -59,27 +60,53 @@ class FilesGenerator:
     ):
         """
         Create YANGPageCompilation HTML table out of the modules compilation messages and generate an HTML file.
+        The table is written row by row in the sorted order of the modules, without building it in memory first.
 
         Arguments:
-            :param modules_results  (list) List of the values to generate the HTML table
+            :param dictionary_data  (dict) Dictionary of modules with compilation results
             :param headers          (list) Headers list to generate the HTML table
+            :param file_name        (str) Prefix of the YANGPageCompilation html file name to be created
             :param metadata         (str) Extra metadata text to be inserted in the generated message
         :return: None
         """
-        modules_results = list_br_html_addition(sorted(dict_to_list(dictionary_data)))
         generated_message = f'Generated on {time.strftime("%d/%m/%Y")} by the YANG Catalog. {metadata}'
         message_html = HTML.list([generated_message])
-        table_html = HTML.table(modules_results, header_row=headers)
         file_name += 'YANGPageCompilation.html'
         html_filename = os.path.join(self._htmlpath, file_name)
 
         with open(html_filename, 'w', encoding='utf-8') as f:
             f.write(message_html)
-            f.write(table_html)
+            self._write_html_table(f, self._iterate_compilation_rows(dictionary_data), headers)
 
         os.chmod(html_filename, 0o664)
         self._custom_print(f'{file_name} HTML page generated in directory {self._htmlpath}')
 
+    @staticmethod
+    def _iterate_compilation_rows(dictionary_data: dict) -> t.Iterator[list[str]]:
+        """
+        Rows of the YANGPageCompilation table in the sorted order of the modules, the same rows as
+        list_br_html_addition(sorted(dict_to_list(dictionary_data))) creates, one at a time.
+        """
+        for module in sorted(dictionary_data):
+            value = dictionary_data[module]
+            if value is None:
+                continue
+            yield [
+                cell.replace('\n', '<br>')
+                for cell in (module, *value['compilation_metadata'], *value['compilation_results'].values())
+                if isinstance(cell, str)
+            ]
+
+    @staticmethod
+    def _write_html_table(f: t.TextIO, rows: t.Iterable[list[str]], headers: list):
+        """Write the same HTML code as HTML.table(rows, header_row=headers) creates, one row at a time."""
+        table_end = '</TABLE>'
+        # the opening tag and the header row
+        f.write(HTML.table([], header_row=headers).removesuffix(table_end))
+        for row in rows:
+            f.write(str(HTML.TableRow(row)))
+        f.write(table_end)
+
     def generate_yang_page_main_html(self, file_name: str, stats: dict):
         """
         Create YANGPageMain HTML with compilation results statistics and generate a HTML file.
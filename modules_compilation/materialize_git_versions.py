@@ -0,0 +1,227 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Materialize the YANG modules of every version branch of a git repository (e.g. OpenROADM_MSA_Public)
+into a flat directory per version without checking the branches out. The trees of the branches are listed
+by 'git ls-tree' and the blobs are read by one 'git cat-file --batch' process into a blob store
+where every blob is stored once, named by its blob id. The version directories only contain hard links
+to the blob store, so a module which did not change between versions is stored once and keeps the same
+inode and modification time in all of them and across the runs - FileHasher then reuses its hash
+and the compilation reuses its previous results without reading the module again.
+The blob store has to be on the same filesystem as the version directories, otherwise the files
+can't be hard linked and are copied instead, a warning is printed in that case.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import argparse
+import os
+import subprocess
+import threading
+import typing as t
+
+from create_config import create_config
+from modules_compilation.snapshot_directory import link_file
+
+GIT_BLOB_MODES = ('100644', '100755')  # regular files, symbolic links and submodules are skipped
+TEMPORARY_SUFFIX = '.tmp'
+
+
+class GitVersionsMaterializer:
+    def __init__(self, repo_dir: str, blobs_dir: str, extension: str = '.yang'):
+        """
+        Arguments:
+            :param repo_dir     (str) Path to the git repository
+            :param blobs_dir    (str) Directory where the blobs are stored, it should be kept between the runs
+            :param extension    (str) Only the files with this extension are materialized
+        """
+        self.repo_dir = repo_dir
+        self.blobs_dir = blobs_dir
+        self.extension = extension
+
+    def list_versions(self) -> dict[str, str]:
+        """
+        List remote branches of the repository representing the versions - their names start with a digit.
+
+        :return: (dict) Full names of the branch refs indexed by the version
+        """
+        output = self._git('for-each-ref', '--format=%(refname)', 'refs/remotes')
+        versions = {}
+        for ref in sorted(output.decode().splitlines()):
+            version = ref.rsplit('/', 1)[-1]
+            if version[:1].isdigit():
+                versions.setdefault(version, ref)
+        return versions
+
+    def list_blobs(self, ref: str) -> dict[str, str]:
+        """
+        List the files with the extension in the tree of the ref, the directory structure is flattened.
+
+        Arguments:
+            :param ref  (str) Ref (branch, tag, commit) whose tree to list
+        :return: (dict) Blob ids indexed by the file names, of files with the same name
+            the one with the last path in sorted order is taken
+        """
+        blobs = {}
+        entries = self._git('ls-tree', '-r', '-z', '--full-tree', ref).split(b'\0')
+        for entry in sorted(entry for entry in entries if entry):
+            info, path = entry.decode().split('\t', 1)
+            mode, object_type, blob_id = info.split()
+            if object_type != 'blob' or mode not in GIT_BLOB_MODES or not path.endswith(self.extension):
+                continue
+            blobs[os.path.basename(path)] = blob_id
+        return blobs
+
+    def store_blobs(self, blob_ids: t.Iterable[str]) -> int:
+        """
+        Write the blobs missing in the blob store, all of them are read by a single 'git cat-file --batch' process.
+
+        Arguments:
+            :param blob_ids     (Iterable) Ids of the blobs which have to be in the blob store
+        :return: (int) Number of newly stored blobs
+        """
+        os.makedirs(self.blobs_dir, exist_ok=True)
+        self._remove_temporary_blobs()
+        missing_blob_ids = sorted(
+            blob_id for blob_id in set(blob_ids) if not os.path.isfile(self._get_blob_path(blob_id))
+        )
+        if not missing_blob_ids:
+            return 0
+        process = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            cwd=self.repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        assert process.stdin and process.stdout
+        # the ids are written by another thread, git stops reading them while its output is not being read
+        writer_thread = threading.Thread(
+            target=self._write_blob_ids,
+            args=(process.stdin, missing_blob_ids),
+            daemon=True,
+        )
+        writer_thread.start()
+        try:
+            for blob_id in missing_blob_ids:
+                header = process.stdout.readline().decode().split()
+                if len(header) != 3 or header[1] != 'blob':
+                    raise RuntimeError(f'Unexpected output of git cat-file for {blob_id}: {" ".join(header)}')
+                content = process.stdout.read(int(header[2]))
+                process.stdout.read(1)  # newline following the content
+                blob_path = self._get_blob_path(blob_id)
+                with open(f'{blob_path}{TEMPORARY_SUFFIX}', 'wb') as writer:
+                    writer.write(content)
+                os.replace(f'{blob_path}{TEMPORARY_SUFFIX}', blob_path)
+        except BaseException:
+            # the writer thread could be blocked on the full stdin pipe, it fails once git is killed
+            process.kill()
+            raise
+        finally:
+            writer_thread.join()
+            process.stdout.close()
+            process.wait()
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+        return len(missing_blob_ids)
+
+    def materialize(self, dst_dir: str) -> dict[str, int]:
+        """
+        Materialize the files of all the versions, each version into its own subdirectory of 'dst_dir'.
+        Files left in the version directories from the previous runs which are not in the version anymore
+        are removed, as well as the blobs not used by any of the versions.
+
+        Arguments:
+            :param dst_dir  (str) Directory where to create the directories of the versions
+        :return: (dict) Number of files of each version
+        """
+        blobs_by_version = {version: self.list_blobs(ref) for version, ref in self.list_versions().items()}
+        used_blob_ids = {blob_id for blobs in blobs_by_version.values() for blob_id in blobs.values()}
+        self.store_blobs(used_blob_ids)
+        os.makedirs(dst_dir, exist_ok=True)
+        if os.stat(dst_dir).st_dev != os.stat(self.blobs_dir).st_dev:
+            print(
+                f'WARNING: {self.blobs_dir} and {dst_dir} are on different filesystems, '
+                'the files are copied instead of hard linked',
+                flush=True,
+            )
+        for version, blobs in blobs_by_version.items():
+            version_dir = os.path.join(dst_dir, version)
+            os.makedirs(version_dir, exist_ok=True)
+            for filename in os.listdir(version_dir):
+                if filename not in blobs:
+                    os.remove(os.path.join(version_dir, filename))
+            for filename, blob_id in blobs.items():
+                link_file(self._get_blob_path(blob_id), os.path.join(version_dir, filename))
+        for blob_filename in os.listdir(self.blobs_dir):
+            if blob_filename.removesuffix(self.extension) not in used_blob_ids:
+                os.remove(os.path.join(self.blobs_dir, blob_filename))
+        return {version: len(blobs) for version, blobs in blobs_by_version.items()}
+
+    def _write_blob_ids(self, stdin: t.IO[bytes], blob_ids: list[str]):
+        try:
+            with stdin:
+                for blob_id in blob_ids:
+                    stdin.write(f'{blob_id}\n'.encode())
+        except BrokenPipeError:
+            # git was killed after an error while reading its output
+            pass
+
+    def _remove_temporary_blobs(self):
+        """Remove the blobs left half-written by an interrupted run."""
+        for blob_filename in os.listdir(self.blobs_dir):
+            if blob_filename.endswith(TEMPORARY_SUFFIX):
+                os.remove(os.path.join(self.blobs_dir, blob_filename))
+
+    def _get_blob_path(self, blob_id: str) -> str:
+        return os.path.join(self.blobs_dir, f'{blob_id}{self.extension}')
+
+    def _git(self, *args: str) -> bytes:
+        return subprocess.check_output(['git', *args], cwd=self.repo_dir)
+
+
+def main():
+    config = create_config()
+    parser = argparse.ArgumentParser(
+        description='Materialize the YANG modules of every version branch of a git repository '
+        'into a flat directory per version without checking the branches out',
+    )
+    parser.add_argument('--repo', help='Path to the git repository', type=str, required=True)
+    parser.add_argument(
+        '--dst',
+        help='Directory where to create the directory of each version',
+        type=str,
+        required=True,
+    )
+    parser.add_argument(
+        '--blobs-dir',
+        help='Directory of the blob store which should be kept between the runs, it should be on the same '
+        'filesystem as --dst, otherwise the files are copied instead of hard linked. '
+        'Default is git_blobs/<name of the repository> in the cache directory',
+        type=str,
+        default='',
+    )
+    args = parser.parse_args()
+    repo_name = os.path.basename(os.path.normpath(args.repo))
+    blobs_dir = args.blobs_dir or os.path.join(config.get('Directory-Section', 'cache'), 'git_blobs', repo_name)
+    materializer = GitVersionsMaterializer(args.repo, blobs_dir)
+    for version, files_count in materializer.materialize(args.dst).items():
+        print(f'{files_count} files of version {version} materialized in {os.path.join(args.dst, version)}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
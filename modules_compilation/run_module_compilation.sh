@@ -16,45 +16,60 @@
 
 MAX_PROCESSES=3
 
-# make sure the compilation isn't disturbed by updates
 STATIC_COPIES="$TMP/module_compilation"
-rsync --links --recursive --include="*.yang" "$NONIETFDIR"/* "$STATIC_COPIES"
 
 cleanup() {
    rm -rf $STATIC_COPIES >>$LOG 2>&1
    rm -rf $TMP/bbf/ >>$LOG 2>&1
    rm -rf $TMP/openroadm-public/ >>$LOG 2>&1
+   rm -f "$MANIFEST" "$DRAFT_ARCHIVE_MANIFEST" >>$LOG 2>&1
 }
 
 trap cleanup EXIT ERR
 
-wait_for_processes() {
-   while [ "$(jobs -r | wc -l)" -ge $MAX_PROCESSES ]; do
-      sleep 1s
-   done
-}
-
 source "$CONF"/configure.sh
 export LOG=$LOGS/compile_modules.log
 date +"%c: Starting" >$LOG
 
+# make sure the compilation isn't disturbed by updates
+# files are hard linked into the snapshot, updates of the source tree replace them instead of rewriting them
+python "$VIRTUAL_ENV"/modules_compilation/snapshot_directory.py "$NONIETFDIR" "$STATIC_COPIES" >>$LOG 2>&1
+
 # Need to set some ENV variables for subsequent calls in .PY to confd...
 source $CONFD_DIR/confdrc >>$LOG 2>&1
 
 # BBF, we need to flatten the directory structure
 mkdir -p $TMP/bbf >>$LOG 2>&1
 rm -f $TMP/bbf/* >>$LOG 2>&1
-find $STATIC_COPIES/yangmodels/yang/standard/bbf -name "*.yang" -exec cp {} $TMP/bbf/ \; >>$LOG 2>&1
+python "$VIRTUAL_ENV"/modules_compilation/snapshot_directory.py --flatten --extension yang "$STATIC_COPIES/yangmodels/yang/standard/bbf" "$TMP/bbf" >>$LOG 2>&1
 
 mkdir -p $MODULES >>$LOG 2>&1
 
 curl -s -H "Accept: application/json" $MY_URI/api/search/modules -o "$TMP/all_modules_data.json" >>$LOG 2>&1
 
-date +"%c: forking all sub-processes" >>$LOG
+date +"%c: collecting all compilation jobs" >>$LOG
+
+# Every compilation job is one line of the manifest - JSON list of the compile_modules.py arguments
+MANIFEST="$TMP/compile_modules_manifest.jsonl"
+DRAFT_ARCHIVE_MANIFEST="$TMP/compile_modules_draft_archive_manifest.jsonl"
+rm -f "$MANIFEST" "$DRAFT_ARCHIVE_MANIFEST"
+
+add_job() {
+   # syntax: add_job manifest compile_modules.py arguments...
+   local manifest=$1
+   shift
+   python -c 'import json, sys; print(json.dumps(sys.argv[1:]))' "$@" >>"$manifest"
+}
 
 compile_modules() {
-   python "$VIRTUAL_ENV"/modules_compilation/compile_modules.py "$@" >>$LOG 2>&1 &
-   wait_for_processes
+   add_job "$MANIFEST" "$@"
+}
+
+run_orchestrator() {
+   # syntax: run_orchestrator manifest
+   local manifest=$1
+   date +"%c: compiling modules of $(wc -l <"$manifest") jobs in $MAX_PROCESSES processes" >>$LOG
+   python "$VIRTUAL_ENV"/modules_compilation/compilation_orchestrator.py --manifest "$manifest" --processes $MAX_PROCESSES >>$LOG 2>&1
 }
 
 # IETF RFCs
@@ -62,9 +77,8 @@ compile_modules --metadata "RFC-produced YANG models: Oh gosh, not all of them c
 
 # IETF drafts
 if [ "$(date +%u)" -eq 6 ]; then
-   compile_modules --draft-archive
-   # high RAM usage
-   wait
+   # high RAM usage - compiled by its own orchestrator run, before the other jobs are loaded
+   add_job "$DRAFT_ARCHIVE_MANIFEST" --draft-archive
 else
    compile_modules --draft
 fi
@@ -113,34 +127,19 @@ for path in $(ls -d $STATIC_COPIES/yangmodels/yang/standard/etsi/*); do
    compile_modules --metadata "ETSI Complete Report: YANG Data Models compilation from https://github.com/etsi-forge/nfv-sol006/tree/$version" --lint --prefix ETSI$version_alnum --rootdir "$STATIC_COPIES/yangmodels/yang/standard/etsi/NFV-SOL006-$version/src/yang"
 done
 
-wait
-
 if [ "$IS_PROD" = "True" ]; then
    # OpenROADM public
    #
    # OpenROADM directory structure need to be flattened
-   # Each branch representing the version is copied to a separate folder
-   # This allows to run the compile_modules.py script on multiple folders in parallel
-   cur_dir=$(pwd)
-   cd $STATIC_COPIES/openroadm/OpenROADM_MSA_Public
-   branches=$(git branch --remotes)
-   for branch in $branches; do
-      version=${branch##*/}
-      first_char=${version:0:1}
-      if [[ $first_char =~ ^[[:digit:]] ]]; then
-         git checkout $version >>$LOG 2>&1
-         mkdir -p $TMP/openroadm-public/$version >>$LOG 2>&1
-         rm -f $TMP/openroadm-public/$version/* >>$LOG 2>&1
-         find $STATIC_COPIES/openroadm/OpenROADM_MSA_Public -name "*.yang" -exec cp {} $TMP/openroadm-public/$version/ \; >>$LOG 2>&1
-      fi
-   done
+   # Each branch representing the version is materialized into a separate folder straight from the git objects,
+   # without checking the branches out, modules unchanged between the versions are hard links of one file
+   python "$VIRTUAL_ENV"/modules_compilation/materialize_git_versions.py --repo "$STATIC_COPIES/openroadm/OpenROADM_MSA_Public" --dst "$TMP/openroadm-public" >>$LOG 2>&1
 
-   date +"%c: forking all sub-processes for OpenROADM versions" >>$LOG
+   date +"%c: collecting compilation jobs for OpenROADM versions" >>$LOG
    for path in $(ls -d $TMP/openroadm-public/*/); do
       version=$(basename $path)
       compile_modules --metadata "OpenRoadm $version: YANG Data Models compilation from https://github.com/OpenROADM/OpenROADM_MSA_Public/tree/$version/model" --lint --prefix OpenROADM$version --rootdir "$TMP/openroadm-public/$version/"
    done
-   cd $cur_dir
 
    cisco() {
       # syntax: cisco meta os
@@ -223,9 +222,12 @@ else
    date +"%c: This is not PROD environment - skipping vendor modules parsing" >>$LOG
 fi
 
-wait
+if [ -f "$DRAFT_ARCHIVE_MANIFEST" ]; then
+   run_orchestrator "$DRAFT_ARCHIVE_MANIFEST"
+fi
+run_orchestrator "$MANIFEST"
 
-date +"%c: all sub-process have ended" >>$LOG
+date +"%c: all compilation jobs have ended" >>$LOG
 
 date +"%c: reloading cache" >>$LOG
 read -ra CRED <<<$(sed 's/\"//g' <<<"$CREDENTIALS")
@@ -0,0 +1,146 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Create a static snapshot of a directory tree for the modules compilation without copying the file contents.
+Files are hard linked into the snapshot, if that is not possible (e.g. the snapshot is on another filesystem)
+they are reflinked on filesystems which support it and copied otherwise. Symbolic links are recreated.
+The files in the source tree are replaced rather than rewritten by git and rsync, so the snapshot
+keeps the content from the time it was created while the source tree is being updated.
+Hard linked files keep the inode and modification time, so FileHasher doesn't need to read them again.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import argparse
+import errno
+import fcntl
+import os
+import shutil
+import typing as t
+
+FICLONE = 0x40049409  # ioctl request creating a reflink of the whole file
+
+
+def link_file(src: str, dst: str):
+    """
+    Put a file with the content of 'src' to 'dst' as cheaply as possible: hard link, reflink or copy.
+    Existing 'dst' is replaced unless it already is a hard link of 'src'.
+    """
+    if os.path.lexists(dst):
+        if not os.path.islink(dst) and os.path.samefile(src, dst):
+            return
+        os.remove(dst)
+    try:
+        os.link(src, dst)
+        return
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+            raise
+    try:
+        with open(src, 'rb') as reader, open(dst, 'wb') as writer:
+            fcntl.ioctl(writer.fileno(), FICLONE, reader.fileno())
+        shutil.copystat(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def snapshot_directory(
+    src_dir: str,
+    dst_dir: str,
+    extensions: t.Optional[tuple[str, ...]] = None,
+    flatten: bool = False,
+) -> int:
+    """
+    Create a snapshot of the 'src_dir' tree in 'dst_dir'.
+
+    Arguments:
+        :param src_dir      (str) Directory to take the snapshot of
+        :param dst_dir      (str) Directory where to create the snapshot
+        :param extensions   (tuple) Only take the files with these extensions, all the files if not set
+        :param flatten      (bool) Put all the files directly into 'dst_dir' instead of recreating the directory tree,
+            files found later (in sorted order of the paths) replace the files with the same name found earlier
+    :return: (int) Number of files in the snapshot
+    """
+    files_count = 0
+    os.makedirs(dst_dir, exist_ok=True)
+    for root, dirs, files in os.walk(src_dir):
+        # sorted walk, so that it is deterministic which file wins when flattening
+        dirs.sort()
+        relative_root = os.path.relpath(root, src_dir)
+        dst_root = dst_dir if flatten else os.path.normpath(os.path.join(dst_dir, relative_root))
+        if not flatten:
+            for directory in dirs:
+                src_path = os.path.join(root, directory)
+                dst_path = os.path.join(dst_root, directory)
+                if os.path.islink(src_path):
+                    _copy_symlink(src_path, dst_path)
+                else:
+                    os.makedirs(dst_path, exist_ok=True)
+        for filename in sorted(files):
+            if extensions and filename.rsplit('.', 1)[-1] not in extensions:
+                continue
+            src_path = os.path.join(root, filename)
+            dst_path = os.path.join(dst_root, filename)
+            if os.path.islink(src_path) and not flatten:
+                _copy_symlink(src_path, dst_path)
+            elif os.path.isfile(src_path):
+                link_file(src_path, dst_path)
+            else:
+                continue
+            files_count += 1
+    return files_count
+
+
+def _copy_symlink(src: str, dst: str):
+    target = os.readlink(src)
+    if os.path.islink(dst) and os.readlink(dst) == target:
+        return
+    if os.path.lexists(dst):
+        if os.path.isdir(dst) and not os.path.islink(dst):
+            shutil.rmtree(dst)
+        else:
+            os.remove(dst)
+    os.symlink(target, dst)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Create a static snapshot of a directory tree using hard links instead of copying the files',
+    )
+    parser.add_argument('src_dir', help='Directory to take the snapshot of', type=str)
+    parser.add_argument('dst_dir', help='Directory where to create the snapshot', type=str)
+    parser.add_argument(
+        '--extension',
+        help='Only take the files with this extension, can be used multiple times. Default is all the files',
+        action='append',
+        default=[],
+    )
+    parser.add_argument(
+        '--flatten',
+        help='Optional flag that determines whether to put all the files directly into the destination directory '
+        'instead of recreating the directory tree. Default is False',
+        action='store_true',
+        default=False,
+    )
+    args = parser.parse_args()
+    files_count = snapshot_directory(args.src_dir, args.dst_dir, tuple(args.extension) or None, args.flatten)
+    print(f'Snapshot of {files_count} files from {args.src_dir} created in {args.dst_dir}', flush=True)
+
+
+if __name__ == '__main__':
+    main()
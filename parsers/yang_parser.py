@@ -20,9 +20,10 @@ __copyright__ = 'Copyright 2018 Cisco and its affiliates, Copyright The IETF Tru
 __license__ = 'Apache License, Version 2.0'
 __email__ = 'miroslav.kovac@pantheon.tech'
 
-import json
+import hashlib
 import os
 import typing as t
+from collections import OrderedDict
 
 from pyang.context import Context
 from pyang.error import error_codes
@@ -31,6 +32,7 @@ from pyang.statements import Statement
 from pyang.yang_parser import YangParser
 
 from create_config import create_config
+from utility.unparsable_modules import get_unparsable_modules
 
 DEFAULT_OPTIONS = {
     'path': [],
@@ -109,7 +111,10 @@ def create_context(path: str = '.') -> OptsContext:
     Arguments:
         path (str): location of YANG modules.
             (Join string with ``os.pathsep`` for multiple locations).
-            Default is the current working dir.
+            Default is the current working dir. An empty path creates
+            a context without any search path, not even the ``YANG_MODPATH``
+            and the default install locations, for parsing single files
+            without resolving their imports.
 
     Keyword Arguments:
         print_error_code (bool): On errors, print the error code instead
@@ -147,7 +152,7 @@ def create_context(path: str = '.') -> OptsContext:
     # deviations (list): Deviation module (NOT CURRENTLY WORKING).
 
     opts = Objectify(DEFAULT_OPTIONS)
-    repo = FileRepository(path, no_path_recurse=opts.no_path_recurse)
+    repo = FileRepository(path, use_env=bool(path), no_path_recurse=opts.no_path_recurse)
 
     ctx = OptsContext(repo)
     ctx.opts = opts
@@ -176,16 +181,65 @@ class ParseException(Exception):
             config = create_config()
             var_path = config.get('Directory-Section', 'var')
             self.msg = 'Failed to parse module on path {}'.format(path)
-            try:
-                with open('{}/unparsable-modules.json'.format(var_path), 'r') as f:
-                    modules = json.load(f)
-            except (FileNotFoundError, json.decoder.JSONDecodeError):
-                modules = []
-            module = path.split('/')[-1]
-            if module not in modules:
-                modules.append(module)
-            with open('{}/unparsable-modules.json'.format(var_path), 'w') as f:
-                json.dump(modules, f)
+            get_unparsable_modules(var_path).add(path.split('/')[-1])
+
+
+class CachingYangParser:
+    """
+    Long-lived YANG parser. The pyang context is created once and only its errors are reset for every parse,
+    the parsed ASTs are kept in a bounded LRU cache indexed by the file name and the hash of the parsed text,
+    so the same module parsed repeatedly (e.g. by check_yangcatalog_data() and _resolve_organization())
+    is parsed only once. The cached ASTs are shared, callers must not modify them.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        """
+        Arguments:
+            :param cache_size   (int) Maximum number of the cached ASTs
+        """
+        self.cache_size = cache_size
+        self._parser = YangParser()  # Similar names, but, this one is from PYANG library
+        self._ctx: t.Optional[OptsContext] = None
+        self._asts: OrderedDict[tuple[str, str], Statement] = OrderedDict()
+
+    @property
+    def ctx(self) -> OptsContext:
+        if self._ctx is None:
+            # YangParser doesn't resolve imports, the context doesn't need to list any modules
+            self._ctx = create_context(path='')
+        return self._ctx
+
+    def parse(self, text: str) -> Statement:
+        """Parse a file name for a YANG module or YANG text, see parse()."""
+        filename = 'parser-input'
+        if os.path.isfile(text):
+            filename = text
+            with open(filename) as f:
+                text = f.read()
+
+        key = (filename, hashlib.sha256(text.encode('utf-8')).hexdigest())
+        ast = self._asts.get(key)
+        if ast is not None:
+            self._asts.move_to_end(key)
+            return ast
+
+        # ensure reported errors are just from parsing
+        self.ctx.errors = []
+        ast = self._parser.parse(self.ctx, filename, text)
+        self.ctx.errors = []
+        if ast is None:
+            raise ParseException(filename if filename != 'parser-input' else None)
+
+        self._asts[key] = ast
+        if len(self._asts) > self.cache_size:
+            self._asts.popitem(last=False)
+        return ast
+
+    def clear(self):
+        self._asts.clear()
+
+
+_caching_parser = CachingYangParser()
 
 
 def parse(text: str) -> Statement:
@@ -195,7 +249,8 @@ def parse(text: str) -> Statement:
         text (str): file name for a YANG module or text
 
     Returns:
-        pyang.statements.Statement: Abstract syntax subtree
+        pyang.statements.Statement: Abstract syntax subtree, shared with the other callers
+        parsing the same text, so it must not be modified
 
     Note:
         The ``parse`` function can be used to parse small amounts of text.
@@ -207,26 +262,7 @@ def parse(text: str) -> Statement:
         YANG deviations yet.
     Note II:
         pyang.Context removed as optional parameter as it was not used anymore.
+    Note III:
+        The pyang context and the parsed ASTs are reused, see CachingYangParser.
     """
-    parser = YangParser()  # Similar names, but, this one is from PYANG library
-
-    filename = 'parser-input'
-
-    ctx_ = create_context()
-
-    if os.path.isfile(text):
-        filename = text
-        with open(filename) as f:
-            text = f.read()
-
-    # ensure reported errors are just from parsing
-    # old_errors = ctx_.errors
-    ctx_.errors = []
-
-    ast = parser.parse(ctx_, filename, text)
-    if ast is None:
-        raise ParseException(filename if filename != 'parser-input' else None)
-
-    ctx_.internal_reset()
-
-    return ast
+    return _caching_parser.parse(text)
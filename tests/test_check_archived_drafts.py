@@ -53,6 +53,9 @@ class TestCheckArchivedDrafts(unittest.TestCase):
             os.remove(self.cronjob_result_path)
         shutil.rmtree(self.check_archived_drafts_instance.extracted_missing_modules_directory, ignore_errors=True)
         shutil.rmtree(self.check_archived_drafts_instance.yang_path, ignore_errors=True)
+        shutil.rmtree(self.check_archived_drafts_instance.all_yang_path, ignore_errors=True)
+        if os.path.exists(self.check_archived_drafts_instance.manifest_path):
+            os.remove(self.check_archived_drafts_instance.manifest_path)
 
     @mock.patch('requests.get')
     def test_check_archived_drafts_script_successful(self, requests_get_mock):
@@ -79,6 +82,26 @@ class TestCheckArchivedDrafts(unittest.TestCase):
             and script_result['status'] == 'Success',
         )
 
+    @mock.patch('requests.get')
+    def test_check_archived_drafts_extracts_only_new_drafts(self, requests_get_mock):
+        requests_get_mock.return_value = mock.MagicMock()
+        requests_get_mock.return_value.json = lambda: {}
+        self.check_archived_drafts_instance.start_process()
+        missing_modules = self.check_archived_drafts_instance.missing_modules
+
+        instance = check_archived_drafts.CheckArchivedDrafts(config=self.config, message_factory=MessageFactoryMock())
+        with mock.patch.object(
+            instance.draft_extractor,
+            '_extract_drafts_for_manifest',
+            wraps=instance.draft_extractor._extract_drafts_for_manifest,
+        ) as extract_mock:
+            instance.start_process()
+
+        extract_mock.assert_not_called()
+        self.assertNotEqual(missing_modules, [])
+        self.assertListEqual(instance.missing_modules, missing_modules)
+        self.assertListEqual(sorted(missing_modules), sorted(os.listdir(instance.extracted_missing_modules_directory)))
+
     def test_check_archived_drafts_script_failure(self):
         self.check_archived_drafts_instance._extract_drafts = mock.MagicMock()
         self.check_archived_drafts_instance._extract_drafts.side_effect = Exception()
@@ -105,7 +128,7 @@ class TestCheckArchivedDrafts(unittest.TestCase):
         requests_get_mock.return_value = mock.MagicMock()
         requests_get_mock.return_value.json = lambda: {'module': [{'name': 'test', 'revision': '2020-02-02'}]}
         self.check_archived_drafts_instance._get_all_modules()
-        self.assertEqual(self.check_archived_drafts_instance.all_modules_keys, ['test@2020-02-02'])
+        self.assertEqual(self.check_archived_drafts_instance.all_modules_keys, {'test@2020-02-02'})
         with open(os.path.join(os.path.dirname(check_archived_drafts.__file__), 'resources/old-rfcs.json'), 'r') as f:
             old_modules = json.load(f)
         with open(os.path.join(self.check_archived_drafts_instance.var_path, 'unparsable-modules.json'), 'r') as f:
@@ -137,7 +160,7 @@ class TestCheckArchivedDrafts(unittest.TestCase):
             without_revision_module.write('')
             missing_module.write('')
             absent_module.write('')
-        self.check_archived_drafts_instance.all_modules_keys = ['present_module@2020-20-20']
+        self.check_archived_drafts_instance.all_modules_keys = {'present_module@2020-20-20'}
         self.check_archived_drafts_instance.modules_to_skip = ['unparsable_module@2020-20-20.yang']
         self.check_archived_drafts_instance.draft_extractor.inverted_draft_yang_dict = {
             'example@2020-20-20.yang': '',
@@ -183,6 +206,28 @@ class TestCheckArchivedDrafts(unittest.TestCase):
             ),
         )
 
+    def test_skipped_modules_index(self):
+        modules_to_skip = ('lora.yang', 'ietf-foo@2010-01-18.yang', 'hw.yang', 'odd.yang.yang')
+        skipped_modules = check_archived_drafts.SkippedModulesIndex(modules_to_skip)
+        for yang_file in (
+            'lora.yang',
+            'ora.yang',
+            'foo@2010-01-18.yang',
+            'ietf-foo.yang',
+            'hw.yang',
+            'ietf-hw.yang',
+            'odd.yang',
+            'yang.yang',
+            '.yang',
+            'lora',
+            'foo@2010',
+        ):
+            self.assertEqual(
+                yang_file in skipped_modules,
+                any(yang_file in module for module in modules_to_skip),
+                yang_file,
+            )
+
 
 if __name__ == '__main__':
     unittest.main()
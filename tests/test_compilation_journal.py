@@ -0,0 +1,86 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import unittest
+
+from modules_compilation.compilation_journal import CompilationJournal
+
+
+class TestCompilationJournal(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/compilation_journal')
+        cls.journal_path = os.path.join(cls.resource_path, 'Test.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def entry(self, yang_file_path: str, compilation_status: str = 'PASSED') -> CompilationJournal.Entry:
+        return {
+            'yang_file_path': yang_file_path,
+            'hash': 64 * '0',
+            'validator_versions': {'pyang': '2.5.3'},
+            'compilation_status': compilation_status,
+            'compilation_results': {'pyang': ''},
+            'validation_times': {'pyang': 0.5},
+        }
+
+    def test_flush_every_modules(self):
+        journal = CompilationJournal(self.journal_path, flush_every_modules=2, flush_every_seconds=3600)
+        journal.append(self.entry('a.yang'))
+
+        self.assertEqual(journal.load(), {})
+
+        journal.append(self.entry('b.yang'))
+
+        self.assertEqual(sorted(journal.load()), ['a.yang', 'b.yang'])
+
+    def test_flush_every_seconds(self):
+        journal = CompilationJournal(self.journal_path, flush_every_modules=100, flush_every_seconds=0)
+        journal.append(self.entry('a.yang'))
+
+        self.assertEqual(journal.load(), {'a.yang': self.entry('a.yang')})
+
+    def test_load_latest_entry_and_skip_cut_off_line(self):
+        journal = CompilationJournal(self.journal_path, flush_every_modules=1)
+        journal.append(self.entry('a.yang', 'FAILED'))
+        journal.append(self.entry('a.yang', 'PASSED'))
+        with open(self.journal_path, 'a', encoding='utf-8') as writer:
+            writer.write('{"yang_file_path": "b.ya')
+
+        entries = CompilationJournal(self.journal_path).load()
+
+        self.assertEqual(list(entries), ['a.yang'])
+        self.assertEqual(entries['a.yang']['compilation_status'], 'PASSED')
+
+    def test_remove(self):
+        journal = CompilationJournal(self.journal_path, flush_every_modules=1)
+        journal.append(self.entry('a.yang'))
+        journal.remove()
+
+        self.assertFalse(os.path.exists(self.journal_path))
+        self.assertEqual(journal.load(), {})
+        journal.remove()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import json
+import os
+import shutil
+import sys
+import unittest
+from unittest import mock
+
+# the compilation scripts import each other as top-level modules
+sys.path.append(os.path.join(os.environ['VIRTUAL_ENV'], 'modules_compilation'))
+
+import compile_modules  # noqa: E402
+from compile_modules import CompileModulesABC  # noqa: E402
+
+from create_config import create_config  # noqa: E402
+from modules_compilation.compilation_orchestrator import CompilationOrchestrator  # noqa: E402
+
+RESOURCE_PATH = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/compilation_orchestrator')
+VALIDATED_MODULES_PATH = os.path.join(RESOURCE_PATH, 'validated_modules.txt')
+MODULE_TEXT = 'module {} {{\n  namespace "urn:{}";\n  prefix test;\n  revision 2023-01-01;\n}}\n'
+
+
+def _run_validators(self: CompileModulesABC, compilation_plan: CompileModulesABC.ModuleCompilationPlan):
+    # also called in the worker processes, the validated modules are collected in a file
+    yang_file_path = compilation_plan.module_info.yang_file_path
+    with open(VALIDATED_MODULES_PATH, 'a') as f:
+        f.write(f'{yang_file_path}\n')
+    module_directory = os.path.dirname(yang_file_path)
+    compilation_results = {
+        'pyang_lint': '',
+        'pyang': (
+            f'{yang_file_path}:1: warning: test\n'
+            f'{module_directory}1/other.yang:1: error: test\n'
+            f'/mirror{module_directory}/other.yang:1: error: test\n'
+        ),
+    }
+    return 'PASSED WITH WARNINGS', compilation_results, {'pyang': 1.0}
+
+
+class TestCompilationOrchestrator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root_directories = [os.path.join(RESOURCE_PATH, 'vendor', version) for version in ('17.1', '17.11')]
+        cls.config = create_config()
+        for section, option, directory in (
+            ('Directory-Section', 'cache', 'cache'),
+            ('Directory-Section', 'temp', 'tmp'),
+            ('Directory-Section', 'var', 'var'),
+            ('Directory-Section', 'save-file-dir', 'all_modules'),
+            ('Directory-Section', 'modules-directory', 'modules'),
+            ('Web-Section', 'private-directory', 'private'),
+        ):
+            cls.config.set(section, option, os.path.join(RESOURCE_PATH, directory))
+        cls.config.set('Tool-Section', 'pyang-exec', 'pyang')
+        cls.jobs = [
+            ['--lint', '--prefix', f'Test{index}', '--rootdir', root_directory]
+            for index, root_directory in enumerate(cls.root_directories)
+        ]
+
+    def setUp(self):
+        for directory in ('cache', 'tmp', 'var', 'modules', 'private', *self.root_directories):
+            os.makedirs(os.path.join(RESOURCE_PATH, directory))
+        with open(os.path.join(RESOURCE_PATH, 'tmp', 'all_modules_data.json'), 'w') as f:
+            json.dump({'module': []}, f)
+        # the identical module is in both of the jobs, the other modules differ
+        for root_directory, other_module_name in zip(self.root_directories, ('first', 'second')):
+            for module_name in ('shared', other_module_name):
+                with open(os.path.join(root_directory, f'{module_name}@2023-01-01.yang'), 'w') as f:
+                    f.write(MODULE_TEXT.format(module_name, module_name))
+
+    def tearDown(self):
+        shutil.rmtree(RESOURCE_PATH, ignore_errors=True)
+
+    def test_duplicate_modules_validated_once(self):
+        self._check_compilation(processes=1)
+
+    def test_duplicate_modules_validated_once_in_parallel(self):
+        self._check_compilation(processes=2)
+
+    def _check_compilation(self, processes: int):
+        orchestrator = CompilationOrchestrator(self.jobs, processes, config=self.config)
+        with (
+            mock.patch.object(CompileModulesABC, 'run_validators', _run_validators),
+            mock.patch.object(compile_modules, 'check_yangcatalog_data'),
+        ):
+            orchestrator()
+
+        first_directory, second_directory = self.root_directories
+        with open(VALIDATED_MODULES_PATH) as f:
+            self.assertCountEqual(
+                f.read().splitlines(),
+                [
+                    os.path.join(first_directory, 'shared@2023-01-01.yang'),
+                    os.path.join(first_directory, 'first@2023-01-01.yang'),
+                    os.path.join(second_directory, 'second@2023-01-01.yang'),
+                ],
+            )
+        duplicate_tasks = {
+            (
+                orchestrator.scheduled_compilation_plans[script_index][plan_index].module_info.yang_file_path,
+                orchestrator.scheduled_compilation_plans[duplicate_script_index][
+                    duplicate_plan_index
+                ].module_info.yang_file_path,
+            )
+            for (script_index, plan_index), duplicates in orchestrator.duplicate_tasks.items()
+            for duplicate_script_index, duplicate_plan_index in duplicates
+        }
+        self.assertEqual(
+            duplicate_tasks,
+            {
+                (
+                    os.path.join(first_directory, 'shared@2023-01-01.yang'),
+                    os.path.join(second_directory, 'shared@2023-01-01.yang'),
+                ),
+            },
+        )
+        compilation_results = {
+            compilation_plan.module_info.yang_file_path: compilation_plan.yang_file_compilation_data
+            for script in orchestrator.compile_modules_scripts
+            for compilation_plan in script.compilation_plans
+        }
+        self.assertEqual(len(compilation_results), 4)
+        duplicate_compilation_data = compilation_results[os.path.join(second_directory, 'shared@2023-01-01.yang')]
+        self.assertEqual(duplicate_compilation_data['compilation_metadata'], ('PASSED WITH WARNINGS',))
+        # only the whole paths of the validated module directory are rewritten to the directory of the duplicate
+        self.assertEqual(
+            duplicate_compilation_data['compilation_results']['pyang'],
+            f'{second_directory}/shared@2023-01-01.yang:1: warning: test\n'
+            f'{first_directory}1/other.yang:1: error: test\n'
+            f'/mirror{first_directory}/other.yang:1: error: test\n',
+        )
+        with open(os.path.join(RESOURCE_PATH, 'cache', 'sdo_files_modification_hashes.json')) as f:
+            self.assertLessEqual(set(compilation_results), set(json.load(f)))
+
+
+if __name__ == '__main__':
+    unittest.main()
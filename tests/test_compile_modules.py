@@ -0,0 +1,292 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import json
+import os
+import shutil
+import sys
+import time
+import unittest
+from unittest import mock
+
+# the compilation scripts import each other as top-level modules
+sys.path.append(os.path.join(os.environ['VIRTUAL_ENV'], 'modules_compilation'))
+
+import compile_modules  # noqa: E402
+from compile_modules import CompileBaseModules, CompileModulesABC  # noqa: E402
+
+from create_config import create_config  # noqa: E402
+from modules_compilation.file_hasher import FileHasher  # noqa: E402
+
+RESOURCE_PATH = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/compile_modules')
+
+
+class TestCompileModules(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root_directory = os.path.join(RESOURCE_PATH, 'modules')
+        cls.hashes_path = os.path.join(RESOURCE_PATH, 'cache', 'sdo_files_modification_hashes.json')
+        cls.config = create_config()
+        for section, option, directory in (
+            ('Directory-Section', 'cache', 'cache'),
+            ('Directory-Section', 'temp', 'tmp'),
+            ('Directory-Section', 'var', 'var'),
+            ('Directory-Section', 'save-file-dir', 'all_modules'),
+            ('Directory-Section', 'modules-directory', 'search_path'),
+            ('Web-Section', 'private-directory', 'private'),
+        ):
+            cls.config.set(section, option, os.path.join(RESOURCE_PATH, directory))
+
+    def setUp(self):
+        for directory in ('cache', 'tmp', 'var', 'search_path', 'private', 'modules'):
+            os.makedirs(os.path.join(RESOURCE_PATH, directory))
+        self.parsers = {parser_name: mock.MagicMock() for parser_name in CompileModulesABC.validator_results_keys}
+        self.parsers['pyang'].run_pyang.return_value = ''
+        self.parsers['confdc'].run_confdc.return_value = ''
+        self.parsers['yangdumppro'].run_yumadumppro.return_value = ''
+        self.parsers['yanglint'].run_yanglint.return_value = ''
+        check_yangcatalog_data_patcher = mock.patch.object(compile_modules, 'check_yangcatalog_data')
+        check_yangcatalog_data_patcher.start()
+        self.addCleanup(check_yangcatalog_data_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(RESOURCE_PATH, ignore_errors=True)
+
+    def module_path(self, name: str) -> str:
+        return os.path.join(self.root_directory, f'{name}@2023-01-01.yang')
+
+    def write_module(self, name: str, body: str = ''):
+        with open(self.module_path(name), 'w') as f:
+            f.write(
+                f'module {name} {{\n  namespace "urn:{name}";\n  prefix {name};\n{body}  revision 2023-01-01;\n}}\n'
+            )
+
+    def create_script(self, force_compilation: bool = False, **options) -> CompileBaseModules:
+        shared_resources = CompileModulesABC.SharedResources(
+            file_hasher=FileHasher(force_compilation=force_compilation, config=self.config),
+            parsers=self.parsers,
+            modules={},
+        )
+        return CompileBaseModules(
+            'Test',
+            self.root_directory,
+            CompileModulesABC.Options(
+                debug_level=0,
+                force_compilation=force_compilation,
+                lint=False,
+                allinclusive=False,
+                metadata='',
+                save_compilation_results_to_db=False,
+                config=self.config,
+                shared_resources=shared_resources,
+                **options,
+            ),
+        )
+
+    def scheduled_modules(self, script: CompileModulesABC) -> list[str]:
+        return [compilation_plan.file_name_and_revision for compilation_plan in script.prepare_compilation()]
+
+    def write_validation_times(self, validation_times: dict[str, float]):
+        with open(self.hashes_path, 'w') as f:
+            json.dump(
+                {
+                    self.module_path(name): {
+                        'hash': None,
+                        'validator_versions': {},
+                        'validation_times': {
+                            validator: validation_time for validator in CompileModulesABC.validator_results_keys
+                        },
+                    }
+                    for name, validation_time in validation_times.items()
+                },
+                f,
+            )
+
+    def test_schedule_by_validation_cost(self):
+        for name in ('cheap', 'expensive', 'unknown', 'partially-known'):
+            self.write_module(name)
+        validators = CompileModulesABC.validator_results_keys
+        with open(self.hashes_path, 'w') as f:
+            json.dump(
+                {
+                    self.module_path('cheap'): {
+                        'hash': None,
+                        'validator_versions': {},
+                        'validation_times': {validator: 1.0 for validator in validators},
+                    },
+                    self.module_path('expensive'): {
+                        'hash': None,
+                        'validator_versions': {},
+                        'validation_times': {validator: 5.0 for validator in validators},
+                    },
+                    self.module_path('partially-known'): {
+                        'hash': None,
+                        'validator_versions': {},
+                        'validation_times': {'pyang': 100.0},
+                    },
+                },
+                f,
+            )
+
+        scheduled_modules = self.scheduled_modules(self.create_script())
+
+        # modules with unknown validation times of some of the validators go first, in any order
+        self.assertCountEqual(
+            scheduled_modules[:2],
+            ['unknown@2023-01-01.yang', 'partially-known@2023-01-01.yang'],
+        )
+        self.assertEqual(scheduled_modules[2:], ['expensive@2023-01-01.yang', 'cheap@2023-01-01.yang'])
+
+    def test_validation_times_are_measured_and_stored(self):
+        for name in ('first', 'second', 'third'):
+            self.write_module(name)
+
+        def run_pyang(root_directory: str, yang_file_path: str, *args) -> str:
+            if os.path.basename(yang_file_path).startswith('second'):
+                time.sleep(0.05)
+            return ''
+
+        self.parsers['pyang'].run_pyang.side_effect = run_pyang
+        self.create_script()()
+
+        with open(self.hashes_path) as f:
+            hashes = json.load(f)
+        for name in ('first', 'second', 'third'):
+            self.assertEqual(
+                set(hashes[self.module_path(name)]['validation_times']),
+                set(CompileModulesABC.validator_results_keys),
+            )
+        self.assertGreaterEqual(hashes[self.module_path('second')]['validation_times']['pyang'], 0.1)
+
+        self.assertEqual(self.scheduled_modules(self.create_script()), [])
+        scheduled_modules = self.scheduled_modules(self.create_script(force_compilation=True))
+        self.assertEqual(scheduled_modules[0], 'second@2023-01-01.yang')
+        self.assertCountEqual(
+            scheduled_modules, ['first@2023-01-01.yang', 'second@2023-01-01.yang', 'third@2023-01-01.yang']
+        )
+
+    def test_schedule_by_dependencies(self):
+        self.write_module('base')
+        self.write_module('middle', '  import base {\n    prefix base;\n  }\n')
+        self.write_module('top', '  import middle {\n    prefix middle;\n  }\n  import base {\n    prefix base;\n  }\n')
+        self.write_module('independent')
+        # without the dependency order the most expensive modules would go first
+        self.write_validation_times({'base': 1.0, 'middle': 2.0, 'top': 3.0, 'independent': 4.0})
+
+        self.assertEqual(
+            self.scheduled_modules(self.create_script()),
+            ['independent@2023-01-01.yang', 'top@2023-01-01.yang', 'middle@2023-01-01.yang', 'base@2023-01-01.yang'],
+        )
+        self.assertEqual(
+            self.scheduled_modules(self.create_script(dependency_order=True)),
+            ['independent@2023-01-01.yang', 'base@2023-01-01.yang', 'middle@2023-01-01.yang', 'top@2023-01-01.yang'],
+        )
+
+    def test_dependencies_checked_only_for_modules_to_validate(self):
+        self.write_module('base', '  import missing {\n    prefix missing;\n  }\n')
+        self.write_module('middle', '  import base {\n    prefix base;\n  }\n')
+        self.write_module('top', '  import middle {\n    prefix middle;\n  }\n')
+        self.write_module('independent')
+        self.create_script(dependency_order=True)()
+
+        script = self.create_script(dependency_order=True)
+        with (
+            mock.patch.object(compile_modules.yang_parser, 'parse') as parse_mock,
+            mock.patch.object(script, '_get_search_path_module_names') as get_search_path_module_names_mock,
+        ):
+            self.assertEqual(self.scheduled_modules(script), [])
+        # nothing changed, no dependency is parsed and the search path isn't scanned
+        parse_mock.assert_not_called()
+        get_search_path_module_names_mock.assert_not_called()
+
+        self.write_module('top', '  import middle {\n    prefix middle;\n  }\n  // changed\n')
+        script = self.create_script(dependency_order=True)
+        scheduled_compilation_plans = script.prepare_compilation()
+
+        # the missing module two imports away is found through the modules which don't need to be validated
+        self.assertEqual(
+            [compilation_plan.file_name_and_revision for compilation_plan in scheduled_compilation_plans],
+            ['top@2023-01-01.yang'],
+        )
+        self.assertEqual(scheduled_compilation_plans[0].failed_dependencies, ['middle'])
+
+    def test_schedule_by_dependencies_with_cycle(self):
+        self.write_module('first', '  import second {\n    prefix second;\n  }\n')
+        self.write_module('second', '  import first {\n    prefix first;\n  }\n')
+        self.write_module('third', '  import first {\n    prefix first;\n  }\n')
+        self.write_validation_times({'first': 1.0, 'second': 2.0, 'third': 3.0})
+        script = self.create_script(dependency_order=True)
+
+        with mock.patch.object(script, '_custom_print') as custom_print_mock:
+            scheduled_modules = self.scheduled_modules(script)
+
+        # falls back to the most expensive first order
+        self.assertEqual(
+            scheduled_modules,
+            ['third@2023-01-01.yang', 'second@2023-01-01.yang', 'first@2023-01-01.yang'],
+        )
+        self.assertTrue(
+            any('Import cycle found' in call.args[0] for call in custom_print_mock.call_args_list),
+        )
+
+    def test_skip_failed_dependencies(self):
+        self.write_module('dependent', '  import missing {\n    prefix missing;\n  }\n')
+        self.write_module('independent')
+
+        self.create_script(dependency_order=True, skip_failed_dependencies=True)()
+
+        # only pyang is run for the module with the missing dependency
+        validated_modules = [call.args[0] for call in self.parsers['confdc'].run_confdc.call_args_list]
+        self.assertEqual(validated_modules, [self.module_path('independent')])
+        self.assertEqual(self.parsers['pyang'].run_pyang.call_count, 4)
+        with open(os.path.join(RESOURCE_PATH, 'private', 'Test.json')) as f:
+            compilation_results = json.load(f)['dependent@2023-01-01.yang']['compilation_results']
+        for result_key in ('confdrc', 'yumadump', 'yanglint'):
+            self.assertEqual(
+                compilation_results[result_key],
+                'Validation skipped, missing or unparsable dependencies: missing',
+            )
+        # the hash is invalidated, so the module is validated again until the dependency is fixed
+        with open(self.hashes_path) as f:
+            hashes = json.load(f)
+        self.assertIsNone(hashes[self.module_path('dependent')]['hash'])
+        self.assertIsNotNone(hashes[self.module_path('independent')]['hash'])
+        self.assertEqual(
+            self.scheduled_modules(self.create_script(dependency_order=True, skip_failed_dependencies=True)),
+            ['dependent@2023-01-01.yang'],
+        )
+
+        with open(os.path.join(RESOURCE_PATH, 'search_path', 'missing@2023-01-01.yang'), 'w') as f:
+            f.write('module missing {\n  namespace "urn:missing";\n  prefix missing;\n}\n')
+        self.parsers['confdc'].run_confdc.reset_mock()
+        self.create_script(dependency_order=True, skip_failed_dependencies=True)()
+
+        self.parsers['confdc'].run_confdc.assert_called_once()
+        self.assertEqual(self.parsers['confdc'].run_confdc.call_args.args[0], self.module_path('dependent'))
+        with open(self.hashes_path) as f:
+            self.assertIsNotNone(json.load(f)[self.module_path('dependent')]['hash'])
+        self.assertEqual(
+            self.scheduled_modules(self.create_script(dependency_order=True, skip_failed_dependencies=True)),
+            [],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
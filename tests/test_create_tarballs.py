@@ -0,0 +1,87 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import tarfile
+import unittest
+from unittest import mock
+
+from ietf_modules_extraction import create_tarballs
+
+
+class TestCreateTarballs(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/create_tarballs')
+        cls.src_dir = os.path.join(cls.resource_path, 'YANG')
+        cls.tarball_path = os.path.join(cls.resource_path, 'YANG.tgz')
+
+    def setUp(self):
+        os.makedirs(self.src_dir)
+        for filename in ('b.yang', 'a@2023-01-01.yang', 'README.md'):
+            with open(os.path.join(self.src_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(f'module {filename} {{}}\n' * 1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_update_tarball(self):
+        state = {}
+        self.assertTrue(create_tarballs.update_tarball(self.src_dir, self.tarball_path, state))
+
+        with tarfile.open(self.tarball_path) as tar:
+            self.assertEqual(tar.getnames(), ['a@2023-01-01.yang', 'b.yang'])
+            self.assertEqual(tar.extractfile('b.yang').read(), b'module b.yang {}\n' * 1000)
+            self.assertTrue(all(member.mtime == 0 and member.uid == 0 for member in tar.getmembers()))
+
+    def test_update_tarball_skips_unchanged_modules(self):
+        state = {}
+        create_tarballs.update_tarball(self.src_dir, self.tarball_path, state)
+        # rewritten with the same content
+        shutil.copy(os.path.join(self.src_dir, 'b.yang'), os.path.join(self.resource_path, 'b.yang'))
+        os.replace(os.path.join(self.resource_path, 'b.yang'), os.path.join(self.src_dir, 'b.yang'))
+
+        with mock.patch.object(create_tarballs, 'write_tarball') as write_tarball_mock:
+            self.assertFalse(create_tarballs.update_tarball(self.src_dir, self.tarball_path, state))
+            with open(os.path.join(self.src_dir, 'c.yang'), 'w', encoding='utf-8') as f:
+                f.write('module c {}\n')
+            self.assertTrue(create_tarballs.update_tarball(self.src_dir, self.tarball_path, state))
+
+        write_tarball_mock.assert_called_once()
+
+    def test_tarball_is_deterministic(self):
+        members = create_tarballs.list_members(self.src_dir)
+        with mock.patch.object(create_tarballs, 'CHUNK_SIZE', 1024):
+            create_tarballs.write_tarball(self.src_dir, members, self.tarball_path)
+            with open(self.tarball_path, 'rb') as f:
+                serial_tarball = f.read()
+            os.utime(os.path.join(self.src_dir, 'b.yang'), (0, 0))
+            create_tarballs.write_tarball(self.src_dir, members, self.tarball_path, threads=4)
+            with open(self.tarball_path, 'rb') as f:
+                parallel_tarball = f.read()
+
+        self.assertEqual(serial_tarball, parallel_tarball)
+        with tarfile.open(self.tarball_path) as tar:
+            self.assertEqual(tar.extractfile('a@2023-01-01.yang').read(), b'module a@2023-01-01.yang {}\n' * 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
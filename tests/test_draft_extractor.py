@@ -0,0 +1,306 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from extractors.draft_extractor import DraftExtractor
+from extractors.elements_archive import ElementsArchive
+from extractors.extraction_manifest import ExtractionManifest
+from extractors.helper import XymTask, run_xym
+from utility.file_helpers import hash_file
+
+
+class TestDraftExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/draft_extractor')
+        cls.archived_drafts_path = os.path.join(
+            os.environ['VIRTUAL_ENV'],
+            'tests/resources/check_archived_drafts/ietf/my-id-archive-mirror',
+        )
+
+    def setUp(self):
+        self.draft_path = os.path.join(self.resource_path, 'drafts')
+        shutil.copytree(self.archived_drafts_path, self.draft_path)
+        # newer revision of the draft containing the same modules
+        shutil.copy(
+            os.path.join(self.draft_path, 'draft-zhuang-bess-evpn-yang-00.txt'),
+            os.path.join(self.draft_path, 'draft-zhuang-bess-evpn-yang-01.txt'),
+        )
+        # modules in <CODE BEGINS> section, example module and module outside of <CODE BEGINS> section
+        with open(os.path.join(self.draft_path, 'draft-test-modules-00.txt'), 'w', encoding='utf-8') as f:
+            f.write(
+                '<CODE BEGINS> file "ietf-test@2023-01-01.yang"\n'
+                'module ietf-test {\n  namespace "urn:ietf-test";\n  prefix test;\n'
+                '  revision 2023-01-01 {\n    description "Initial revision.";\n  }\n}\n'
+                '<CODE ENDS>\n\n'
+                'module example-test {\n  namespace "urn:example-test";\n  prefix ex;\n}\n\n'
+                'module other-test {\n  namespace "urn:other-test";\n  prefix other;\n}\n',
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_parallel_extraction_matches_serial_extraction(self):
+        self._assert_same_extraction({'processes': 2})
+
+    def test_single_pass_extraction_matches_serial_extraction(self):
+        self._assert_same_extraction({'single_pass_extraction': True})
+
+    def test_parallel_single_pass_extraction_matches_serial_extraction(self):
+        self._assert_same_extraction({'processes': 2, 'single_pass_extraction': True})
+
+    def test_drafts_list_contains_only_drafts_with_code(self):
+        open(os.path.join(self.draft_path, 'draft-empty-00.txt'), 'w').close()
+        with open(os.path.join(self.draft_path, 'draft-no-code-00.txt'), 'w', encoding='utf-8') as f:
+            f.write('module no-code {\n  namespace "urn:no-code";\n  prefix no;\n}\n')
+        with open(os.path.join(self.draft_path, 'draft-not-text-00.xml'), 'w', encoding='utf-8') as f:
+            f.write('<CODE BEGINS>\n<CODE ENDS>\n')
+        os.mkdir(os.path.join(self.draft_path, 'draft-directory-00.txt'))
+
+        serial_draft_extractor = self._extract('serial')
+        parallel_draft_extractor = self._extract('tested', processes=2)
+
+        self.assertIn('draft-test-modules-00.txt', serial_draft_extractor.ietf_drafts)
+        for filename in (
+            'draft-empty-00.txt',
+            'draft-no-code-00.txt',
+            'draft-not-text-00.xml',
+            'draft-directory-00.txt',
+        ):
+            self.assertNotIn(filename, serial_draft_extractor.ietf_drafts)
+        self.assertEqual(serial_draft_extractor.ietf_drafts, sorted(serial_draft_extractor.ietf_drafts))
+        self.assertEqual(serial_draft_extractor.ietf_drafts, parallel_draft_extractor.ietf_drafts)
+
+    def test_concurrent_xym_runs_capture_their_own_messages(self):
+        drafts = sorted(filename for filename in os.listdir(self.draft_path) if filename.endswith('.txt'))
+        tasks = []
+        for draft_file in drafts:
+            dstdir = os.path.join(self.resource_path, 'concurrent', draft_file)
+            os.makedirs(dstdir)
+            tasks.append(
+                XymTask(
+                    draft_file,
+                    self.draft_path,
+                    dstdir,
+                    os.path.join(dstdir, 'code-snippets'),
+                    strict=True,
+                    strict_examples=False,
+                    debug_level=0,
+                ),
+            )
+
+        stderr = sys.stderr
+        with ThreadPoolExecutor(len(tasks)) as executor:
+            results = list(executor.map(run_xym, tasks))
+
+        self.assertIs(sys.stderr, stderr)
+        self.assertTrue(any(result.stderr for result in results))
+        for draft_file, result in zip(drafts, results):
+            for line in result.stderr.splitlines():
+                self.assertIn(f"'{draft_file}'", line)
+
+    def test_incremental_extraction_matches_serial_extraction(self):
+        module_in_code_section = (
+            '<CODE BEGINS> file "ietf-test2@2023-01-01.yang"\n'
+            'module ietf-test2 {\n  namespace "urn:ietf-test2";\n  prefix test2;\n'
+            '  revision 2023-01-01 {\n    description "Initial revision.";\n  }\n}\n'
+            '<CODE ENDS>\n'
+        )
+        with open(os.path.join(self.draft_path, 'draft-test-code-00.txt'), 'w', encoding='utf-8') as f:
+            f.write(module_in_code_section)
+        self._assert_same_extraction({'manifest': True})
+        # the modules of the removed draft are extracted from the newer revision
+        os.remove(os.path.join(self.draft_path, 'draft-zhuang-bess-evpn-yang-00.txt'))
+        # new drafts with the same modules as drafts extracted before, earlier in the sorted order
+        shutil.copy(
+            os.path.join(self.draft_path, 'draft-zhuang-netmod-yang-poe-management-00.txt'),
+            os.path.join(self.draft_path, 'draft-a-netmod-yang-poe-management-00.txt'),
+        )
+        with open(os.path.join(self.draft_path, 'draft-a-test-00.txt'), 'w', encoding='utf-8') as f:
+            f.write(module_in_code_section)
+        with open(os.path.join(self.draft_path, 'draft-zhuang-l2vpn-yang-cfg-00.txt'), 'a', encoding='utf-8') as f:
+            f.write('\nmodule other-test2 {\n  namespace "urn:other-test2";\n  prefix other2;\n}\n')
+        shutil.rmtree(os.path.join(self.resource_path, 'serial'))
+        self._assert_same_extraction({'manifest': True})
+
+    def test_incremental_extraction_extracts_only_changed_drafts(self):
+        self._extract('tested', manifest=True)
+        with mock.patch.object(DraftExtractor, '_extract_drafts') as extract_drafts_mock:
+            draft_extractor = self._extract('tested', manifest=True)
+
+        extract_drafts_mock.assert_not_called()
+        self.assertEqual(draft_extractor.draft_yang_example_dict, {'draft-test-modules-00.txt': ['example-test.yang']})
+
+    def test_incremental_extraction_refreshes_signatures_of_unchanged_drafts(self):
+        self._extract('tested', manifest=True)
+        # the drafts are copied again with the same content, their signatures change
+        copied_draft_path = f'{self.draft_path}-copy'
+        shutil.copytree(self.draft_path, copied_draft_path)
+        shutil.rmtree(self.draft_path)
+        os.rename(copied_draft_path, self.draft_path)
+
+        with (
+            mock.patch.object(DraftExtractor, '_extract_drafts') as extract_drafts_mock,
+            mock.patch('extractors.extraction_manifest.hash_file', wraps=hash_file) as hash_file_mock,
+        ):
+            self._extract('tested', manifest=True)
+            self.assertTrue(hash_file_mock.called)
+            hash_file_mock.reset_mock()
+            self._extract('tested', manifest=True)
+
+        extract_drafts_mock.assert_not_called()
+        hash_file_mock.assert_not_called()
+
+    def test_incremental_extraction_keeps_unchanged_outputs(self):
+        self._extract('tested', manifest=True)
+        yang_directory = os.path.join(self.resource_path, 'tested/YANG')
+        inodes = {
+            filename: os.stat(os.path.join(yang_directory, filename)).st_ino for filename in os.listdir(yang_directory)
+        }
+        draft_file_path = os.path.join(self.draft_path, 'draft-test-modules-00.txt')
+        with open(draft_file_path, 'r', encoding='utf-8') as f:
+            draft = f.read()
+        with open(draft_file_path, 'w', encoding='utf-8') as f:
+            f.write(draft.replace('Initial revision.', 'First revision.'))
+
+        with mock.patch('extractors.extraction_manifest.xym_version', 'new-version'):
+            self._extract('tested', manifest=True)
+
+        changed_files = [
+            filename
+            for filename, inode in inodes.items()
+            if os.stat(os.path.join(yang_directory, filename)).st_ino != inode
+        ]
+        self.assertEqual(changed_files, ['ietf-test@2023-01-01.yang'])
+        self.assertNotIn('.previous-outputs', os.listdir(yang_directory))
+
+    def test_packed_elements_match_element_files(self):
+        self._extract('serial')
+        with ElementsArchive(os.path.join(self.resource_path, 'elements.sqlite')) as elements_archive:
+            self._extract('tested', manifest=True, elements_archive=elements_archive)
+            self._assert_exported_elements(elements_archive)
+            # the elements of the removed draft are taken from the newer revision, new draft writes the same elements
+            os.remove(os.path.join(self.draft_path, 'draft-zhuang-bess-evpn-yang-01.txt'))
+            shutil.copy(
+                os.path.join(self.draft_path, 'draft-zhuang-netmod-yang-poe-management-00.txt'),
+                os.path.join(self.draft_path, 'draft-a-netmod-yang-poe-management-00.txt'),
+            )
+            shutil.rmtree(os.path.join(self.resource_path, 'serial'))
+            self._extract('serial')
+            self._extract('tested', manifest=True, elements_archive=elements_archive)
+            self._assert_exported_elements(elements_archive)
+
+        self.assertEqual(os.listdir(os.path.join(self.resource_path, 'tested/draft-elements')), [])
+
+    def _assert_exported_elements(self, elements_archive: ElementsArchive):
+        exported_directory = os.path.join(self.resource_path, 'exported')
+        shutil.rmtree(exported_directory, ignore_errors=True)
+        elements_archive.export(exported_directory)
+        serial_elements = self._read_directory(os.path.join(self.resource_path, 'serial/draft-elements'))
+        self.assertTrue(serial_elements)
+        self.assertEqual(self._read_directory(exported_directory), serial_elements)
+
+    def _assert_same_extraction(self, options: dict):
+        serial_draft_extractor = self._extract('serial')
+        draft_extractor = self._extract('tested', **options)
+
+        self.assertEqual(
+            serial_draft_extractor.draft_yang_dict['draft-test-modules-00.txt'], ['ietf-test@2023-01-01.yang']
+        )
+        self.assertEqual(
+            serial_draft_extractor.draft_yang_example_dict, {'draft-test-modules-00.txt': ['example-test.yang']}
+        )
+        for attribute in (
+            'ietf_drafts',
+            'draft_yang_dict',
+            'draft_yang_example_dict',
+            'draft_yang_all_dict',
+            'inverted_draft_yang_dict',
+        ):
+            self.assertEqual(getattr(serial_draft_extractor, attribute), getattr(draft_extractor, attribute))
+        self.assertEqual(
+            {
+                draft: errors.replace(os.path.join(self.resource_path, 'serial'), '')
+                for draft, errors in serial_draft_extractor.drafts_missing_code_section.items()
+            },
+            {
+                draft: errors.replace(os.path.join(self.resource_path, 'tested'), '')
+                for draft, errors in draft_extractor.drafts_missing_code_section.items()
+            },
+        )
+        self.assertEqual(
+            self._read_directory(os.path.join(self.resource_path, 'serial')),
+            self._read_directory(os.path.join(self.resource_path, 'tested')),
+        )
+
+    def _extract(self, directory: str, manifest: bool = False, **options) -> DraftExtractor:
+        manifest_path = os.path.join(self.resource_path, f'{directory}-manifest.json')
+        directory = os.path.join(self.resource_path, directory)
+        draft_extractor_paths = {
+            'draft_path': self.draft_path,
+            'yang_path': os.path.join(directory, 'YANG/'),
+            'draft_elements_path': os.path.join(directory, 'draft-elements/'),
+            'draft_path_strict': os.path.join(directory, 'draft-with-YANG-strict/'),
+            'all_yang_example_path': os.path.join(directory, 'YANG-example/'),
+            'draft_path_only_example': os.path.join(directory, 'draft-with-YANG-example/'),
+            'all_yang_path': os.path.join(directory, 'YANG-all/'),
+            'draft_path_no_strict': os.path.join(directory, 'draft-with-YANG-no-strict/'),
+            'code_snippets_dir': os.path.join(directory, 'code-snippets'),
+        }
+        for path in draft_extractor_paths.values():
+            os.makedirs(path, exist_ok=True)
+        if manifest:
+            options['manifest'] = ExtractionManifest(
+                manifest_path,
+                [
+                    draft_extractor_paths['yang_path'],
+                    draft_extractor_paths['draft_path_strict'],
+                    draft_extractor_paths['all_yang_example_path'],
+                    draft_extractor_paths['draft_path_only_example'],
+                    draft_extractor_paths['all_yang_path'],
+                    draft_extractor_paths['draft_path_no_strict'],
+                ],
+                elements_directory=''
+                if 'elements_archive' in options
+                else draft_extractor_paths['draft_elements_path'],
+                code_snippets_directory=draft_extractor_paths['code_snippets_dir'],
+            )
+        draft_extractor = DraftExtractor(draft_extractor_paths, 0, message_factory=mock.MagicMock(), **options)
+        draft_extractor.extract()
+        return draft_extractor
+
+    def _read_directory(self, directory: str) -> dict[str, bytes]:
+        files = {}
+        for root, _, filenames in os.walk(directory):
+            for filename in filenames:
+                path = os.path.join(root, filename)
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, directory)] = f.read()
+        return files
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -84,6 +84,31 @@ class TestExtractElem(unittest.TestCase):
         )
         self.assertFalse(mismatch or errors)
 
+    def test_extract_elems(self):
+        extracted_path = os.path.join(self.resource_path, 'extracted')
+        os.makedirs(os.path.join(extracted_path, 'single-scan'), exist_ok=True)
+        elements = []
+        for elem_type in ('typedef', 'grouping', 'identity'):
+            elements += ee.extract_elem(
+                os.path.join(self.resource_path, 'yang-catalog@2018-04-03.yang'),
+                extracted_path,
+                elem_type,
+            )
+
+        result = ee.extract_elems(
+            os.path.join(self.resource_path, 'yang-catalog@2018-04-03.yang'),
+            os.path.join(extracted_path, 'single-scan'),
+        )
+
+        self.assertEqual(result, elements)
+        match, mismatch, errors = filecmp.cmpfiles(
+            os.path.join(extracted_path, 'single-scan'),
+            os.path.join(self.resource_path, 'expected'),
+            elements,
+            shallow=False,
+        )
+        self.assertFalse(mismatch or errors)
+
 
 if __name__ == '__main__':
     unittest.main()
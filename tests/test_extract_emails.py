@@ -19,7 +19,10 @@ __license__ = 'Apache License, Version 2.0'
 __email__ = 'richard.zilincik@pantheon.tech'
 
 import os
+import shutil
+import tempfile
 import unittest
+from unittest import mock
 
 import metadata_generators.extract_emails as ee
 
@@ -33,6 +36,26 @@ class TestExtractElem(unittest.TestCase):
         result = ee.extract_email_string(os.path.join(self.resource_path, 'emails.txt'), 'foo.com')
         self.assertSetEqual(set(result.split(',')), {'foo@foo.com', 'bar@foo.com', 'foobar@foo.com'})
 
+    def test_email_index_reads_draft_once(self):
+        email_index = ee.DraftEmailIndex()
+        with tempfile.TemporaryDirectory() as directory:
+            draft_path = os.path.join(directory, 'draft-foo-00.txt')
+            shutil.copy(os.path.join(self.resource_path, 'emails.txt'), draft_path)
+            with mock.patch.object(ee, 'parse_email_lines', wraps=ee.parse_email_lines) as parse_mock:
+                foo_emails = email_index.get_email_string(draft_path, 'foo.com')
+                bar_emails = email_index.get_email_string(draft_path, 'bar.com')
+                self.assertEqual(email_index.get_email_string(draft_path, 'foo.com'), foo_emails)
+                parse_mock.assert_called_once()
+
+                with open(draft_path, 'a') as f:
+                    f.write('email:baz@bar.com\n')
+                changed_bar_emails = email_index.get_email_string(draft_path, 'bar.com')
+                self.assertEqual(parse_mock.call_count, 2)
+
+        self.assertSetEqual(set(foo_emails.split(',')), {'foo@foo.com', 'bar@foo.com', 'foobar@foo.com'})
+        self.assertEqual(bar_emails, 'foo@bar.com')
+        self.assertSetEqual(set(changed_bar_emails.split(',')), {'foo@bar.com', 'baz@bar.com'})
+
     def test_list_of_ietf_drafts(self):
         result = ee.list_of_ietf_drafts(os.path.join(self.resource_path, 'drafts'))
         self.assertSetEqual(set(result), {'draft-foo.txt', 'draft-bar.txt'})
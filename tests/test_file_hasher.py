@@ -24,6 +24,7 @@ import subprocess
 import unittest
 
 from modules_compilation.file_hasher import FileHasher
+from utility.file_helpers import get_file_signature
 from versions import validator_versions
 
 
@@ -67,6 +68,11 @@ class TestFileHasher(unittest.TestCase):
     def resource(cls, file: str) -> str:
         return os.path.join(cls.resource_path, file)
 
+    def with_signatures(self, hashes: dict) -> dict:
+        return {
+            path: file_hash_info | {'signature': get_file_signature(path)} for path, file_hash_info in hashes.items()
+        }
+
     def test_hash_values(self):
         fh = FileHasher(dst_dir=self.resource_path, force_compilation=False)
         module_hash_info = fh.should_parse(self.resource('file.txt'))
@@ -84,7 +90,7 @@ class TestFileHasher(unittest.TestCase):
         with open(self.resource('sdo_files_modification_hashes.json')) as f:
             result = json.load(f)
 
-        self.assertDictEqual(result, self.correct_hashes)
+        self.assertDictEqual(result, self.with_signatures(self.correct_hashes))
 
     def test_invalidate_hashes(self):
         with open(self.resource('sdo_files_modification_hashes.json'), 'w') as f:
@@ -106,7 +112,7 @@ class TestFileHasher(unittest.TestCase):
         with open(self.resource('sdo_files_modification_hashes.json')) as f:
             result = json.load(f)
 
-        self.assertDictEqual(result, self.correct_hashes)
+        self.assertDictEqual(result, self.with_signatures(self.correct_hashes))
 
     def test_should_parse(self):
         with open(self.resource('sdo_files_modification_hashes.json'), 'w') as f:
@@ -127,3 +133,35 @@ class TestFileHasher(unittest.TestCase):
         self.assertEqual(module_hash_info.hash_changed, True)
         module_hash_info = fh.should_parse(self.resource('other_file.txt'))
         self.assertEqual(module_hash_info.hash_changed, True)
+
+    def test_validation_times(self):
+        hashes = self.correct_hashes.copy()
+        hashes[self.resource('file.txt')] = hashes[self.resource('file.txt')] | {
+            'validation_times': {'pyang': 1.5, 'yanglint': 0.25},
+        }
+        with open(self.resource('sdo_files_modification_hashes.json'), 'w') as f:
+            json.dump(hashes, f)
+
+        fh = FileHasher(dst_dir=self.resource_path, force_compilation=False)
+        module_hash_info = fh.should_parse(self.resource('file.txt'))
+        self.assertDictEqual(module_hash_info.validation_times, {'pyang': 1.5, 'yanglint': 0.25})
+        module_hash_info = fh.should_parse(self.resource('other_file.txt'))
+        self.assertDictEqual(module_hash_info.validation_times, {})
+
+    def test_reuse_hash_with_same_signature(self):
+        fh = FileHasher(dst_dir=self.resource_path, force_compilation=False)
+        hashes = self.with_signatures(self.correct_hashes)
+        # the stored hash is reused without reading the file as long as the signature matches
+        hashes[self.resource('file.txt')]['hash'] = 64 * '0'
+        hashes[self.resource('other_file.txt')]['hash'] = 64 * '0'
+        hashes[self.resource('other_file.txt')]['signature'] = '0:0:0:0'
+        with open(self.resource('sdo_files_modification_hashes.json'), 'w') as f:
+            json.dump(hashes, f)
+
+        fh = FileHasher(dst_dir=self.resource_path, force_compilation=False)
+        module_hash_info = fh.should_parse(self.resource('file.txt'))
+        self.assertEqual(module_hash_info.hash, 64 * '0')
+        self.assertEqual(module_hash_info.hash_changed, False)
+        module_hash_info = fh.should_parse(self.resource('other_file.txt'))
+        self.assertEqual(module_hash_info.hash, self.compute_hash('other_file.txt'))
+        self.assertEqual(module_hash_info.hash_changed, True)
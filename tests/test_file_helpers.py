@@ -0,0 +1,76 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import hashlib
+import json
+import os
+import shutil
+import unittest
+
+from utility.file_helpers import BLOCK_SIZE, get_file_signature, hash_file, write_json_atomically
+
+
+class TestFileHelpers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/file_helpers')
+        cls.file_path = os.path.join(cls.resource_path, 'file.txt')
+
+    def setUp(self):
+        os.makedirs(self.resource_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_hash_file(self):
+        content = os.urandom(3 * BLOCK_SIZE + 1)
+        with open(self.file_path, 'wb') as f:
+            f.write(content)
+
+        self.assertEqual(hash_file(self.file_path), hashlib.sha256(content).hexdigest())
+
+    def test_get_file_signature(self):
+        with open(self.file_path, 'w') as f:
+            f.write('content')
+        signature = get_file_signature(self.file_path)
+        link_path = os.path.join(self.resource_path, 'link.txt')
+        os.link(self.file_path, link_path)
+
+        self.assertEqual(get_file_signature(link_path), signature)
+        with open(self.file_path, 'a') as f:
+            f.write(' changed')
+        self.assertNotEqual(get_file_signature(self.file_path), signature)
+        copy_path = os.path.join(self.resource_path, 'copy.txt')
+        shutil.copy2(link_path, copy_path)
+        self.assertNotEqual(get_file_signature(copy_path), get_file_signature(link_path))
+
+    def test_write_json_atomically(self):
+        path = os.path.join(self.resource_path, 'cache', 'data.json')
+
+        write_json_atomically(path, {'a': [1, 2]})
+        write_json_atomically(path, {'b': []})
+
+        with open(path) as f:
+            self.assertEqual(json.load(f), {'b': []})
+        self.assertEqual(os.listdir(os.path.dirname(path)), ['data.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import unittest
+
+import HTML
+
+from modules_compilation.files_generator import FilesGenerator
+from utility.utility import dict_to_list, list_br_html_addition
+
+
+class TestFilesGenerator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/files_generator')
+
+    def setUp(self):
+        os.makedirs(self.resource_path)
+        self.files_generator = FilesGenerator(self.resource_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_generate_yang_page_compilation_html(self):
+        dictionary_data = {
+            'b@2023-01-01.yang': {
+                'compilation_metadata': ('draft-b-00.txt', None, 'PASSED WITH WARNINGS'),
+                'compilation_results': {'pyang': 'warning:\nline 1\n', 'confdc': ''},
+            },
+            'a@2023-01-01.yang': {
+                'compilation_metadata': ('PASSED',),
+                'compilation_results': {'pyang': '', 'confdc': 'ok'},
+            },
+            'c@2023-01-01.yang': None,
+        }
+        headers = ['YANG Model', 'Compilation', 'pyang', 'confdc']
+
+        self.files_generator.generate_yang_page_compilation_html(dictionary_data, headers, 'Test', metadata='meta')
+
+        with open(os.path.join(self.resource_path, 'TestYANGPageCompilation.html'), encoding='utf-8') as f:
+            html = f.read()
+        modules_results = list_br_html_addition(sorted(dict_to_list(dictionary_data)))
+        self.assertTrue(html.endswith(HTML.table(modules_results, header_row=headers)))
+        self.assertIn('meta', html)
+        self.assertLess(html.index('a@2023-01-01.yang'), html.index('b@2023-01-01.yang'))
+        self.assertIn('warning:<br>line 1<br>', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,7 +25,8 @@ import unittest
 from unittest import mock
 
 from create_config import create_config
-from ietf_modules_extraction.gather_ietf_dependent_modules import copy_modules
+from ietf_modules_extraction.gather_ietf_dependent_modules import copy_modules, sync_local_modules
+from utility.module_headers import ModuleHeaderIndex
 
 
 class TestGatherIetfDependentModules(unittest.TestCase):
@@ -79,6 +80,44 @@ class TestGatherIetfDependentModules(unittest.TestCase):
         copied_files = os.listdir(self.ietf_dependencies_dir)
         self.assertEqual(copied_files, [])
 
+    def test_sync_local_modules(self) -> None:
+        """The ietf and ieee modules and their submodules are linked, stale modules are removed."""
+        src_dir = os.path.join(self.resource_path, 'local_modules')
+        shutil.rmtree(src_dir, ignore_errors=True)
+        shutil.copytree(os.path.join(self.resource_path, 'all_modules'), src_dir)
+        modules = {
+            'ieee802-test@2022-01-01.yang': 'module ieee802-test { namespace "urn:ieee:std:802:yang:ieee802-test"; }',
+            'ietf-test-sub@2022-08-01.yang': 'submodule ietf-test-sub { belongs-to ietf-test { prefix t; } }',
+            'openconfig-test@2022-01-01.yang': 'module openconfig-test { namespace "http://openconfig.net/yang/t"; }',
+            'not-a-module@2022-01-01.yang': 'container test { }',
+        }
+        for filename, content in modules.items():
+            with open(os.path.join(src_dir, filename), 'w', encoding='utf-8') as f:
+                f.write(content)
+        os.makedirs(self.ietf_dependencies_dir)
+        with open(os.path.join(self.ietf_dependencies_dir, 'ietf-removed@2020-01-01.yang'), 'w') as f:
+            f.write('module ietf-removed { namespace "urn:ietf:params:xml:ns:yang:ietf-removed"; }')
+        header_index_path = os.path.join(self.resource_path, 'headers.json')
+
+        try:
+            synced_modules = sync_local_modules(src_dir, self.ietf_dependencies_dir, ModuleHeaderIndex())
+            header_index = ModuleHeaderIndex(header_index_path)
+            self.assertEqual(sync_local_modules(src_dir, self.ietf_dependencies_dir, header_index), synced_modules)
+            header_index.save()
+            self.assertTrue(os.path.isfile(header_index_path))
+        finally:
+            shutil.rmtree(src_dir, ignore_errors=True)
+            if os.path.exists(header_index_path):
+                os.remove(header_index_path)
+
+        expected_modules = {
+            'ietf-test@2022-08-01.yang',
+            'ieee802-test@2022-01-01.yang',
+            'ietf-test-sub@2022-08-01.yang',
+        }
+        self.assertEqual(synced_modules, expected_modules)
+        self.assertEqual(set(os.listdir(self.ietf_dependencies_dir)), expected_modules)
+
 
 if __name__ == '__main__':
     unittest.main()
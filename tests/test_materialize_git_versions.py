@@ -0,0 +1,116 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import subprocess
+import unittest
+
+from modules_compilation.materialize_git_versions import GitVersionsMaterializer
+
+
+class TestMaterializeGitVersions(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/materialize_git_versions')
+        cls.repo_dir = os.path.join(cls.resource_path, 'repo')
+        cls.blobs_dir = os.path.join(cls.resource_path, 'blobs')
+        cls.dst_dir = os.path.join(cls.resource_path, 'dst')
+
+    def setUp(self):
+        os.makedirs(os.path.join(self.repo_dir, 'model/Common'))
+        self._git('init', '-q')
+        self._commit({'model/Common/a.yang': 'a 1.0', 'model/Common/b.yang': 'b', 'README.md': 'readme'})
+        self._git('update-ref', 'refs/remotes/origin/1.0', 'HEAD')
+        self._commit({'model/Common/a.yang': 'a 2.0', 'model/c.yang': 'c'})
+        self._git('update-ref', 'refs/remotes/origin/2.0', 'HEAD')
+        self._git('update-ref', 'refs/remotes/origin/master', 'HEAD')
+        self.materializer = GitVersionsMaterializer(self.repo_dir, self.blobs_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_list_versions(self):
+        self.assertEqual(
+            self.materializer.list_versions(),
+            {'1.0': 'refs/remotes/origin/1.0', '2.0': 'refs/remotes/origin/2.0'},
+        )
+
+    def test_materialize(self):
+        files_counts = self.materializer.materialize(self.dst_dir)
+
+        self.assertEqual(files_counts, {'1.0': 2, '2.0': 3})
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dst_dir, '1.0'))), ['a.yang', 'b.yang'])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dst_dir, '2.0'))), ['a.yang', 'b.yang', 'c.yang'])
+        self.assertEqual(self._read(os.path.join(self.dst_dir, '1.0/a.yang')), 'a 1.0')
+        self.assertEqual(self._read(os.path.join(self.dst_dir, '2.0/a.yang')), 'a 2.0')
+        self.assertTrue(
+            os.path.samefile(os.path.join(self.dst_dir, '1.0/b.yang'), os.path.join(self.dst_dir, '2.0/b.yang')),
+        )
+        self.assertEqual(len(os.listdir(self.blobs_dir)), 4)
+
+    def test_materialize_again(self):
+        self.materializer.materialize(self.dst_dir)
+        b_stat = os.stat(os.path.join(self.dst_dir, '2.0/b.yang'))
+        self._git('rm', '-q', 'model/c.yang')
+        self._commit({'model/Common/b.yang': 'b 2.0'})
+        self._git('update-ref', 'refs/remotes/origin/2.0', 'HEAD')
+
+        self.materializer.materialize(self.dst_dir)
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.dst_dir, '2.0'))), ['a.yang', 'b.yang'])
+        self.assertEqual(self._read(os.path.join(self.dst_dir, '2.0/b.yang')), 'b 2.0')
+        self.assertEqual(os.stat(os.path.join(self.dst_dir, '1.0/b.yang')).st_ino, b_stat.st_ino)
+        self.assertEqual(len(os.listdir(self.blobs_dir)), 4)
+
+    def test_store_blobs_removes_temporary_blobs(self):
+        os.makedirs(self.blobs_dir)
+        with open(os.path.join(self.blobs_dir, f'{"0" * 40}.yang.tmp'), 'w') as f:
+            f.write('interrupted')
+
+        self.assertEqual(self.materializer.store_blobs([]), 0)
+        self.assertEqual(os.listdir(self.blobs_dir), [])
+
+    def test_store_blobs_missing_blob(self):
+        # enough ids to fill the pipes, so that the writer thread is blocked when the reading stops
+        blob_ids = [f'{index:040x}' for index in range(1, 200000)]
+
+        with self.assertRaises(RuntimeError):
+            self.materializer.store_blobs(blob_ids)
+
+        self.assertEqual(os.listdir(self.blobs_dir), [])
+
+    def _commit(self, files: dict[str, str]):
+        for path, content in files.items():
+            with open(os.path.join(self.repo_dir, path), 'w', encoding='utf-8') as f:
+                f.write(content)
+        self._git('add', '-A')
+        self._git('-c', 'user.name=test', '-c', 'user.email=test@example.com', 'commit', '-q', '-m', 'commit')
+
+    def _git(self, *args: str):
+        subprocess.run(['git', *args], cwd=self.repo_dir, check=True)
+
+    def _read(self, path: str) -> str:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
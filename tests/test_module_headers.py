@@ -0,0 +1,83 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from utility import module_headers
+from utility.module_headers import ModuleHeaderIndex, parse_module_header, parse_module_header_text
+
+
+class TestModuleHeaders(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/module_headers')
+
+    def test_module_header(self):
+        header = parse_module_header(os.path.join(self.resource_path, 'ietf-test@2023-01-01.yang'))
+
+        assert header
+        self.assertEqual(header.keyword, 'module')
+        self.assertEqual(header.name, 'ietf-test')
+        self.assertEqual(header.revision, '2023-01-01')
+        self.assertEqual(header.yang_version, '1.1')
+        self.assertEqual(header.namespace, 'urn:ietf:params:xml:ns:yang:ietf-test')
+        self.assertEqual(header.imports, ['ietf-yang-types'])
+        self.assertEqual(header.includes, ['ietf-test-sub'])
+        self.assertEqual(header.dependencies, ['ietf-yang-types', 'ietf-test-sub'])
+
+    def test_submodule_header(self):
+        header = parse_module_header(os.path.join(self.resource_path, 'ietf-test-sub.yang'))
+
+        assert header
+        self.assertEqual(header.keyword, 'submodule')
+        self.assertEqual(header.name, 'ietf-test-sub')
+        self.assertEqual(header.revision, '')
+        self.assertEqual(header.belongs_to, 'ietf-test')
+        self.assertEqual(header.imports, ['ietf-inet-types'])
+
+    def test_module_header_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            module_path = os.path.join(directory, 'ietf-test@2023-01-01.yang')
+            shutil.copy(os.path.join(self.resource_path, 'ietf-test@2023-01-01.yang'), module_path)
+            index_path = os.path.join(directory, 'index.json')
+            header_index = ModuleHeaderIndex(index_path)
+            header = header_index.get(module_path)
+            header_index.save()
+
+            with mock.patch.object(module_headers, 'parse_module_header') as parse_mock:
+                self.assertEqual(ModuleHeaderIndex(index_path).get(module_path), header)
+                parse_mock.assert_not_called()
+
+        assert header
+        self.assertEqual(header.name, 'ietf-test')
+        self.assertEqual(header.namespace_organization, 'ietf')
+
+    def test_not_a_module(self):
+        self.assertIsNone(parse_module_header_text('container test { leaf test { type string; } }'))
+        self.assertIsNone(parse_module_header_text(''))
+        self.assertIsNone(parse_module_header(os.path.join(self.resource_path, 'nonexistent.yang')))
+
+
+if __name__ == '__main__':
+    unittest.main()
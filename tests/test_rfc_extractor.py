@@ -0,0 +1,99 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from extractors.extraction_manifest import ExtractionManifest
+from extractors.rfc_extractor import RFCExtractor, load_old_rfc_modules
+
+
+class TestRFCExtractor(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/rfc_extractor')
+        cls.rfc_path = os.path.join(cls.resource_path, 'rfc')
+        cls.rfc_yang_path = os.path.join(cls.resource_path, 'YANG-rfc/')
+        cls.old_rfc_yang_path = os.path.join(cls.resource_path, 'YANG-example-old-rfc/')
+        cls.elements_path = os.path.join(cls.resource_path, 'YANG-rfc-extraction/')
+        cls.code_snippets_path = os.path.join(cls.resource_path, 'code-snippets')
+
+    def setUp(self):
+        for path in (self.rfc_path, self.rfc_yang_path, self.old_rfc_yang_path, self.elements_path):
+            os.makedirs(path)
+        self.assertIn('hw.yang', load_old_rfc_modules())
+        with open(os.path.join(self.rfc_path, 'rfc1000.txt'), 'w', encoding='utf-8') as f:
+            f.write(
+                '<CODE BEGINS> file "hw.yang"\n'
+                'module hw {\n  namespace "urn:hw";\n  prefix hw;\n  typedef hw-type {\n    type string;\n  }\n}\n'
+                '<CODE ENDS>\n',
+            )
+        with open(os.path.join(self.rfc_path, 'rfc2000.txt'), 'w', encoding='utf-8') as f:
+            f.write(
+                '<CODE BEGINS> file "ietf-test@2023-01-01.yang"\n'
+                'module ietf-test {\n  namespace "urn:ietf-test";\n  prefix test;\n'
+                '  revision 2023-01-01 {\n    description "Initial revision.";\n  }\n}\n'
+                '<CODE ENDS>\n',
+            )
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_incremental_extraction_ignores_moved_old_rfc_modules(self):
+        self._extract()
+        self.assertEqual(os.listdir(self.rfc_yang_path), ['ietf-test@2023-01-01.yang'])
+        self.assertEqual(os.listdir(self.old_rfc_yang_path), ['hw.yang'])
+
+        with mock.patch.object(RFCExtractor, '_extract_rfcs') as extract_rfcs_mock:
+            rfc_extractor = self._extract()
+
+        extract_rfcs_mock.assert_not_called()
+        self.assertEqual(
+            rfc_extractor.rfc_yang_dict,
+            {'rfc1000.txt': ['hw.yang'], 'rfc2000.txt': ['ietf-test@2023-01-01.yang']},
+        )
+        self.assertEqual(os.listdir(self.old_rfc_yang_path), ['hw.yang'])
+        self.assertEqual(os.listdir(self.elements_path), ['typedef-hw-type.txt'])
+
+    def _extract(self) -> RFCExtractor:
+        manifest = ExtractionManifest(
+            os.path.join(self.resource_path, 'rfcs.json'),
+            [self.rfc_yang_path],
+            elements_directory=self.elements_path,
+            code_snippets_directory=self.code_snippets_path,
+            moved_files=load_old_rfc_modules(),
+        )
+        rfc_extractor = RFCExtractor(
+            self.rfc_path,
+            self.rfc_yang_path,
+            self.elements_path,
+            self.code_snippets_path,
+            0,
+            manifest=manifest,
+        )
+        rfc_extractor.extract()
+        rfc_extractor.clean_old_rfc_yang_modules(self.rfc_yang_path, self.old_rfc_yang_path)
+        return rfc_extractor
+
+
+if __name__ == '__main__':
+    unittest.main()
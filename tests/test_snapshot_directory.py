@@ -0,0 +1,79 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import unittest
+
+from modules_compilation.snapshot_directory import snapshot_directory
+
+
+class TestSnapshotDirectory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/snapshot_directory')
+        cls.src_dir = os.path.join(cls.resource_path, 'src')
+        cls.dst_dir = os.path.join(cls.resource_path, 'dst')
+
+    def setUp(self):
+        os.makedirs(os.path.join(self.src_dir, 'vendor/1.0'))
+        os.makedirs(os.path.join(self.src_dir, 'vendor/2.0'))
+        for path in ('vendor/1.0/a.yang', 'vendor/2.0/a.yang', 'vendor/2.0/b.yang', 'README.md'):
+            with open(os.path.join(self.src_dir, path), 'w', encoding='utf-8') as f:
+                f.write(path)
+        os.symlink('2.0', os.path.join(self.src_dir, 'vendor/latest'))
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_snapshot_directory(self):
+        files_count = snapshot_directory(self.src_dir, self.dst_dir)
+
+        self.assertEqual(files_count, 4)
+        for path in ('vendor/1.0/a.yang', 'vendor/2.0/a.yang', 'vendor/2.0/b.yang', 'README.md'):
+            self.assertTrue(os.path.samefile(os.path.join(self.src_dir, path), os.path.join(self.dst_dir, path)))
+        self.assertEqual(os.readlink(os.path.join(self.dst_dir, 'vendor/latest')), '2.0')
+
+    def test_snapshot_keeps_content_when_source_is_replaced(self):
+        snapshot_directory(self.src_dir, self.dst_dir)
+        src_path = os.path.join(self.src_dir, 'vendor/2.0/b.yang')
+        os.remove(src_path)
+        with open(src_path, 'w', encoding='utf-8') as f:
+            f.write('updated')
+
+        with open(os.path.join(self.dst_dir, 'vendor/2.0/b.yang'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'vendor/2.0/b.yang')
+
+        snapshot_directory(self.src_dir, self.dst_dir)
+
+        with open(os.path.join(self.dst_dir, 'vendor/2.0/b.yang'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'updated')
+
+    def test_snapshot_directory_flatten(self):
+        files_count = snapshot_directory(self.src_dir, self.dst_dir, extensions=('yang',), flatten=True)
+
+        self.assertEqual(files_count, 3)
+        self.assertEqual(sorted(os.listdir(self.dst_dir)), ['a.yang', 'b.yang'])
+        with open(os.path.join(self.dst_dir, 'a.yang'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'vendor/2.0/a.yang')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import json
+import multiprocessing
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from parsers import yang_parser
+from utility.unparsable_modules import UnparsableModules, get_unparsable_modules
+
+
+def _add_modules(var_path: str, index: int):
+    registry = UnparsableModules(var_path)
+    for module_index in range(20):
+        registry.add(f'module-{index}-{module_index}.yang')
+    registry.add('shared.yang')
+
+
+class TestUnparsableModules(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.var_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/unparsable_modules')
+
+    def setUp(self):
+        os.makedirs(self.var_path)
+        with open(os.path.join(self.var_path, 'unparsable-modules.json'), 'w') as f:
+            json.dump(['lora.yang', 'shared.yang'], f)
+
+    def tearDown(self):
+        shutil.rmtree(self.var_path, ignore_errors=True)
+        get_unparsable_modules.cache_clear()
+
+    def test_add_from_parallel_processes(self):
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            pool.starmap(_add_modules, [(self.var_path, index) for index in range(4)])
+
+        registry = UnparsableModules(self.var_path)
+        expected_modules = {'lora.yang', 'shared.yang'} | {
+            f'module-{index}-{module_index}.yang' for index in range(4) for module_index in range(20)
+        }
+        modules = registry.get_modules()
+        self.assertEqual(modules[:2], ['lora.yang', 'shared.yang'])
+        self.assertEqual(len(modules), len(expected_modules))
+        self.assertSetEqual(set(modules), expected_modules)
+
+        registry.compact()
+        self.assertFalse(os.path.exists(registry.journal_path))
+        with open(registry.path) as f:
+            self.assertListEqual(json.load(f), modules)
+        self.assertListEqual(registry.get_modules(), modules)
+
+    def test_parse_exception_registers_module(self):
+        with mock.patch.object(yang_parser, 'create_config') as create_config_mock:
+            create_config_mock.return_value.get.return_value = self.var_path
+            yang_parser.ParseException('/some/directory/broken@2023-01-01.yang')
+            yang_parser.ParseException('/some/directory/broken@2023-01-01.yang')
+
+        registry = UnparsableModules(self.var_path)
+        with open(registry.journal_path) as f:
+            self.assertEqual(f.read(), '"broken@2023-01-01.yang"\n')
+        self.assertListEqual(registry.get_modules(), ['lora.yang', 'shared.yang', 'broken@2023-01-01.yang'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from parsers import yang_parser
+
+MODULE_TEXT = 'module {} {{ namespace "urn:ietf:params:xml:ns:yang:{}"; prefix test; revision 2023-01-01; }}\n'
+
+
+class TestCachingYangParser(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/yang_parser')
+        cls.module_path = os.path.join(cls.resource_path, 'test-module@2023-01-01.yang')
+
+    def setUp(self):
+        os.makedirs(self.resource_path)
+        self.write_module('test-module')
+        self.parser = yang_parser.CachingYangParser(cache_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def write_module(self, name: str, path: str = ''):
+        with open(path or self.module_path, 'w') as f:
+            f.write(MODULE_TEXT.format(name, name))
+
+    def test_parse_reuses_context_and_asts(self):
+        with mock.patch.object(yang_parser, 'create_context', wraps=yang_parser.create_context) as create_context_mock:
+            ast = self.parser.parse(self.module_path)
+            self.assertIs(self.parser.parse(self.module_path), ast)
+            self.write_module('changed-module')
+            changed_ast = self.parser.parse(self.module_path)
+
+        create_context_mock.assert_called_once()
+        self.assertEqual(ast.arg, 'test-module')
+        self.assertEqual(changed_ast.arg, 'changed-module')
+        self.assertEqual(self.parser.ctx.errors, [])
+
+    def test_parse_evicts_least_recently_used_asts(self):
+        other_paths = [os.path.join(self.resource_path, f'other-{index}.yang') for index in range(2)]
+        for index, path in enumerate(other_paths):
+            self.write_module(f'other-{index}', path)
+        ast = self.parser.parse(self.module_path)
+        self.parser.parse(other_paths[0])
+        self.assertIs(self.parser.parse(self.module_path), ast)
+        self.parser.parse(other_paths[1])
+
+        self.assertIs(self.parser.parse(self.module_path), ast)
+        with mock.patch.object(self.parser._parser, 'parse', wraps=self.parser._parser.parse) as parse_mock:
+            self.parser.parse(other_paths[0])
+        parse_mock.assert_called_once()
+
+    def test_parse_failure(self):
+        with open(self.module_path, 'w') as f:
+            f.write('module broken {')
+        with mock.patch.object(yang_parser, 'get_unparsable_modules') as get_unparsable_modules_mock:
+            with self.assertRaises(yang_parser.ParseException):
+                self.parser.parse(self.module_path)
+            with self.assertRaises(yang_parser.ParseException):
+                self.parser.parse(self.module_path)
+
+        get_unparsable_modules_mock.return_value.add.assert_called_with('test-module@2023-01-01.yang')
+        self.assertEqual(self.parser.ctx.errors, [])
+
+
+class TestCreateContext(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.resource_path = os.path.join(os.environ['VIRTUAL_ENV'], 'tests/resources/yang_parser')
+
+    def setUp(self):
+        os.makedirs(os.path.join(self.resource_path, 'vendor'))
+        for path in ('a@2023-01-01.yang', 'vendor/b.yang'):
+            with open(os.path.join(self.resource_path, path), 'w') as f:
+                f.write('module x {}\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.resource_path, ignore_errors=True)
+
+    def test_create_context_without_search_path(self):
+        with mock.patch('os.listdir', wraps=os.listdir) as listdir_mock:
+            ctx = yang_parser.create_context(path='')
+
+        listdir_mock.assert_not_called()
+        self.assertEqual(ctx.repository.dirs, [])
+        self.assertEqual(ctx.revs, {})
+
+    def test_create_context_with_search_path(self):
+        ctx = yang_parser.create_context(path=self.resource_path)
+
+        self.assertIn('a', ctx.revs)
+        self.assertIn('b', ctx.revs)
+
+
+if __name__ == '__main__':
+    unittest.main()
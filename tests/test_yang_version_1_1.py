@@ -48,6 +48,16 @@ class TestYangVersion11(unittest.TestCase):
         self.assertNotEqual(v1_files, [])
         self.assertIn('test.yang', v1_files)
 
+    def test_yang_version_1_1_hard_links(self):
+        """The version 1.1 models are hard linked instead of copied."""
+        yv11.find_v11_models(self.src, self.dst)
+
+        self.assertTrue(os.path.samefile(os.path.join(self.src, 'test.yang'), os.path.join(self.dst, 'test.yang')))
+
+    def test_is_yang_version_1_1(self):
+        self.assertTrue(yv11.is_yang_version_1_1(os.path.join(self.src, 'test.yang')))
+        self.assertFalse(yv11.is_yang_version_1_1(os.path.join(self.src, 'test2.yang')))
+
     def test_yang_version_1_1_src_not_exists(self):
         """Test the case when the src directory does not exist."""
         result = yv11.find_v11_models('', self.dst)
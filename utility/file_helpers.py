@@ -0,0 +1,76 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Helpers shared by the caches which skip unchanged files: content hashes, cheap signatures of the files
+and atomic writes of the JSON files the caches are persisted in.
+A file whose signature didn't change since its hash was stored is considered unchanged and isn't read again.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import hashlib
+import json
+import os
+import typing as t
+
+BLOCK_SIZE = 65536  # The size of each read from the file
+
+
+def hash_file(path: str) -> str:
+    """
+    Create hash from content of the given file. Each time the content of the file change,
+    the resulting hash will be different.
+
+    Arguments:
+        :param path (str) Path to the file to be hashed
+    :return (str) SHA256 hash of the content of the given file
+    """
+    file_hash = hashlib.sha256()
+    with open(path, 'rb') as reader:
+        for file_block in iter(lambda: reader.read(BLOCK_SIZE), b''):
+            file_hash.update(file_block)
+    return file_hash.hexdigest()
+
+
+def get_file_signature(path: str) -> str:
+    """
+    Create signature of the given file from its metadata. Unless the file is rewritten in place
+    within the resolution of the modification time, different content results in a different signature.
+
+    Arguments:
+        :param path (str) Path to the file
+    :return (str) Signature made of the device, inode, size and modification time of the file
+    """
+    stat = os.stat(path)
+    return f'{stat.st_dev}:{stat.st_ino}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def write_json_atomically(path: str, data: t.Any):
+    """
+    Dump the data into the JSON file. The data are written to a temporary file first, which then replaces the file,
+    so that an interrupted run can't leave the file corrupted.
+
+    Arguments:
+        :param path (str) Path to the JSON file, missing parent directories are created
+        :param data (Any) JSON serializable data
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as writer:
+        json.dump(data, writer)
+    os.replace(temporary_path, path)
@@ -0,0 +1,209 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cheap scanner of the YANG module header (module name, revision, linkage statements, ...).
+Only the statements preceding the first body statement are tokenized, so the scan is much cheaper
+than parsing the whole module with pyang and is good enough to build a dependency graph of the modules.
+The scanned headers can be persisted in a ModuleHeaderIndex, so that unchanged modules aren't read again.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import json
+import re
+import typing as t
+from dataclasses import asdict, dataclass, field
+
+from utility.file_helpers import get_file_signature, write_json_atomically
+
+TOKEN_REGEX = re.compile(
+    r"""
+    \s+
+    | //[^\n]*
+    | /\*.*?\*/
+    | "(?:[^"\\]|\\.)*"
+    | '[^']*'
+    | [{};]
+    | [^\s{};"']+
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+HEADER_KEYWORDS = (
+    'yang-version',
+    'namespace',
+    'prefix',
+    'belongs-to',
+    'import',
+    'include',
+    'organization',
+    'contact',
+    'description',
+    'reference',
+    'revision',
+)
+
+
+@dataclass
+class ModuleHeader:
+    keyword: str
+    name: str
+    revision: str = ''
+    yang_version: str = '1'
+    namespace: str = ''
+    belongs_to: str = ''
+    imports: list[str] = field(default_factory=list)
+    includes: list[str] = field(default_factory=list)
+
+    @property
+    def dependencies(self) -> list[str]:
+        """Names of all the modules and submodules which have to be available to validate this module."""
+        return [*self.imports, *self.includes]
+
+    @property
+    def namespace_organization(self) -> str:
+        """
+        Organization derived from the URN namespace of the module the same way as YANG Catalog does it,
+        e.g. 'ietf' for 'urn:ietf:params:xml:ns:yang:ietf-interfaces'. Empty for other namespaces and submodules.
+        """
+        if not self.namespace.startswith('urn:'):
+            return ''
+        return self.namespace.split(':')[1].lower()
+
+
+def _tokenize(text: str) -> t.Iterator[str]:
+    for match in TOKEN_REGEX.finditer(text):
+        token = match.group()
+        if token[0].isspace() or token.startswith(('//', '/*')):
+            continue
+        if token[0] in ('"', "'"):
+            token = token[1:-1]
+        yield token
+
+
+def parse_module_header_text(text: str) -> t.Optional[ModuleHeader]:
+    """
+    Scan the header statements of the YANG module content.
+
+    Arguments:
+        :param text     (str) Content of the YANG module
+    :return: (ModuleHeader) Scanned header or None if the text does not start with a module or submodule statement
+    """
+    tokens = _tokenize(text)
+    keyword = next(tokens, None)
+    if keyword not in ('module', 'submodule'):
+        return None
+    name = next(tokens, None)
+    if not name or next(tokens, None) != '{':
+        return None
+    header = ModuleHeader(keyword=keyword, name=name)
+    depth = 1
+    statement: list[str] = []
+    for token in tokens:
+        if token not in ('{', '}', ';'):
+            if depth == 1 and not statement and token not in HEADER_KEYWORDS and token != '+':
+                # first body statement reached, there are no more header statements
+                break
+            statement.append(token)
+            continue
+        if depth == 1 and len(statement) > 1:
+            _add_header_statement(header, statement[0], statement[1])
+        if token == '{':
+            depth += 1
+        elif token == '}':
+            depth -= 1
+            if not depth:
+                break
+        statement = []
+    return header
+
+
+def parse_module_header(path: str) -> t.Optional[ModuleHeader]:
+    """
+    Scan the header statements of the YANG module stored in the file.
+
+    Arguments:
+        :param path     (str) Path to the YANG module file
+    :return: (ModuleHeader) Scanned header or None if the file couldn't be read or doesn't contain a YANG module
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return parse_module_header_text(f.read())
+    except OSError:
+        return None
+
+
+def _add_header_statement(header: ModuleHeader, keyword: str, argument: str):
+    if keyword == 'import':
+        header.imports.append(argument)
+    elif keyword == 'include':
+        header.includes.append(argument)
+    elif keyword == 'revision' and not header.revision:
+        header.revision = argument
+    elif keyword == 'yang-version':
+        header.yang_version = argument
+    elif keyword == 'namespace':
+        header.namespace = argument
+    elif keyword == 'belongs-to':
+        header.belongs_to = argument
+
+
+class ModuleHeaderIndex:
+    """
+    Headers of the YANG modules persisted in a JSON file. A module is scanned again only if the signature
+    (device, inode, size and modification time) of its file changed, modules not looked up since
+    the index was loaded are dropped from it when it is saved.
+    """
+
+    def __init__(self, path: str = ''):
+        """
+        Arguments:
+            :param path     (str) Path to the JSON file with the index, the index is not persisted if empty
+        """
+        self.path = path
+        self._entries: dict[str, dict] = {}
+        self._used_entries: dict[str, dict] = {}
+        if path:
+            try:
+                with open(path) as reader:
+                    self._entries = json.load(reader)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._entries = {}
+
+    def get(self, path: str) -> t.Optional[ModuleHeader]:
+        """
+        Header of the YANG module stored in the file, see parse_module_header().
+
+        Arguments:
+            :param path     (str) Path to the YANG module file
+        :return: (ModuleHeader) Scanned header or None if the file couldn't be read or doesn't contain a YANG module
+        """
+        try:
+            signature = get_file_signature(path)
+        except OSError:
+            return None
+        entry = self._entries.get(path)
+        if not entry or entry['signature'] != signature:
+            header = parse_module_header(path)
+            entry = {'signature': signature, 'header': asdict(header) if header else None}
+        self._used_entries[path] = entry
+        return ModuleHeader(**entry['header']) if entry['header'] else None
+
+    def save(self):
+        if not self.path:
+            return
+        write_json_atomically(self.path, self._used_entries)
@@ -0,0 +1,104 @@
+# Copyright The IETF Trust 2023, All Rights Reserved
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This file contains UnparsableModules class, the registry of the modules which pyang failed to parse.
+The registry consists of the unparsable-modules.json list in the var directory and an append-only journal
+next to it. A newly found module is appended to the journal as one line under a file lock, so the parallel
+compilation processes never rewrite each other's changes. The journal is folded into the .json list
+by compact(), which is called once a compilation finishes.
+"""
+
+__author__ = 'Richard Zilincik'
+__copyright__ = 'Copyright The IETF Trust 2023, All Rights Reserved'
+__license__ = 'Apache License, Version 2.0'
+__email__ = 'richard.zilincik@pantheon.tech'
+
+import functools
+import json
+import os
+
+import filelock
+
+from utility.file_helpers import write_json_atomically
+
+UNPARSABLE_MODULES_FILENAME = 'unparsable-modules.json'
+JOURNAL_SUFFIX = '.journal'
+
+
+class UnparsableModules:
+    def __init__(self, var_path: str):
+        """
+        Arguments:
+            :param var_path     (str) Directory with the unparsable-modules.json file
+        """
+        self.path = os.path.join(var_path, UNPARSABLE_MODULES_FILENAME)
+        self.journal_path = f'{self.path}{JOURNAL_SUFFIX}'
+        self.lock_path = f'{self.path}.lock'
+        self._added_modules: set[str] = set()
+
+    def add(self, module: str):
+        """Register the module file name, a module is written at most once per process."""
+        if module in self._added_modules:
+            return
+        os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+        with filelock.FileLock(self.lock_path), open(self.journal_path, 'a', encoding='utf-8') as writer:
+            writer.write(f'{json.dumps(module)}\n')
+        self._added_modules.add(module)
+
+    def get_modules(self) -> list[str]:
+        """
+        Names of all the registered modules without duplicates, in the order they were registered.
+
+        :return: (list) File names of the unparsable modules
+        """
+        return list(dict.fromkeys((*self._load_list(), *self._load_journal())))
+
+    def compact(self):
+        """Fold the journal into the .json list, no module can be appended meanwhile."""
+        if not os.path.isfile(self.journal_path):
+            return
+        with filelock.FileLock(self.lock_path):
+            if not os.path.isfile(self.journal_path):
+                # compacted by another process meanwhile
+                return
+            write_json_atomically(self.path, self.get_modules())
+            os.remove(self.journal_path)
+
+    def _load_list(self) -> list[str]:
+        try:
+            with open(self.path, 'r') as reader:
+                return json.load(reader)
+        except (FileNotFoundError, json.decoder.JSONDecodeError):
+            return []
+
+    def _load_journal(self) -> list[str]:
+        modules = []
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as reader:
+                for line in reader:
+                    try:
+                        modules.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # the last line could have been cut off when a process died
+                        continue
+        except FileNotFoundError:
+            pass
+        return modules
+
+
+@functools.lru_cache(maxsize=None)
+def get_unparsable_modules(var_path: str) -> UnparsableModules:
+    """The registry of the var directory shared within the process."""
+    return UnparsableModules(var_path)